@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020  1Password & Agilebits (@1Password)
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from ansible_collections.onepassword.connect.plugins.module_utils import specs, vault
+from ansible_collections.onepassword.connect.plugins.modules import field_info
+from ansible_collections.onepassword.connect.plugins.plugin_utils.action import ConnectActionBase
+
+
+class ActionModule(ConnectActionBase):
+    MODULE = "onepassword.connect.field_info"
+
+    def argument_spec(self):
+        return specs.op_field_info(), {
+            "mutually_exclusive": field_info.MUTUALLY_EXCLUSIVE,
+            "required_one_of": field_info.REQUIRED_ONE_OF,
+        }
+
+    def run_module(self, params, api_client, check_mode=False):
+        get_item = self.shared_reads(vault.get_item, params, api_client, key=(params["vault"], params["item"]))
+        return field_info.read_fields(params, api_client, get_item=get_item)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020  1Password & Agilebits (@1Password)
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from ansible_collections.onepassword.connect.plugins.module_utils import specs
+from ansible_collections.onepassword.connect.plugins.modules import generic_item
+from ansible_collections.onepassword.connect.plugins.plugin_utils.action import ConnectActionBase
+
+
+class ActionModule(ConnectActionBase):
+    MODULE = "onepassword.connect.generic_item"
+
+    def argument_spec(self):
+        return specs.op_item(), {"required_if": generic_item.REQUIRED_IF}
+
+    def run_module(self, params, api_client, check_mode=False):
+        result = generic_item.reconcile(params, api_client, check_mode=check_mode)
+        if result["changed"] and not check_mode:
+            self.forget_shared_reads(params)
+        return result
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020  1Password & Agilebits (@1Password)
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = '''
+name: connect_stats
+type: aggregate
+author:
+  - 1Password (@1Password)
+version_added: 2.5.0
+short_description: Summarizes the requests sent to 1Password Connect by a playbook
+description:
+  - Collects the C(op_timings) returned by the collection's modules and prints a summary at the end of the playbook,
+    with the requests by endpoint, the cache hit ratio, the request latency, the bytes transferred and the slowest tasks.
+  - Only tasks that set the C(timings) option report their requests.
+    Set C(timings) in C(module_defaults) to cover a whole play.
+  - Ansible hides the result of tasks with C(no_log), C(op_timings) included.
+    Those tasks are counted but their requests are not.
+  - The summary can also be written to a file, as JSON or for the Prometheus node exporter's textfile collector.
+requirements:
+  - Enable this callback with the C(callbacks_enabled) setting.
+options:
+  report_path:
+    description:
+      - File the summary is written to at the end of the playbook. It is replaced on every run.
+      - Nothing is written if not set.
+    type: path
+    env:
+      - name: ONEPASSWORD_CONNECT_STATS_PATH
+    ini:
+      - section: callback_connect_stats
+        key: report_path
+  report_format:
+    description:
+      - Format of C(report_path).
+      - C(prometheus) writes gauges labelled with the playbook name, to be picked up by the textfile collector.
+    type: str
+    default: json
+    choices:
+      - json
+      - prometheus
+    env:
+      - name: ONEPASSWORD_CONNECT_STATS_FORMAT
+    ini:
+      - section: callback_connect_stats
+        key: report_format
+  slowest:
+    description:
+      - Number of slowest tasks listed in the summary.
+    type: int
+    default: 5
+    env:
+      - name: ONEPASSWORD_CONNECT_STATS_SLOWEST
+    ini:
+      - section: callback_connect_stats
+        key: slowest
+'''
+
+EXAMPLES = '''
+# ansible.cfg
+# [defaults]
+# callbacks_enabled = onepassword.connect.connect_stats
+#
+# [callback_connect_stats]
+# report_path = /var/lib/node_exporter/textfile/onepassword_connect.prom
+# report_format = prometheus
+
+- hosts: webservers
+  module_defaults:
+    onepassword.connect.field_info:
+      timings: true
+  tasks:
+    - name: Read the database password
+      onepassword.connect.field_info:
+        item: MySQL Database
+        field: password
+        vault: Infra
+      no_log: true
+'''
+
+import os
+
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.callback import CallbackBase
+
+from ansible_collections.onepassword.connect.plugins.plugin_utils import stats
+
+_COLLECTION_PREFIX = "onepassword.connect."
+# Module options naming the item a task reads or writes
+_ITEM_OPTIONS = ("item", "name", "title", "uuid")
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "onepassword.connect.connect_stats"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super(CallbackModule, self).__init__(display=display)
+        self.stats = stats.Stats()
+
+    def v2_playbook_on_start(self, playbook):
+        self.stats.playbook = os.path.basename(playbook._file_name)
+
+    def v2_runner_on_ok(self, result):
+        self._collect(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._collect(result)
+
+    def _collect(self, result):
+        task = result._task
+        data = result._result
+        # Loops report each iteration under "results"
+        task_results = data.get("results") if isinstance(data.get("results"), list) else [data]
+
+        for task_result in task_results:
+            report = stats.from_result(task_result)
+            if report is not None:
+                self.stats.add(
+                    report,
+                    host=result._host.get_name(),
+                    task=task.get_name(),
+                    item=_item_name(task_result, task.args),
+                )
+            elif _is_censored(task_result) and _is_connect_task(task):
+                self.stats.add_censored()
+
+    def v2_playbook_on_stats(self, _stats):
+        if not self.stats.tasks:
+            return
+
+        slowest = self.get_option("slowest")
+        self._display.banner("1PASSWORD CONNECT")
+        for line in _format_summary(self.stats.summary(slowest=slowest)):
+            self._display.display(line)
+
+        report_path = self.get_option("report_path")
+        if report_path:
+            try:
+                self.stats.write(report_path, report_format=self.get_option("report_format"), slowest=slowest)
+            except (IOError, OSError) as e:
+                self._display.warning("Could not write the 1Password Connect report to {0}: {1}".format(
+                    report_path, to_native(e)
+                ))
+
+
+def _is_connect_task(task):
+    action = getattr(task, "resolved_action", None) or task.action or ""
+    return action.startswith(_COLLECTION_PREFIX)
+
+
+def _is_censored(task_result):
+    return isinstance(task_result, dict) and "censored" in task_result
+
+
+def _item_name(task_result, task_args):
+    # Loop iterations carry their own arguments
+    args = (task_result.get("invocation") or {}).get("module_args") or task_args or {}
+    for option in _ITEM_OPTIONS:
+        value = args.get(option)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+def _format_summary(summary):
+    ratio = summary["cache_hit_ratio"]
+    latency = summary["latency_ms"]
+
+    lines = [
+        "tasks: {0} ({1} hidden by no_log)".format(summary["tasks"], summary["censored_tasks"]),
+        "requests: {0}, retries: {1}".format(summary["requests"], summary["retries"]),
+        "bytes: {0} received, {1} sent".format(summary["bytes_in"], summary["bytes_out"]),
+        "cache hit ratio: {0}".format(
+            "n/a" if ratio is None else "{0:.1f}% ({1} of {2} lookups)".format(
+                ratio * 100, summary["cache_hits"], summary["cache_hits"] + summary["cache_misses"]
+            )
+        ),
+        "latency: {0}".format(", ".join(
+            "{0} {1}".format(name, "n/a" if value is None else "{0:.1f} ms".format(value))
+            for name, value in sorted(latency.items(), key=lambda q: int(q[0][1:]))
+        )),
+    ]
+
+    if summary["endpoints"]:
+        lines.append("requests by endpoint:")
+        for endpoint in summary["endpoints"]:
+            lines.append("  {requests:>7}  {method} {path}".format(**endpoint))
+
+    if summary["slowest"]:
+        lines.append("slowest tasks:")
+        for task in summary["slowest"]:
+            lines.append("  {0:>9.1f} ms  {1}: {2}{3}".format(
+                task["total_ms"], task["host"], task["task"], " ({0})".format(task["item"]) if task["item"] else ""
+            ))
+
+    return lines
@@ -7,12 +7,119 @@ class ModuleDocFragment:
     DOCUMENTATION = r'''
 options:
     hostname:
-        type: str
+        type: list
+        elements: str
         description:
             - URL of 1Password Connect.
+            - Not needed when the task runs over the C(onepassword.connect.connect) httpapi connection.
+            - A list, or a comma-separated string, of the URLs of several replicas of the same Connect server
+              spreads the requests over them. Each request goes to the better of two replicas picked at random,
+              judged by their average latency and recent errors.
+            - A replica that can't be reached, or answers with server errors 3 times in a row,
+              is left alone for 30 seconds. Reads that can't reach a replica are sent to the next one right away.
     token:
         type: str
         description:
             - The token to authenticate 1Password Connect calls.
             - Ansible should never log or display this value.
+    retries:
+        type: int
+        default: 3
+        description:
+            - Number of times a request is retried after a connection error, a rate limit (HTTP 429)
+              or a server error (HTTP 5xx).
+            - Only idempotent requests (reads, updates and deletes) are retried. Creating an item is never retried.
+            - If the server sends a C(Retry-After) header, the client waits that long before retrying.
+            - Set to C(0) to disable retries.
+    retry_max_delay:
+        type: float
+        default: 30
+        description:
+            - Maximum number of seconds the client spends retrying a single request.
+            - A retry is skipped if the server asks the client to wait longer than the time left.
+    cache_ttl:
+        type: int
+        default: 0
+        description:
+            - Number of seconds the vault listing and the IDs of items looked up by title are cached on disk.
+            - Later tasks resolve vault and item names from the cache instead of asking 1Password Connect again.
+            - A cached ID that no longer exists, or whose item was renamed, is dropped and looked up again.
+            - Items that were not found are also remembered, for 10 seconds at most,
+              so tasks on other hosts looking for the same missing item don't ask again.
+            - Set to C(0) to disable the cache.
+    cache_dir:
+        type: path
+        description:
+            - Directory of the cache enabled by C(cache_ttl), and of the state of C(rate_limit),
+              on the host that runs the module.
+            - Entries are stored in a subdirectory per Connect server and token.
+            - Defaults to C(~/.ansible/cache/onepassword_connect).
+    cache_items:
+        type: bool
+        default: false
+        description:
+            - Also keep the items read from 1Password Connect in the C(cache_ttl) cache, with their C(ETag).
+            - Reading a cached item sends a conditional request. If the item has not changed,
+              1Password Connect answers with C(304 Not Modified) and the cached copy is used.
+            - B(WARNING) Cached items contain their secrets. They are written unencrypted
+              to C(cache_dir), readable only by the user running the module.
+            - Has no effect unless C(cache_ttl) is set, or if 1Password Connect does not send an C(ETag).
+    cache_activity_interval:
+        type: int
+        default: 0
+        description:
+            - Read the activity feed of 1Password Connect at most once every this many seconds,
+              and drop the C(cache_ttl) entries about the items it reports as created, changed or deleted.
+            - The feed lists the requests Connect served, newest first. Clients sharing the cache keep the
+              newest request they saw, and only read the feed back to it.
+              If it can't be found in the last 1000 requests, the whole cache is dropped.
+            - Changes made through Connect are seen within this interval, so C(cache_ttl) can be much longer.
+              Changes made elsewhere, like in the 1Password apps, are not in the feed and are only seen once
+              the entries expire after C(cache_ttl).
+            - Has no effect unless C(cache_ttl) is set. Set to C(0) to disable.
+    hedge_percentile:
+        type: float
+        default: 0
+        description:
+            - Send a read again if 1Password Connect hasn't answered it once this percentile of the latencies
+              of the recent reads has passed, like C(95). The first answer is used and the other one is ignored.
+            - This cuts the time spent on the few reads that get stuck behind a slow request or replica.
+              With several replicas in C(hostname), the second copy usually goes to another one.
+            - Until 10 reads were timed, a read is sent again after half a second.
+              Latencies are only shared by the reads of a task, so a task that reads a single item
+              hedges it only if it takes longer than that.
+            - Only reads are sent twice, file downloads excepted. Not used over the
+              C(onepassword.connect.connect) connection, which answers one request at a time.
+            - Set to C(0) to disable.
+    hedge_max_ratio:
+        type: float
+        default: 0.1
+        description:
+            - Share of the reads that C(hedge_percentile) may send twice, to bound the extra load on 1Password Connect.
+            - The first read of a task may always be sent twice.
+    rate_limit:
+        type: float
+        default: 0
+        description:
+            - Maximum number of requests per second sent to 1Password Connect by all the tasks running
+              on the same host, like the forks of a play whose tasks run on the controller.
+            - The tasks share a token bucket kept in a file under C(cache_dir), per Connect server or set of replicas.
+            - The rate adapts to the server. It is halved when Connect answers with HTTP 429 or a server error,
+              lowered when its latency climbs well above the lowest one seen, and slowly raised back
+              to this limit while requests succeed.
+            - Tasks running on different hosts don't see each other's requests.
+            - Set to C(0) to disable.
+    timings:
+        type: bool
+        default: false
+        description:
+            - Return the requests sent to 1Password Connect under the C(op_timings) key of the result.
+            - Each request is listed with its method, path, status, payload sizes in bytes, number of retries,
+              whether it was sent twice by C(hedge_percentile) and its duration in milliseconds, retries included.
+            - Unless the request goes through an HTTP proxy or the C(onepassword.connect.connect) connection,
+              the time to the first byte of the response is also given, and the time spent on DNS, TCP and TLS
+              for requests that opened a new connection.
+            - The result also counts the lookups answered by the C(cache_ttl) cache, and those that were not.
+            - Vault and item IDs in paths are replaced by placeholders and query values are left out.
+              Tokens, item titles and secrets are never included.
     '''
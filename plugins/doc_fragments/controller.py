@@ -0,0 +1,40 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment:
+
+    DOCUMENTATION = r'''
+options:
+    run_on_controller:
+        type: bool
+        default: false
+        version_added: 2.5.0
+        description:
+            - Run the task in the Ansible process on the controller instead of sending the module to the target host.
+            - The task only talks to 1Password Connect, so this skips copying and starting the module on every host.
+            - The controller must be able to reach 1Password Connect. C(delegate_to) is ignored.
+            - Environment variables used as defaults, like C(OP_CONNECT_HOST), are read from the task's
+              C(environment) and then from the controller's environment.
+            - Ignored when the task runs over the C(onepassword.connect.connect) httpapi connection.
+            - The task fails if it also sets C(async). Without this option, the module runs asynchronously on the target as usual.
+    '''
+
+    READS = r'''
+options:
+    controller_cache_ttl:
+        type: int
+        default: 0
+        version_added: 2.5.0
+        description:
+            - With C(run_on_controller), number of seconds an item read by one host is reused for the other hosts
+              of the same playbook run, instead of each host reading it again.
+            - Tasks of every host reading the same item at the same time wait for a single request to 1Password Connect.
+              Items are shared between tasks using the same Connect server, token, C(vault) and C(item).
+            - Items are kept for the current C(ansible-playbook) run only, in a directory private to the user
+              in C(/dev/shm), or in the temporary directory on systems without it.
+              B(WARNING) They contain their secrets.
+            - Items written by C(onepassword.connect.generic_item) with C(run_on_controller) are read again.
+              Changes made any other way show up once the entry expires.
+            - Set to C(0) to read the item for every host.
+    '''
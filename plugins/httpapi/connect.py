@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020  1Password & Agilebits (@1Password)
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = '''
+name: connect
+author:
+  - 1Password (@1Password)
+version_added: 2.5.0
+short_description: HttpApi plugin for 1Password Connect
+description:
+  - Keeps a session with 1Password Connect open in Ansible's persistent connection process,
+    so every task sent through the connection reuses the same warm HTTP connection.
+  - Vault listings are cached by the connection and shared by all tasks that use it.
+  - Use with C(ansible_connection=ansible.netcommon.httpapi) and C(ansible_network_os=onepassword.connect.connect).
+    The Connect server address comes from the connection settings
+    (C(ansible_host), C(ansible_httpapi_port), C(ansible_httpapi_use_ssl)), so modules don't need C(hostname).
+  - Modules still authenticate every request with their C(token) option.
+requirements:
+  - The C(ansible.netcommon) collection, installed separately with C(ansible-galaxy collection install ansible.netcommon).
+    The other plugins of this collection don't need it.
+options:
+  vault_cache_ttl:
+    type: int
+    default: 60
+    description:
+      - Number of seconds a vault listing is served from the connection's cache.
+      - Set to C(0) to disable the cache.
+    vars:
+      - name: ansible_httpapi_op_vault_cache_ttl
+'''
+
+import re
+import time
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible_collections.ansible.netcommon.plugins.plugin_utils.httpapi_base import HttpApiBase
+
+from ansible_collections.onepassword.connect.plugins.plugin_utils.item_cache import token_fingerprint
+
+# GET /v1/vaults, with or without a query string
+_VAULT_LISTING = re.compile(r"^/v1/vaults/?(\?.*)?$")
+
+
+class HttpApi(HttpApiBase):
+
+    def __init__(self, connection):
+        super(HttpApi, self).__init__(connection)
+        self._vault_cache = {}
+
+    def handle_httperror(self, exc):
+        # Every error response goes back to the module, which maps it
+        # to the collection's errors the same way it does without httpapi.
+        return exc
+
+    def send_request(self, path, method="GET", body=None, headers=None):
+        """Sends a request to Connect and returns its status, headers and body.
+
+        Called by modules over the persistent connection socket.
+        :return: dict
+        """
+        cache_key = None
+        if method.upper() == "GET" and _VAULT_LISTING.match(path):
+            cache_key = (token_fingerprint((headers or {}).get("Authorization")), path)
+            cached = self._cached_vaults(cache_key)
+            if cached is not None:
+                return cached
+
+        response, response_data = self.connection.send(path, body, method=method, headers=headers)
+
+        result = {
+            "status": response.getcode(),
+            "headers": dict((k.lower(), v) for k, v in response.headers.items()),
+            "body": to_text(response_data.getvalue()),
+        }
+
+        if cache_key is not None and result["status"] == 200:
+            self._vault_cache[cache_key] = (time.monotonic(), result)
+
+        return result
+
+    def _cached_vaults(self, cache_key):
+        ttl = self.get_option("vault_cache_ttl")
+        entry = self._vault_cache.get(cache_key)
+        if not ttl or entry is None:
+            return None
+
+        cached_at, result = entry
+        if time.monotonic() - cached_at > ttl:
+            del self._vault_cache[cache_key]
+            return None
+        return result
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020  1Password & Agilebits (@1Password)
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = '''
+name: item
+author:
+  - 1Password (@1Password)
+version_added: 2.5.0
+short_description: Reads 1Password items or item fields on the Ansible controller
+description:
+  - Returns an item, or the value of one of its fields, for each item name or ID given.
+  - Runs on the controller, so reading a secret does not send a module to every target host.
+  - Items are cached for the life of the Ansible process that runs the lookup.
+    Lookups of the same item made at the same time share a single request to 1Password Connect.
+  - With C(shared_cache_ttl), items are also shared by all the worker processes of the playbook run,
+    so every host looking up the same item shares one request.
+options:
+  _terms:
+    description:
+      - Names or IDs of the items to read.
+    required: true
+    type: list
+    elements: str
+  vault:
+    description:
+      - Name or ID of the vault containing the items.
+    required: true
+    type: str
+  field:
+    description:
+      - Label or ID of the field whose value is returned.
+      - If not set, the lookup returns the whole item.
+    type: str
+  section:
+    description:
+      - An item section label or ID.
+      - If provided, the search for C(field) is limited to this section.
+    type: str
+  hostname:
+    description:
+      - URL of 1Password Connect.
+      - A list, or a comma-separated string, of the URLs of several replicas of the same Connect server
+        spreads the requests over them and fails over between them.
+    type: list
+    elements: str
+    env:
+      - name: OP_CONNECT_HOST
+  token:
+    description:
+      - The token to authenticate 1Password Connect calls.
+    type: str
+    env:
+      - name: OP_CONNECT_TOKEN
+  retries:
+    description:
+      - Number of times a request is retried after a connection error, a rate limit or a server error.
+    type: int
+    default: 3
+  retry_max_delay:
+    description:
+      - Maximum number of seconds spent retrying a single request.
+    type: float
+    default: 30
+  cache_ttl:
+    description:
+      - Number of seconds the vault listing and the IDs of items looked up by title are cached on disk.
+      - Unlike the in-memory item cache, this cache is shared by every Ansible process on the controller.
+      - Set to C(0) to disable the cache.
+    type: int
+    default: 0
+  cache_dir:
+    description:
+      - Directory of the cache enabled by C(cache_ttl).
+      - Defaults to C(~/.ansible/cache/onepassword_connect).
+    type: path
+  cache_items:
+    description:
+      - Also keep items in the C(cache_ttl) cache and revalidate them with conditional requests.
+      - B(WARNING) Cached items contain their secrets and are written unencrypted to C(cache_dir).
+    type: bool
+    default: false
+  cache_activity_interval:
+    description:
+      - Read the activity feed of 1Password Connect at most once every this many seconds,
+        and drop the C(cache_ttl) entries about the items changed through Connect since.
+      - Changes made elsewhere, like in the 1Password apps, are only seen once the entries expire after C(cache_ttl).
+      - Set to C(0) to disable.
+    type: int
+    default: 0
+  shared_cache_ttl:
+    description:
+      - Number of seconds an item read by the lookup of one host is reused by the lookups of the other hosts
+        of the same playbook run. Ansible runs each host's tasks in its own worker process.
+      - Items are kept for the current C(ansible-playbook) run only, in a directory private to the user
+        in C(/dev/shm). B(WARNING) They contain their secrets.
+      - On systems without C(/dev/shm), like macOS, items are only shared if C(shared_cache_on_disk) is set.
+      - Set to C(0) to only reuse items within one worker process.
+    type: int
+    default: 0
+  shared_cache_on_disk:
+    description:
+      - Let C(shared_cache_ttl) keep items in the temporary directory when there is no C(/dev/shm).
+      - B(WARNING) Items, secrets included, are then written to disk, and only removed
+        when a later playbook run starts sharing items.
+    type: bool
+    default: false
+  rate_limit:
+    description:
+      - Maximum number of requests per second sent to 1Password Connect by all the lookups and tasks
+        running on the controller, the forks of the play included.
+      - They share a token bucket kept in a file under C(cache_dir). Its rate is halved when Connect answers
+        with HTTP 429 or a server error, lowered when its latency climbs, and slowly raised back to this limit.
+      - Set to C(0) to disable.
+    type: float
+    default: 0
+  hedge_percentile:
+    description:
+      - Send a read again if 1Password Connect hasn't answered it once this percentile of the latencies
+        of the recent reads has passed, like C(95). The first answer is used.
+      - Set to C(0) to disable.
+    type: float
+    default: 0
+  hedge_max_ratio:
+    description:
+      - Share of the reads that C(hedge_percentile) may send twice.
+    type: float
+    default: 0.1
+'''
+
+EXAMPLES = '''
+---
+- name: Read the password of the "MySQL Database" item
+  ansible.builtin.debug:
+    msg: "{{ lookup('onepassword.connect.item', 'MySQL Database', vault='Infra', field='password') }}"
+  no_log: true
+
+- name: Read a field in a specific section
+  ansible.builtin.set_fact:
+    db_user: "{{ lookup('onepassword.connect.item', 'MySQL Database', vault='Infra', section='Admin', field='username') }}"
+  no_log: true
+
+- name: Read a whole item by ID
+  ansible.builtin.set_fact:
+    db_item: "{{ lookup('onepassword.connect.item', 'lixyh6993asdfq9njdzf221d3z', vault='2zbeu4smcibizsuxmyvhdh57b6') }}"
+  no_log: true
+'''
+
+RETURN = '''
+_raw:
+  description:
+    - The value of C(field) for each item if C(field) is set.
+    - Otherwise the items, as returned by 1Password Connect.
+  type: list
+  elements: raw
+'''
+
+import functools
+
+from ansible.errors import AnsibleLookupError
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.lookup import LookupBase
+from ansible.release import __version__ as ansible_version
+from ansible.utils.display import Display
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, cache, errors, fields, vault
+from ansible_collections.onepassword.connect.plugins.plugin_utils.item_cache import ItemCache, SharedItemCache, token_fingerprint
+
+display = Display()
+
+# Shared by every lookup run in this process
+_ITEM_CACHE = ItemCache()
+
+# Options passed to the client, as the modules' API options, see specs.API_CONFIG
+_API_OPTIONS = (
+    "retries", "retry_max_delay", "cache_ttl", "cache_dir", "cache_items", "cache_activity_interval",
+    "rate_limit", "hedge_percentile", "hedge_max_ratio",
+)
+
+
+class LookupModule(LookupBase):
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+
+        hostname = self.get_option("hostname")
+        token = self.get_option("token")
+        if not hostname or not token:
+            raise AnsibleLookupError("Server hostname or auth token not defined")
+
+        params = dict((name, self.get_option(name)) for name in _API_OPTIONS)
+        params["token"] = token
+        client = api.client_from_params(params, hostname, ansible_version=ansible_version)
+
+        vault_name = self.get_option("vault")
+        field_name = self.get_option("field")
+        section = self.get_option("section")
+
+        shared_cache = _shared_cache(
+            hostname, token, self.get_option("shared_cache_ttl"), self.get_option("shared_cache_on_disk")
+        )
+
+        results = []
+        for term in terms:
+            key = (tuple(hostname), token_fingerprint(token), vault_name, term)
+            fetch = functools.partial(vault.get_item, vault_name, term, client)
+            if shared_cache is not None:
+                fetch = functools.partial(_shared_fetch, shared_cache, ("lookup", vault_name, term), fetch)
+            try:
+                item = _ITEM_CACHE.get_or_fetch(key, fetch)
+                if field_name:
+                    results.append(fields.find_field(field_name, item, section=section).get("value"))
+                else:
+                    results.append(item)
+            except errors.NotFoundError as e:
+                raise AnsibleLookupError("Item or field not found: {0}".format(to_native(e.message)))
+            except errors.Error as e:
+                raise AnsibleLookupError(to_native(e.message))
+
+        return results
+
+
+def _shared_cache(hostname, token, ttl, on_disk=False):
+    """The cache shared by the worker processes of the playbook run, or None if disabled or unusable"""
+    if not ttl or ttl <= 0:
+        return None
+    try:
+        return SharedItemCache(cache.namespace(hostname, token), ttl=ttl, allow_disk=on_disk)
+    except (IOError, OSError) as e:
+        display.warning("Items read by other hosts can't be shared: {0}".format(to_native(e)))
+        return None
+
+
+def _shared_fetch(shared_cache, key, fetch):
+    return shared_cache.get_or_fetch(key, fetch)[0]
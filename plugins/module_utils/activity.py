@@ -0,0 +1,71 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+"""
+Invalidation of cached answers from the 1Password Connect activity feed.
+
+Connect lists the API requests it served, newest first. Reading that feed
+back to the newest request seen by the previous poll tells which items were
+created, changed or deleted through Connect in the meantime, so only the
+cache entries about those items need to be dropped. Changes made elsewhere,
+like in the 1Password apps, are not in the feed: entries still expire after
+the cache TTL.
+"""
+
+# Cache entry holding the newest request seen and when the feed was last read
+CURSOR_KEY = "activity/cursor"
+
+# Actions of requests that change an item
+CHANGES = ("CREATE", "UPDATE", "DELETE")
+
+PAGE_SIZE = 100
+
+# Pages read before giving up on finding the cursor. The whole cache is dropped instead.
+MAX_PAGES = 10
+
+
+def changes_since(list_page, cursor, page_size=PAGE_SIZE, max_pages=MAX_PAGES):
+    """Reads the activity feed back to the cursor of the previous poll
+
+    :param list_page: Called with `limit` and `offset`, returns a page of the feed, newest request first
+    :param dict cursor: Cursor stored by the previous poll, None if there is none
+    :return: (set, str, bool) The (vault ID, item ID) of the items changed since the cursor,
+        the ID of the newest request, and whether the feed was read back to the cursor.
+        If it wasn't, other items may have changed too.
+    """
+    if cursor is None or "request_id" not in cursor:
+        page = list_page(limit=1, offset=0)
+        return set(), page[0].get("requestId") if page else None, False
+
+    last_seen = cursor["request_id"]
+    changed = set()
+    head = None
+    for number in range(max_pages):
+        page = list_page(limit=page_size, offset=number * page_size)
+        for request in page:
+            if head is None:
+                head = request.get("requestId")
+            if last_seen is not None and request.get("requestId") == last_seen:
+                return changed, head, True
+            item = _changed_item(request)
+            if item is not None:
+                changed.add(item)
+
+        if len(page) < page_size:
+            # Oldest request Connect kept. Unless the feed was empty at the last poll, the cursor is gone.
+            return changed, head or last_seen, last_seen is None
+
+    return changed, head or last_seen, False
+
+
+def _changed_item(request):
+    resource = request.get("resource") or {}
+    if request.get("action") not in CHANGES or request.get("result") == "DENY" or resource.get("type") != "ITEM":
+        return None
+
+    vault_id = (resource.get("vault") or {}).get("id")
+    item_id = (resource.get("item") or {}).get("id")
+    if not vault_id or not item_id:
+        return None
+    return vault_id, item_id
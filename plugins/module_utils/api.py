@@ -2,66 +2,178 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
+import hashlib
 import json
 import os
 import base64
 
 import sys
 import re
+import threading
+import time
 
-from ansible.module_utils.urls import fetch_url
 from ansible.module_utils.six.moves.urllib.parse import urlencode, quote, urlunparse, urlparse
-from ansible_collections.onepassword.connect.plugins.module_utils import errors, const
+from ansible_collections.onepassword.connect.plugins.module_utils import errors, const, transport, retry, cache, timings, util, activity, ratelimit
 
 
-def create_client(module):
-    if not module.params.get("hostname") or not module.params.get("token"):
+def create_client(module, max_connections=transport.MAX_IDLE_CONNECTIONS):
+    # Over a persistent httpapi connection the server address comes from the connection
+    hostname = module.params.get("hostname") or ""
+    if (not hostname and not module._socket_path) or not module.params.get("token"):
         raise errors.AccessDeniedError(message="Server hostname or auth token not defined")
 
+    return client_from_params(
+        module.params,
+        hostname=hostname,
+        module=module,
+        http_transport=transport.create(hostname, module=module, maxsize=max_connections),
+    )
+
+
+def client_from_params(params, hostname, module=None, http_transport=None, ansible_version=None):
+    """Builds a client configured by the API options of a module, see specs.API_CONFIG"""
+    response_cache = cache.from_params(params, hostname, params["token"])
+
+    limiter = ratelimit.from_params(params, hostname)
+    if limiter is not None:
+        http_transport = transport.RateLimitedTransport(
+            http_transport or transport.create(hostname, module=module), limiter
+        )
+
+    if params.get("hedge_percentile"):
+        http_transport = transport.hedged(
+            http_transport or transport.create(hostname, module=module),
+            params["hedge_percentile"],
+            max_ratio=params.get("hedge_max_ratio", transport.DEFAULT_HEDGE_RATIO),
+        )
+
     return OnePassword(
-        hostname=module.params["hostname"],
-        token=module.params["token"],
-        module=module
+        hostname=hostname,
+        token=params["token"],
+        module=module,
+        http_transport=http_transport,
+        retry_policy=retry.RetryPolicy.from_params(params),
+        ansible_version=ansible_version,
+        cache=response_cache,
+        item_cache=response_cache if params.get("cache_items") else None,
+        recorder=timings.from_params(params),
+        activity_interval=params.get("cache_activity_interval"),
     )
 
 
 class OnePassword:
     API_VERSION = "v1"
-
-    def __init__(self, hostname, token, module):
-        self.hostname = hostname
+    VAULTS_CACHE_KEY = "vaults"
+
+    def __init__(
+            self,
+            hostname,
+            token,
+            module=None,
+            http_transport=None,
+            retry_policy=None,
+            ansible_version=None,
+            cache=None,
+            item_cache=None,
+            recorder=None,
+            activity_interval=None,
+    ):
+        """
+        :param hostname: URL of the Connect server, or a list of the URLs of its replicas.
+            Requests are spread over the replicas, see transport.ReplicaSet.
+        :param token: Connect API token
+        :param module: AnsibleModule the client works for. Plugins running on the
+            controller leave this unset and pass `ansible_version` instead.
+        :param cache: Stores vault listings and item IDs looked up by title. See cache.FileCache.
+        :param item_cache: Stores items with their ETag, so reading an unchanged item
+            again only costs a conditional request answered with 304 Not Modified.
+        :param recorder: Records every request sent. See timings.Recorder.
+        :param activity_interval: Seconds between two reads of the activity feed, which drop
+            the cached answers about items changed through Connect. See activity.changes_since.
+        """
+        self.hostnames = util.split_hostnames(hostname)
+        # Requests are built for the first replica and sent to the one the transport picks
+        self.hostname = self.hostnames[0] if self.hostnames else ""
         self.token = token
+        self.cache = cache
+        self.item_cache = item_cache
+        self.recorder = recorder
+        self.activity_interval = activity_interval
+        self._activity_lock = threading.Lock()
+        # Vault IDs by normalized name, for the life of the client
+        self._vault_ids = {}
+        self._vault_filter_supported = True
         self._module = module
+        self._retry_policy = retry_policy or retry.RetryPolicy()
+        # Keep-alive connections are shared by every request this client sends
+        self._transport = http_transport or transport.create(hostname, module=module)
+
+        if module is not None:
+            ansible_version = module.ansible_version
+
         self._user_agent = _format_user_agent(
             const.COLLECTION_VERSION,
             python_version=".".join(str(i) for i in sys.version_info[:3]),
-            ansible_version=self._module.ansible_version
+            ansible_version=ansible_version
         )
 
     def _send_request(self, path, method="GET", data=None, params=None):
-        fetch_kwargs = {
-            "url": build_endpoint(self.hostname, path, params=params, api_version=self.API_VERSION),
-            "method": method,
-            "headers": self._build_headers(),
-        }
+        return self._read_response(self._request(path, method=method, data=data, params=params))
+
+    def _request(self, path, method="GET", data=None, params=None, headers=None, sink=None):
+        """Sends a request, retrying it as the retry policy allows, and returns the raw response.
+
+        :param sink: Receives the body of a successful response in chunks instead of the
+            returned response, see `_Download`. It is reset before every attempt.
+        """
+        url = build_endpoint(self.hostname, path, params=params, api_version=self.API_VERSION)
+        body = None
 
         if method.upper() in ["POST", "PUT", "PATCH"]:
-            fetch_kwargs["data"] = self._module.jsonify(data)
+            body = self._module.jsonify(data) if self._module else json.dumps(data)
+
+        request_headers = self._build_headers()
+        request_headers.update(headers or {})
+
+        attempt = self._retry_policy.start(method)
+        start = time.perf_counter()
+        while True:
+            if sink is None:
+                resp = self._transport.request(method, url, headers=request_headers, body=body)
+            else:
+                sink.reset()
+                resp = self._transport.request(method, url, headers=request_headers, body=body, sink=sink.write)
+            if not attempt.backoff(resp.status, retry_after=resp.headers.get("retry-after")):
+                break
+
+        if self.recorder is not None:
+            self.recorder.record(
+                method, path, params,
+                status=resp.status,
+                bytes_out=len(body.encode("utf-8")) if body else 0,
+                bytes_in=len(resp.body or b"") + (sink.size if sink is not None else 0),
+                retries=attempt.retries,
+                elapsed=time.perf_counter() - start,
+                phases=resp.phases,
+                hedged=resp.hedged,
+            )
+        return resp
 
+    @staticmethod
+    def _read_response(resp):
         response_body = {}
 
-        resp, info = fetch_url(self._module, **fetch_kwargs)
-        if info.get("status") in [200, 204]:
-            if info.get("status") == 200:
+        if resp.status in [200, 204]:
+            if resp.status == 200:
                 try:
-                    response_body = json.loads(resp.read().decode("utf-8"))
+                    response_body = json.loads(resp.body.decode("utf-8"))
                 except (AttributeError, ValueError):
                     msg = "Server returned error with invalid JSON: {err}".format(
-                        err=info.get("msg", "<Undefined error>")
+                        err=resp.msg or "<Undefined error>"
                     )
-                    return self._module.fail_json(msg=msg)
+                    raise errors.APIError(status_code=resp.status, message=msg)
         else:
-            raise_for_error(info)
+            raise_for_error({"status": resp.status, "body": resp.body, "msg": resp.msg})
 
         return response_body
 
@@ -74,48 +186,237 @@ class OnePassword:
         }
 
     def get_item_by_id(self, vault_id, item_id):
+        self._raise_if_missing(vault_id, item_id)
+        try:
+            return self._fetch_item(vault_id, item_id)
+        except errors.NotFoundError:
+            self._remember_missing(vault_id, item_id)
+            raise
+
+    def _fetch_item(self, vault_id, item_id):
         path = "/vaults/{vault_id}/items/{item_id}".format(vault_id=vault_id, item_id=item_id)
-        return self._send_request(path)
+        if self.item_cache is None:
+            return self._send_request(path)
+
+        self._sync_cache()
+
+        # Revalidate the cached copy instead of downloading the item again
+        key = _item_cache_key(vault_id, item_id)
+        cached = self.item_cache.get(key)
+        headers = {"If-None-Match": cached["etag"]} if cached else None
 
-    def get_item_by_name(self, vault_id, item_name):
         try:
-            item = self._get_item_id_by_name(vault_id, item_name)
-            item_id = item["id"]
-        except KeyError:
-            raise errors.NotFoundError
+            resp = self._request(path, headers=headers)
+            self._count_cache_lookup(resp.status == 304 and cached)
+            if resp.status == 304 and cached:
+                return cached["item"]
+            item = self._read_response(resp)
+        except errors.NotFoundError:
+            self.item_cache.invalidate(key)
+            raise
+
+        etag = resp.headers.get("etag")
+        if etag:
+            self.item_cache.set(key, {"etag": etag, "item": item})
+        elif cached:
+            self.item_cache.invalidate(key)
+        return item
 
-        return self.get_item_by_id(vault_id, item_id)
+    def get_item_by_name(self, vault_id, item_name):
+        self._raise_if_missing(vault_id, item_name)
+        key = _item_id_cache_key(vault_id, item_name)
+
+        def _fetch_id():
+            try:
+                item_id = self._get_item_id_by_name(vault_id, item_name)["id"]
+            except KeyError:
+                raise errors.NotFoundError
+            self._index_title(vault_id, item_id, item_name)
+            return item_id
+
+        def _is_current(item):
+            # The item may have been renamed since its ID was cached
+            return item.get("title") == item_name
+
+        try:
+            return self._resolve(
+                key, _fetch_id, lambda item_id: self._fetch_item(vault_id, item_id), is_current=_is_current
+            )
+        except errors.NotFoundError:
+            self._remember_missing(vault_id, item_name)
+            raise
 
     def create_item(self, vault_id, item):
         path = "/vaults/{vault_id}/items".format(vault_id=vault_id)
-        return self._send_request(path, method="POST", data=item)
+        created = self._send_request(path, method="POST", data=item)
+        self._forget_missing(vault_id, item.get("title"))
+        return created
 
     def update_item(self, vault_id, item):
         path = "/vaults/{vault_id}/items/{item_id}".format(vault_id=item["vault"]["id"], item_id=item["id"])
-        return self._send_request(path, method="PUT", data=item)
+        self._forget_item(item["vault"]["id"], item["id"])
+        # The update may rename the item
+        self._forget_titles(item["vault"]["id"], item["id"])
+        updated = self._send_request(path, method="PUT", data=item)
+        self._forget_missing(item["vault"]["id"], item.get("title"))
+        return updated
 
     def delete_item(self, vault_id, item_id):
         path = "/vaults/{vault_id}/items/{item_id}".format(vault_id=vault_id, item_id=item_id)
+        self._forget_item(vault_id, item_id)
+        self._forget_titles(vault_id, item_id)
         return self._send_request(path, method="DELETE")
 
-    def get_vaults(self):
-        path = "/vaults"
+    def get_files(self, vault_id, item_id):
+        """Lists the files attached to an item, without their content"""
+        path = "/vaults/{vault_id}/items/{item_id}/files".format(vault_id=vault_id, item_id=item_id)
         return self._send_request(path)
 
+    def download_file(self, vault_id, item_id, file_id, fileobj, algorithm="sha256"):
+        """Writes the content of a file attached to an item to `fileobj`, one chunk at a time
+
+        The content is never held in memory whole. When the request is retried,
+        `fileobj` is truncated and written again from the start.
+        :param fileobj: Binary file object open for writing, that can seek and truncate
+        :param algorithm: Name of the hashlib algorithm the content is hashed with
+        :return: (int, str) Size of the content in bytes and its hex digest
+        """
+        path = "/vaults/{vault_id}/items/{item_id}/files/{file_id}/content".format(
+            vault_id=vault_id, item_id=item_id, file_id=file_id
+        )
+        download = _Download(fileobj, algorithm)
+        resp = self._request(path, headers={"Accept": "*/*"}, sink=download)
+        if not 200 <= resp.status < 300:
+            raise_for_error({"status": resp.status, "body": resp.body, "msg": resp.msg})
+        return download.size, download.hash.hexdigest()
+
+    def _forget_item(self, vault_id, item_id):
+        if self.item_cache is not None:
+            self.item_cache.invalidate(_item_cache_key(vault_id, item_id))
+
+    # Items known not to exist, so lookups repeated by other tasks
+    # don't ask the server again for a short while
+
+    def _raise_if_missing(self, vault_id, identifier):
+        self._sync_cache()
+        if self.cache is not None and self.cache.get(_missing_cache_key(vault_id, identifier)):
+            self._count_cache_lookup(True)
+            raise errors.NotFoundError
+
+    def _remember_missing(self, vault_id, identifier):
+        if self.cache is not None:
+            self.cache.set(_missing_cache_key(vault_id, identifier), True, ttl=cache.MISSING_TTL)
+
+    def _forget_missing(self, vault_id, identifier):
+        if self.cache is not None and identifier:
+            self.cache.invalidate(_missing_cache_key(vault_id, identifier))
+
+    # Entries about items changed through Connect, dropped as the activity feed reports them
+
+    def _sync_cache(self):
+        """Drops the cached answers about items changed since the activity feed was last read
+
+        The feed is read at most once every `activity_interval` seconds by all the
+        clients sharing the cache, long-lived ones included.
+        """
+        if self.cache is None or not self.activity_interval:
+            return
+
+        with self._activity_lock:
+            now = time.time()
+            cursor = self.cache.get(activity.CURSOR_KEY)
+            if cursor is not None and now - cursor.get("polled_at", 0) < self.activity_interval:
+                return
+
+            try:
+                changed, head, complete = activity.changes_since(self._list_activity, cursor)
+            except errors.Error:
+                # Entries still expire after the cache TTL. Try again after the interval.
+                self.cache.set(activity.CURSOR_KEY, dict(cursor or {}, polled_at=now))
+                return
+
+            if complete:
+                for vault_id, item_id in changed:
+                    self._forget_changed_item(vault_id, item_id)
+            else:
+                self.cache.clear()
+            self.cache.set(activity.CURSOR_KEY, {"request_id": head, "polled_at": now})
+
+    def _list_activity(self, limit, offset):
+        return self._send_request("/activity", params={"limit": limit, "offset": offset})
+
+    def _index_title(self, vault_id, item_id, title):
+        """Remembers the titles an item was looked up by, to drop them when the item changes"""
+        if self.cache is None:
+            return
+        key = _titles_cache_key(vault_id, item_id)
+        titles = self.cache.get(key) or []
+        if title not in titles:
+            self.cache.set(key, titles + [title])
+
+    def _forget_titles(self, vault_id, item_id):
+        """Drops the IDs cached for the titles an item was looked up by, and returns those titles"""
+        if self.cache is None:
+            return []
+        titles_key = _titles_cache_key(vault_id, item_id)
+        titles = self.cache.get(titles_key) or []
+        for title in titles:
+            self.cache.invalidate(_item_id_cache_key(vault_id, title))
+        self.cache.invalidate(titles_key)
+        return titles
+
+    def _forget_changed_item(self, vault_id, item_id):
+        for title in self._forget_titles(vault_id, item_id):
+            self.cache.invalidate(_missing_cache_key(vault_id, title))
+        self.cache.invalidate(_missing_cache_key(vault_id, item_id))
+        self._forget_item(vault_id, item_id)
+
+    def get_vaults(self):
+        return self._resolve(self.VAULTS_CACHE_KEY, self._list_vaults, lambda vaults: vaults)
+
     def get_vault_id_by_name(self, vault_name):
         """Find the vault ID associated with the given vault name
 
-        Loops through the results of the 'GET vault' query and tries
-        to do an exact match with each vault name that is returned.
+        Asks the server for vaults with that name using a SCIM-style filter,
+        and falls back to listing every vault if the server doesn't support it.
+        Names are compared after unicode normalization.
         :param vault_name: Name of the requested vault
         : return: str
         """
-        resp = self.get_vaults()
+        normalized_name = util.utf8_normalize(vault_name)
+        if normalized_name in self._vault_ids:
+            return self._vault_ids[normalized_name]
 
-        for vault in resp:
-            if vault["name"] == vault_name:
-                return vault["id"]
-        raise errors.NotFoundError
+        def _find(vaults):
+            for vault in vaults:
+                if util.utf8_normalize(vault.get("name")) == normalized_name:
+                    return vault["id"]
+            raise errors.NotFoundError(message="Vault not found")
+
+        key = "vault-id/{0}".format(normalized_name)
+        try:
+            vault_id = self._resolve(key, lambda: _find(self._find_vaults_by_name(vault_name)), lambda v: v)
+        except errors.NotFoundError:
+            # The name may only match after normalization, which the server filter doesn't do
+            vault_id = _find(self.get_vaults())
+
+        self._vault_ids[normalized_name] = vault_id
+        return vault_id
+
+    def _find_vaults_by_name(self, vault_name):
+        if self._vault_filter_supported:
+            query_filter = {"filter": 'name eq "{vault_name}"'.format(vault_name=vault_name)}
+            try:
+                return self._send_request("/vaults", params=query_filter)
+            except errors.BadRequestError:
+                # Older Connect servers don't filter vaults
+                self._vault_filter_supported = False
+
+        return self.get_vaults()
+
+    def _list_vaults(self):
+        path = "/vaults"
+        return self._send_request(path)
 
     def _get_item_id_by_name(self, vault_id, item_name):
         """Find the Item ID associated with the given Item Name
@@ -140,6 +441,37 @@ class OnePassword:
 
         return resp[0]
 
+    def _resolve(self, key, fetch, resolve, is_current=None):
+        """Calls `resolve` with the cached value of `key`, fetching and caching it if needed.
+
+        A cached value that leads `resolve` to a NotFoundError, or to a result
+        `is_current` rejects, may be out of date, so it is dropped and `resolve`
+        runs again with a freshly fetched value.
+        """
+        if self.cache is None:
+            return resolve(fetch())
+
+        self._sync_cache()
+        cached = self.cache.get(key)
+        if cached is not None:
+            try:
+                value = resolve(cached)
+                if is_current is None or is_current(value):
+                    self._count_cache_lookup(True)
+                    return value
+            except errors.NotFoundError:
+                pass
+            self.cache.invalidate(key)
+
+        self._count_cache_lookup(False)
+        value = fetch()
+        self.cache.set(key, value)
+        return resolve(value)
+
+    def _count_cache_lookup(self, hit):
+        if self.recorder is not None:
+            self.recorder.cache_lookup(bool(hit))
+
 
 def build_endpoint(hostname, path, params=None, api_version=None):
     url_parts = list(urlparse(hostname))
@@ -179,10 +511,48 @@ def raise_for_error(response_info):
         raise errors.AccessDeniedError(**err_details)
     elif err_details["status_code"] == 400:
         raise errors.BadRequestError(**err_details)
+    elif err_details["status_code"] == 429:
+        raise errors.RateLimitError(**err_details)
     else:
         raise errors.APIError(**err_details)
 
 
+class _Download:
+    """Sink writing a response body to a file object, hashing it on the way"""
+
+    def __init__(self, fileobj, algorithm):
+        self._fileobj = fileobj
+        self._algorithm = algorithm
+        self.reset()
+
+    def reset(self):
+        self._fileobj.seek(0)
+        self._fileobj.truncate()
+        self.size = 0
+        self.hash = hashlib.new(self._algorithm)
+
+    def write(self, chunk):
+        self._fileobj.write(chunk)
+        self.hash.update(chunk)
+        self.size += len(chunk)
+
+
+def _item_cache_key(vault_id, item_id):
+    return "item/{0}/{1}".format(vault_id, item_id)
+
+
+def _item_id_cache_key(vault_id, title):
+    return "item-id/{0}/{1}".format(vault_id, title)
+
+
+def _titles_cache_key(vault_id, item_id):
+    return "titles/{0}/{1}".format(vault_id, item_id)
+
+
+def _missing_cache_key(vault_id, identifier):
+    return "missing/{0}/{1}".format(vault_id, identifier)
+
+
 def _format_user_agent(collection_version, python_version=None, ansible_version=None):
     return "op-connect-ansible/{version} Python/{py_version} Ansible/{ansible}".format(
         version=collection_version,
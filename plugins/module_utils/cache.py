@@ -0,0 +1,156 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from ansible_collections.onepassword.connect.plugins.module_utils import util
+
+"""
+On-disk cache for Connect API answers that rarely change, like the vault
+listing and the IDs of items looked up by title.
+
+Entries live in a directory per Connect server and token, so clients
+using different tokens never see each other's answers. Entries are written
+to a temporary file and renamed into place, so a concurrent reader sees
+either the old entry or the new one. Once the cache holds more than
+`max_entries` entries, the least recently used ones are removed.
+
+The cache is best effort: any error reading or writing it is treated as a miss.
+"""
+
+DEFAULT_CACHE_DIR = "~/.ansible/cache/onepassword_connect"
+DEFAULT_MAX_ENTRIES = 512
+
+# Items that were not found are remembered for a short time only,
+# since they may be created at any moment
+MISSING_TTL = 10
+
+_SUFFIX = ".json"
+
+
+def from_params(params, hostname, token):
+    """Builds the cache configured by module parameters, or None if caching is disabled"""
+    ttl = params.get("cache_ttl")
+    if not ttl or ttl <= 0:
+        return None
+
+    return FileCache(
+        params.get("cache_dir") or DEFAULT_CACHE_DIR,
+        namespace=namespace(hostname, token),
+        ttl=ttl,
+    )
+
+
+def namespace(hostname, token):
+    """Name of the cache directory used for a Connect server, or set of replicas, and token"""
+    scope = "{0}\n{1}".format(",".join(sorted(util.split_hostnames(hostname))), token or "")
+    return hashlib.sha256(scope.encode("utf-8")).hexdigest()
+
+
+class FileCache:
+
+    def __init__(self, directory, namespace, ttl, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        """
+        :param str directory: Root directory of the cache
+        :param str namespace: Subdirectory holding the entries of this cache
+        :param float ttl: Number of seconds an entry stays valid
+        :param int max_entries: Number of entries kept before the least recently used are removed
+        """
+        self.directory = os.path.join(os.path.expanduser(directory), namespace)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+
+    def get(self, key):
+        """Returns the value stored under key, or None if it is missing or expired"""
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+
+        if self._clock() - entry.get("stored_at", 0) > entry.get("ttl", self.ttl):
+            self._remove(path)
+            return None
+
+        try:
+            # The modification time orders entries for eviction
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key, value, ttl=None):
+        """Stores value under key, for `ttl` seconds if given instead of the cache's TTL"""
+        entry = {"key": key, "stored_at": self._clock(), "value": value}
+        if ttl is not None:
+            entry["ttl"] = min(ttl, self.ttl)
+        tmp_path = None
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory, mode=0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except (IOError, OSError, TypeError, ValueError):
+            if tmp_path:
+                self._remove(tmp_path)
+            return
+
+        self._evict()
+
+    def invalidate(self, key):
+        self._remove(self._path(key))
+
+    def clear(self):
+        """Removes every entry"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        for name in names:
+            if name.endswith(_SUFFIX):
+                self._remove(os.path.join(self.directory, name))
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + _SUFFIX)
+
+    def _evict(self):
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(_SUFFIX)]
+        except OSError:
+            return
+
+        if len(names) <= self.max_entries:
+            return
+
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+
+        entries.sort()
+        for _mtime, path in entries[:len(entries) - self.max_entries]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
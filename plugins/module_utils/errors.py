@@ -31,6 +31,14 @@ class FieldNotUnique(Error):
     DEFAULT_MSG = "Provided field label is not unique. Please provide a section or a more specific field label."
 
 
+class FileNotUnique(Error):
+    DEFAULT_MSG = "More than one file attached to the item has that name. Please provide the file ID instead."
+
+
+class DownloadError(Error):
+    DEFAULT_MSG = "The downloaded file doesn't match the file described by 1Password Connect."
+
+
 class APIError(Error):
     DEFAULT_MSG = "Error while communicating with Secrets Server"
     STATUS_CODE = 400
@@ -50,6 +58,11 @@ class BadRequestError(APIError):
     STATUS_CODE = 400
 
 
+class RateLimitError(APIError):
+    DEFAULT_MSG = "Too many requests sent to Secrets Server. Please try again later"
+    STATUS_CODE = 429
+
+
 class ServerError(APIError):
     DEFAULT_MSG = "Secret Server encountered an error. Please try again"
     STATUS_CODE = 500
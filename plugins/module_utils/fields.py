@@ -2,7 +2,7 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
-from ansible_collections.onepassword.connect.plugins.module_utils import const, util
+from ansible_collections.onepassword.connect.plugins.module_utils import api, const, errors, util
 
 
 def field_from_params(field_params, generate_field_value=False):
@@ -127,3 +127,72 @@ def flatten_fieldset(fieldset):
         flattened[key] = field
 
     return flattened
+
+
+def find_field(field_identifier, item, section=None) -> dict:
+    """
+    Tries to find the requested field within the provided item.
+
+    The field may be a valid client UUID or it may be the field's label.
+    If the section kwarg is provided, the function limits its search
+    to fields within that section.
+    """
+    return FieldIndex(item).find(field_identifier, section=section)
+
+
+class FieldIndex:
+    """Lookup tables over an item's fields, built once and reused for many searches.
+
+    Field labels and section labels are compared after utf-8 normalization.
+    """
+
+    def __init__(self, item):
+        self._fields = item.get("fields") or []
+        self._by_label = {}
+        self._by_id = {}
+        self._sections = {}
+
+        for field in self._fields:
+            self._by_label.setdefault(util.utf8_normalize(field.get("label")), []).append(field)
+            self._by_id.setdefault(field.get("id"), []).append(field)
+
+        for section in item.get("sections") or []:
+            self._sections.setdefault(util.utf8_normalize(section.get("label")), section["id"])
+
+    def find(self, field_identifier, section=None) -> dict:
+        """Same as find_field(), for the indexed item"""
+        if not self._fields:
+            raise errors.NotFoundError(message="Item has no fields")
+
+        section_uuid = None
+        if section:
+            section_uuid = self._get_section_uuid(section)
+
+        if api.valid_client_uuid(field_identifier):
+            candidates = self._by_id.get(field_identifier, [])
+            not_found_msg = "Field not found in item"
+        else:
+            candidates = self._by_label.get(util.utf8_normalize(field_identifier), [])
+            not_found_msg = "Field with provided label not found in item"
+
+        for field in candidates:
+            if section_uuid is None or _section_id(field) == section_uuid:
+                return field
+
+        raise errors.NotFoundError(message=not_found_msg)
+
+    def _get_section_uuid(self, section_identifier):
+        if not self._sections:
+            return None
+
+        if api.valid_client_uuid(section_identifier):
+            return section_identifier
+
+        try:
+            return self._sections[util.utf8_normalize(section_identifier)]
+        except KeyError:
+            raise errors.NotFoundError(message="Section label not found in item")
+
+
+def _section_id(field):
+    return (field.get("section") or {}).get("id")
@@ -0,0 +1,163 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+from ansible_collections.onepassword.connect.plugins.module_utils import errors, util
+
+"""
+Helpers for the files attached to items.
+
+File content is written to a temporary file next to its destination as it
+arrives, hashed on the way, and moved over the destination only once it is
+complete and verified. The destination never holds a partial download.
+"""
+
+DEFAULT_ALGORITHM = "sha256"
+
+# Bytes read at a time when hashing a local file
+_CHUNK_SIZE = 64 * 1024
+
+
+def item_files(item, api_client):
+    """Returns the files attached to an item, asking Connect if the item doesn't list them"""
+    if "files" in item:
+        return item["files"] or []
+    return api_client.get_files(item["vault"]["id"], item["id"])
+
+
+def find_file(files, name_or_id):
+    """Returns the file with the given ID, or the only file with the given name
+
+    Names are compared after unicode normalization.
+    :param list files: Files attached to an item, as listed by Connect
+    :param str name_or_id: Name or ID of the file
+    :return: dict
+    """
+    for attachment in files:
+        if attachment.get("id") == name_or_id:
+            return attachment
+
+    name = util.utf8_normalize(name_or_id)
+    matches = [f for f in files if util.utf8_normalize(f.get("name")) == name]
+    if not matches:
+        raise errors.NotFoundError(message="File not found")
+    if len(matches) > 1:
+        raise errors.FileNotUnique
+    return matches[0]
+
+
+def destination(dest, attachment):
+    """Returns the path a file is written to, named after the file if `dest` is a directory"""
+    if not os.path.isdir(dest):
+        return dest
+
+    name = os.path.basename(attachment.get("name") or "")
+    if name in ("", ".", ".."):
+        raise errors.Error(message="File {0} has no usable name, set dest to the path of a file".format(
+            attachment.get("id")
+        ))
+    return os.path.join(dest, name)
+
+
+def parse_checksum(checksum):
+    """Splits a checksum in the `<algorithm>:<hex digest>` form. A bare digest is taken as sha256.
+
+    :return: (str, str) The algorithm and the lowercase hex digest
+    """
+    algorithm, sep, digest = checksum.partition(":")
+    if not sep:
+        algorithm, digest = DEFAULT_ALGORITHM, checksum
+    algorithm = algorithm.strip().lower()
+    if algorithm not in hashlib.algorithms_available:
+        raise errors.Error(message="Unsupported checksum algorithm: {0}".format(algorithm))
+    return algorithm, digest.strip().lower()
+
+
+def file_digest(path, algorithm=DEFAULT_ALGORITHM):
+    """Hex digest of a local file, read one chunk at a time"""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download(api_client, vault_id, item_id, attachment, dest, checksum=None, check_mode=False):
+    """Downloads the content of a file attached to an item to `dest`
+
+    Nothing is downloaded if `dest` already matches `checksum`. Otherwise the
+    content is checked against the size Connect reports and against `checksum`,
+    and replaces `dest` only if it differs from it.
+    :param dict attachment: The file, as listed by Connect
+    :param str dest: Path of the destination file
+    :param str checksum: Expected `<algorithm>:<hex digest>` of the content, if known
+    :param check_mode: Whether Ansible is running in check mode. Nothing is downloaded if True.
+    :return: (bool, str) Whether `dest` changed, and the `<algorithm>:<hex digest>` of the
+        content. The digest is None in check mode if no checksum was given.
+    """
+    algorithm, expected = parse_checksum(checksum) if checksum else (DEFAULT_ALGORITHM, None)
+    exists = os.path.isfile(dest)
+
+    if expected and exists and file_digest(dest, algorithm) == expected:
+        return False, _format_checksum(algorithm, expected)
+
+    if check_mode:
+        if expected:
+            return True, _format_checksum(algorithm, expected)
+        # Without the content, an existing file of the same size is taken as unchanged
+        return not exists or os.path.getsize(dest) != attachment.get("size"), None
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest)),
+                                    prefix=".{0}.".format(os.path.basename(dest)), suffix=".part")
+    try:
+        with os.fdopen(fd, "w+b") as f:
+            size, digest = api_client.download_file(vault_id, item_id, attachment["id"], f, algorithm=algorithm)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if attachment.get("size") is not None and size != attachment["size"]:
+            raise errors.DownloadError(message="Received {0} bytes of {1} instead of {2}".format(
+                size, attachment.get("name"), attachment["size"]
+            ))
+        if expected and digest != expected:
+            raise errors.DownloadError(message="Checksum of {0} is {1}:{2}, expected {1}:{3}".format(
+                attachment.get("name"), algorithm, digest, expected
+            ))
+
+        changed = not (exists and os.path.getsize(dest) == size and file_digest(dest, algorithm) == digest)
+        if changed:
+            _replace(tmp_path, dest)
+        else:
+            os.remove(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return changed, _format_checksum(algorithm, digest)
+
+
+def _replace(tmp_path, dest):
+    """Moves a downloaded file over `dest`, keeping the mode and ownership of the file it replaces.
+
+    A new file keeps the mode mkstemp gives it, readable by its owner only,
+    since files attached to items are often keys or certificates.
+    """
+    if os.path.exists(dest):
+        shutil.copymode(dest, tmp_path)
+        dest_stat = os.stat(dest)
+        try:
+            os.chown(tmp_path, dest_stat.st_uid, dest_stat.st_gid)
+        except OSError:
+            # Only root can give files away
+            pass
+    os.replace(tmp_path, dest)
+
+
+def _format_checksum(algorithm, digest):
+    return "{0}:{1}".format(algorithm, digest)
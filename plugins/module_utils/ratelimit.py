@@ -0,0 +1,186 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import contextlib
+import fcntl
+import json
+import os
+import time
+
+from ansible_collections.onepassword.connect.plugins.module_utils import cache
+
+"""
+Client-side rate limit shared by every process sending requests to the same
+Connect server from one host.
+
+With many forks, each task process has its own client and can't see how many
+requests the others send. SharedRateLimiter keeps a single token bucket in a
+small state file per Connect server, or set of replicas, locked with flock, so
+every process takes its tokens from the same bucket.
+
+The rate follows AIMD: every answered request raises it a little, up to
+`max_rate`. It is halved when Connect answers with 429 or a server error,
+and lowered by a quarter when the average latency climbs well above the
+lowest one seen, a sign of requests queueing up on the server. A decrease
+happens at most once per `DECREASE_INTERVAL`, so a burst of errors caused by
+the same overload only counts once.
+
+The limiter is best effort: if its state file can't be used, requests are
+sent without waiting.
+"""
+
+# Lowest rate, in requests per second, the limiter goes down to, unless `max_rate` is lower
+MIN_RATE = 1.0
+# Share of `max_rate` regained per second of requests sent at the current rate
+INCREASE = 0.05
+# Rate kept after Connect answered with 429 or a server error
+ERROR_DECREASE = 0.5
+# Rate kept after the latency climbed above LATENCY_FACTOR times the lowest one
+LATENCY_DECREASE = 0.75
+LATENCY_FACTOR = 2.0
+# Seconds between two decreases of the rate
+DECREASE_INTERVAL = 1.0
+# Weight of the latest answer in the average latency
+LATENCY_ALPHA = 0.2
+# Share of the distance to the average latency the lowest one moves up by at
+# each answer, so it follows a server that got slower for good
+BASELINE_DRIFT = 0.01
+
+_FILE_NAME = "ratelimit-{0}.json"
+
+
+def from_params(params, hostname):
+    """Builds the limiter configured by module parameters, or None if rate limiting is disabled"""
+    max_rate = params.get("rate_limit")
+    if not max_rate or max_rate <= 0:
+        return None
+
+    directory = os.path.expanduser(params.get("cache_dir") or cache.DEFAULT_CACHE_DIR)
+    return SharedRateLimiter(
+        os.path.join(directory, _FILE_NAME.format(cache.namespace(hostname, None))),
+        max_rate=max_rate,
+    )
+
+
+def is_overload(status):
+    """Whether a response status tells Connect is overloaded"""
+    return status == 429 or status >= 500
+
+
+class SharedRateLimiter:
+
+    def __init__(self, path, max_rate, clock=time.time, sleep=time.sleep):
+        """
+        :param str path: State file shared by the processes limited together
+        :param float max_rate: Highest rate, in requests per second, the limiter allows
+        """
+        self.path = path
+        self.max_rate = max_rate
+        self._clock = clock
+        self._sleep = sleep
+
+    def acquire(self):
+        """Waits until a request may be sent, and returns the seconds waited.
+
+        A process finding the bucket empty takes its token ahead, leaving the
+        bucket below zero, and sleeps until the token would have been added.
+        Processes coming next wait behind it without checking the state again.
+        """
+        with self._state() as state:
+            if state is None:
+                return 0
+            state["tokens"] -= 1
+            wait = -state["tokens"] / state["rate"] if state["tokens"] < 0 else 0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def observe(self, status, latency=None):
+        """Adapts the rate to an answer from Connect.
+
+        :param int status: Status of the response, -1 if the connection failed
+        :param float latency: Seconds the request took, None if it doesn't tell about the server's load
+        """
+        with self._state() as state:
+            if state is None or status == -1:
+                return
+
+            if is_overload(status):
+                self._decrease(state, ERROR_DECREASE)
+                return
+
+            if latency is not None:
+                average = state.get("latency")
+                average = latency if average is None else average + LATENCY_ALPHA * (latency - average)
+                baseline = state.get("base_latency")
+                baseline = average if baseline is None else min(average, baseline + BASELINE_DRIFT * (average - baseline))
+                state["latency"], state["base_latency"] = average, baseline
+                if average > LATENCY_FACTOR * baseline and self._decrease(state, LATENCY_DECREASE):
+                    return
+
+            state["rate"] = min(self.max_rate, state["rate"] + INCREASE * self.max_rate / state["rate"])
+
+    def _decrease(self, state, factor):
+        now = self._clock()
+        if now - state.get("decreased_at", 0) < DECREASE_INTERVAL:
+            return False
+        # A rate limit below MIN_RATE is never exceeded
+        floor = min(self.max_rate, MIN_RATE)
+        state["rate"] = max(floor, min(state["rate"], self.max_rate) * factor)
+        state["tokens"] = min(state["tokens"], _capacity(state["rate"]))
+        state["decreased_at"] = now
+        return True
+
+    @contextlib.contextmanager
+    def _state(self):
+        """Holds the lock on the state file and yields the state, refilled with the tokens earned
+        since it was last written, or None if the file can't be used. Changes are written back."""
+        try:
+            directory = os.path.dirname(self.path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory, mode=0o700)
+            state_file = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), "r+")
+        except (IOError, OSError):
+            yield None
+            return
+
+        # Closing the file releases the lock
+        with state_file:
+            try:
+                fcntl.flock(state_file, fcntl.LOCK_EX)
+                state = self._refill(state_file.read())
+            except (IOError, OSError):
+                yield None
+                return
+
+            yield state
+
+            try:
+                state_file.seek(0)
+                state_file.truncate()
+                json.dump(state, state_file)
+            except (IOError, OSError):
+                pass
+
+    def _refill(self, content):
+        try:
+            state = json.loads(content) if content else None
+        except ValueError:
+            state = None
+        if not isinstance(state, dict) or not isinstance(state.get("rate"), (int, float)) or state["rate"] <= 0:
+            state = {"rate": self.max_rate, "tokens": _capacity(self.max_rate)}
+
+        # The rate limit may have been lowered since the state was written
+        state["rate"] = min(state["rate"], self.max_rate)
+        now = self._clock()
+        elapsed = max(0, now - state.get("updated", now))
+        state["tokens"] = min(_capacity(state["rate"]), state.get("tokens", 0) + elapsed * state["rate"])
+        state["updated"] = now
+        return state
+
+
+def _capacity(rate):
+    # Tokens pile up for one second at most, so an idle limiter lets through a burst of that size
+    return max(1.0, rate)
@@ -0,0 +1,134 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+"""
+Retry policy for transient Connect API errors.
+
+Backoff follows the "decorrelated jitter" scheme: each delay is drawn
+between the base delay and three times the previous delay, capped by the
+time left in the overall retry budget.
+"""
+
+DEFAULT_RETRIES = 3
+DEFAULT_MAX_DELAY = 30
+DEFAULT_BASE_DELAY = 0.5
+
+# Status -1 is how transports report connection failures
+RETRY_STATUSES = (-1, 429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class RetryPolicy:
+
+    def __init__(
+            self,
+            retries=DEFAULT_RETRIES,
+            max_delay=DEFAULT_MAX_DELAY,
+            base_delay=DEFAULT_BASE_DELAY,
+            methods=IDEMPOTENT_METHODS,
+            sleep=time.sleep,
+            clock=time.monotonic,
+    ):
+        """
+        :param int retries: Maximum number of retries after the first attempt
+        :param float max_delay: Maximum seconds spent retrying, measured from the first attempt
+        :param float base_delay: Smallest delay between two attempts
+        :param methods: HTTP methods that may be sent more than once
+        """
+        self.retries = retries
+        self.max_delay = max_delay
+        self.base_delay = base_delay
+        self.methods = tuple(m.upper() for m in methods)
+        self._sleep = sleep
+        self._clock = clock
+
+    @classmethod
+    def from_params(cls, params):
+        """Builds a policy from module parameters, using defaults for unset values"""
+        retries = params.get("retries")
+        max_delay = params.get("retry_max_delay")
+        return cls(
+            retries=DEFAULT_RETRIES if retries is None else retries,
+            max_delay=DEFAULT_MAX_DELAY if max_delay is None else max_delay,
+        )
+
+    def start(self, method):
+        return RetryState(self, method)
+
+
+class RetryState:
+    """Tracks the attempts made for a single request"""
+
+    def __init__(self, policy, method):
+        self.policy = policy
+        self.method = method.upper()
+        self.retries = 0
+        self._started = policy._clock()
+        self._previous_delay = policy.base_delay
+
+    def backoff(self, status, retry_after=None):
+        """Waits before the next attempt if the response is retryable.
+
+        :param int status: Status of the last response
+        :param str retry_after: Value of the Retry-After header, if any
+        :return: True if the caller should send the request again
+        """
+        delay = self.next_delay(status, retry_after)
+        if delay is None:
+            return False
+
+        self.policy._sleep(delay)
+        self.retries += 1
+        return True
+
+    def next_delay(self, status, retry_after=None):
+        """Seconds to wait before retrying, or None if the request should not be retried."""
+        policy = self.policy
+        if status not in RETRY_STATUSES or self.method not in policy.methods:
+            return None
+        if self.retries >= policy.retries:
+            return None
+
+        budget = policy.max_delay - (policy._clock() - self._started)
+        if budget <= 0:
+            return None
+
+        server_delay = parse_retry_after(retry_after)
+
+        if server_delay is not None:
+            delay = server_delay
+        else:
+            delay = random.uniform(policy.base_delay, self._previous_delay * 3)
+            delay = min(delay, budget)
+
+        if delay > budget:
+            # Server wants us to wait longer than we're allowed to
+            return None
+
+        self._previous_delay = max(delay, policy.base_delay)
+        return delay
+
+
+def parse_retry_after(value):
+    """Converts a Retry-After header (seconds or HTTP-date) to seconds from now."""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -22,7 +22,47 @@ def op_item():
     """Helper that compiles item spec and all common module specs
     :return dict
     """
-    item_spec = dict(
+    item_spec = item_options()
+    item_spec.update(common_options())
+    item_spec.update(CONTROLLER_CONFIG)
+    return item_spec
+
+
+def op_items():
+    """Helper that compiles the bulk item spec and all common module specs
+    :return dict
+    """
+    item_spec = item_options()
+    # Each item may use its own vault, or the module-level default
+    item_spec["vault_id"] = dict(type="str")
+
+    items_spec = dict(
+        items=dict(
+            type="list",
+            elements="dict",
+            required=True,
+            options=item_spec,
+            # Name always required when creating a new Item
+            required_if=[("state", "present", ("name",))]
+        ),
+        vault_id=dict(
+            type="str",
+            fallback=(env_fallback, ['OP_VAULT_ID'])
+        ),
+        concurrency=dict(
+            type="int",
+            default=4
+        ),
+    )
+    items_spec.update(common_options())
+    return items_spec
+
+
+def item_options():
+    """Options describing a single item
+    :return dict
+    """
+    return dict(
         vault_id=dict(
             required=True,
             fallback=(env_fallback, ['OP_VAULT_ID'])
@@ -55,8 +95,6 @@ def op_item():
         tags=TAGS,
         state=STATE
     )
-    item_spec.update(common_options())
-    return item_spec
 
 
 def op_item_info():
@@ -80,9 +118,15 @@ def op_item_info():
         ),
         vault=dict(
             type="str"
-        )
+        ),
+        concurrency=dict(
+            type="int",
+            default=8
+        ),
     )
     item_spec.update(common_options())
+    item_spec.update(CONTROLLER_CONFIG)
+    item_spec.update(CONTROLLER_READ_CONFIG)
     return item_spec
 
 
@@ -98,7 +142,11 @@ def op_field_info():
         ),
         field=dict(
             type="str",
-            required=True
+        ),
+        fields=dict(
+            type="list",
+            elements="dict",
+            options=FIELD_SELECTOR
         ),
         vault=dict(
             type="str",
@@ -109,9 +157,39 @@ def op_field_info():
         )
     )
     field_spec.update(common_options())
+    field_spec.update(CONTROLLER_CONFIG)
+    field_spec.update(CONTROLLER_READ_CONFIG)
     return field_spec
 
 
+def op_item_file():
+    """
+    Helper that compiles the item_file argspec with common module specs
+    :return: dict
+    """
+    file_spec = dict(
+        item=dict(
+            type="str",
+            required=True
+        ),
+        vault=dict(
+            type="str",
+            required=True,
+        ),
+        file=dict(
+            type="str"
+        ),
+        dest=dict(
+            type="path"
+        ),
+        checksum=dict(
+            type="str"
+        ),
+    )
+    file_spec.update(common_options())
+    return file_spec
+
+
 # Configuration for the "Secure Password/Value Generator"
 GENERATOR_RECIPE_OPTIONS = dict(
     length=dict(
@@ -135,12 +213,69 @@ GENERATOR_RECIPE_OPTIONS = dict(
 # API config options for all modules
 API_CONFIG = dict(
     hostname=dict(
+        type="list",
+        elements="str",
         fallback=(env_fallback, ['OP_CONNECT_HOST'])
     ),
     token=dict(
         fallback=(env_fallback, ['OP_CONNECT_TOKEN']),
         no_log=True
     ),
+    retries=dict(
+        type="int",
+        default=3
+    ),
+    retry_max_delay=dict(
+        type="float",
+        default=30
+    ),
+    cache_ttl=dict(
+        type="int",
+        default=0
+    ),
+    cache_dir=dict(
+        type="path"
+    ),
+    cache_items=dict(
+        type="bool",
+        default=False
+    ),
+    cache_activity_interval=dict(
+        type="int",
+        default=0
+    ),
+    hedge_percentile=dict(
+        type="float",
+        default=0
+    ),
+    hedge_max_ratio=dict(
+        type="float",
+        default=0.1
+    ),
+    rate_limit=dict(
+        type="float",
+        default=0
+    ),
+    timings=dict(
+        type="bool",
+        default=False
+    ),
+)
+
+# Options read by the action plugins of modules that can run on the controller
+CONTROLLER_CONFIG = dict(
+    run_on_controller=dict(
+        type="bool",
+        default=False
+    ),
+)
+
+# Options read by the action plugins of modules reading items on the controller
+CONTROLLER_READ_CONFIG = dict(
+    controller_cache_ttl=dict(
+        type="int",
+        default=0
+    ),
 )
 
 # User-configurable attributes for one or more fields on an Item
@@ -164,6 +299,13 @@ FIELD = dict(
         options=GENERATOR_RECIPE_OPTIONS
     )
 )
+# Selects one field of an Item for field_info
+FIELD_SELECTOR = dict(
+    field=dict(type="str", required=True),
+    section=dict(type="str"),
+    key=dict(type="str", no_log=False),
+)
+
 #############################################
 # Common attributes
 #############################################
@@ -0,0 +1,129 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import re
+import threading
+
+"""
+Per-request instrumentation of the Connect API client.
+
+When enabled, every request the client sends is recorded with its method,
+path, status, payload sizes, retries and timings. Vault and item IDs in the
+path are replaced by placeholders and only the names of query parameters are
+kept, so the records hold no IDs, item titles, secrets or tokens. Lookups
+answered by the client's caches are counted as hits, the others as misses.
+"""
+
+RESULT_KEY = "op_timings"
+
+# Connection phases reported by transports that can measure them, in order
+PHASES = ("dns", "connect", "tls", "ttfb")
+
+_ID_SEGMENTS = (
+    (re.compile(r"^/vaults/[^/]+"), "/vaults/{vault_id}"),
+    (re.compile(r"/items/[^/]+"), "/items/{item_id}"),
+    (re.compile(r"/files/[^/]+"), "/files/{file_id}"),
+)
+
+# Keeps the attribute a SCIM filter tests, like "title" in `title eq "Database"`
+_FILTER_ATTRIBUTE = re.compile(r"^\s*(\w+)")
+
+
+def from_params(params):
+    """Builds the recorder configured by module parameters, or None if timings are off"""
+    if not params.get("timings"):
+        return None
+    return Recorder()
+
+
+def result(client):
+    """Module result entries carrying the requests recorded by the client, if it records any"""
+    recorder = getattr(client, "recorder", None)
+    if recorder is None:
+        return {}
+    return {RESULT_KEY: recorder.report()}
+
+
+def path_template(path, params=None):
+    """Returns the path of a request with IDs and query values redacted
+
+    >>> path_template("/vaults/abc/items", {"filter": 'title eq "Database"'})
+    '/vaults/{vault_id}/items?filter=title'
+    """
+    template = "/" + path.strip("/")
+    for pattern, placeholder in _ID_SEGMENTS:
+        template = pattern.sub(placeholder, template)
+
+    if params:
+        query = []
+        for name in sorted(params):
+            match = _FILTER_ATTRIBUTE.match(str(params[name])) if name == "filter" else None
+            query.append("{0}={1}".format(name, match.group(1)) if match else name)
+        template = "{0}?{1}".format(template, "&".join(query))
+    return template
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+class Recorder:
+    """Collects one record per request sent by a client"""
+
+    def __init__(self):
+        self.calls = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, method, path, params=None, status=None, bytes_out=0, bytes_in=0,
+               retries=0, elapsed=None, phases=None, hedged=False):
+        """
+        :param str method: HTTP method
+        :param str path: Path of the request, IDs included. Redacted before it is stored.
+        :param dict params: Query parameters. Only their names are stored.
+        :param int status: Status of the last attempt, -1 if the connection failed
+        :param int bytes_out: Size of the request body
+        :param int bytes_in: Size of the response body
+        :param int retries: Number of attempts after the first one
+        :param float elapsed: Seconds spent on the request, retries and backoff included
+        :param dict phases: Seconds spent in each of PHASES during the last attempt,
+            for transports that measure them
+        :param bool hedged: Whether a second copy of the last attempt was sent, see transport.HedgedTransport
+        """
+        phases = phases or {}
+        call = {
+            "method": method.upper(),
+            "path": path_template(path, params),
+            "status": status,
+            "bytes_out": bytes_out,
+            "bytes_in": bytes_in,
+            "retries": retries,
+            "total_ms": _ms(elapsed),
+            "hedged": hedged,
+        }
+        for phase in PHASES:
+            call["{0}_ms".format(phase)] = _ms(phases.get(phase))
+        self.calls.append(call)
+
+    def cache_lookup(self, hit):
+        """Counts a lookup in one of the client's caches"""
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def report(self):
+        return {
+            "calls": list(self.calls),
+            "requests": len(self.calls),
+            "retries": sum(c["retries"] for c in self.calls),
+            "hedges": sum(1 for c in self.calls if c["hedged"]),
+            "bytes_out": sum(c["bytes_out"] for c in self.calls),
+            "bytes_in": sum(c["bytes_in"] for c in self.calls),
+            "total_ms": round(sum(c["total_ms"] or 0 for c in self.calls), 3),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
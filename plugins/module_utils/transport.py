@@ -0,0 +1,621 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import functools
+import random
+import socket
+import ssl
+import threading
+import time
+from collections import deque, namedtuple
+
+from ansible.module_utils.six.moves import queue
+
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible.module_utils.connection import Connection, ConnectionError
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.parse import urlparse
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
+from ansible.module_utils.urls import fetch_url, open_url
+from ansible_collections.onepassword.connect.plugins.module_utils import retry, util
+
+"""
+HTTP transports used by the Connect API client.
+
+Every transport exposes `request(method, url, headers=None, body=None, sink=None)`
+and returns a `Response`. Connection failures are reported the same way
+`fetch_url` reports them: a status of -1 and a message, never an exception.
+
+With a `sink`, the body of a successful response is passed to it in chunks
+of CHUNK_SIZE bytes as it arrives instead of being kept in memory, and the
+`Response` body is empty. Error responses are always read whole.
+"""
+
+DEFAULT_TIMEOUT = 10
+
+# Idle connections kept per host. Modules are single-threaded, so this
+# only matters for callers that share a client across threads.
+MAX_IDLE_CONNECTIONS = 10
+
+# Bytes read at a time from bodies passed to a sink
+CHUNK_SIZE = 64 * 1024
+
+# Weight of the latest request in a replica's average latency
+EWMA_ALPHA = 0.3
+# Server errors in a row after which a replica is ejected
+EJECT_AFTER_ERRORS = 3
+# Seconds an ejected replica is left alone
+EJECT_COOLDOWN = 30
+
+# Share of reads that may be sent twice by a HedgedTransport
+DEFAULT_HEDGE_RATIO = 0.1
+# Reads timed before the hedging delay follows their latency percentile
+HEDGE_MIN_SAMPLES = 10
+# Seconds a read waits before it is sent again, until enough reads were timed
+HEDGE_INITIAL_DELAY = 0.5
+# Latest read latencies the hedging delay is computed from
+_HEDGE_WINDOW = 200
+
+Response = namedtuple("Response", ["status", "headers", "body", "msg", "phases", "hedged"])
+# Seconds spent resolving, connecting, negotiating TLS and waiting for the first
+# byte, for transports that measure them. None for the others. `hedged` tells
+# whether a second copy of the request was sent, see HedgedTransport.
+Response.__new__.__defaults__ = (None, False)
+
+# Errors raised when the server closed an idle keep-alive socket
+# before we tried to reuse it.
+_STALE_CONNECTION_ERRORS = (
+    http_client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def create(hostname, module=None, validate_certs=True, maxsize=MAX_IDLE_CONNECTIONS):
+    """Picks the transport to use for the given Connect hostname.
+
+    Modules running over the onepassword.connect.connect httpapi plugin send
+    their requests through its persistent connection. Requests routed through
+    an HTTP proxy are sent with `fetch_url` (or `open_url` outside of a module),
+    which know how to tunnel through it. Everything else goes through a
+    keep-alive connection pool. Several hostnames are spread over by a
+    ReplicaSet, each with its own transport.
+    """
+    if module is not None:
+        if module._socket_path:
+            return PersistentTransport(module._socket_path)
+        validate_certs = module.params.get("validate_certs", True)
+
+    hostnames = util.split_hostnames(hostname)
+    if len(hostnames) > 1:
+        return ReplicaSet([
+            (replica, _create_one(replica, module=module, validate_certs=validate_certs, maxsize=maxsize))
+            for replica in hostnames
+        ])
+    return _create_one(hostnames[0] if hostnames else "", module=module, validate_certs=validate_certs, maxsize=maxsize)
+
+
+def _create_one(hostname, module=None, validate_certs=True, maxsize=MAX_IDLE_CONNECTIONS):
+    if _uses_proxy(hostname):
+        if module is not None:
+            return FetchUrlTransport(module)
+        return OpenUrlTransport(validate_certs=validate_certs)
+
+    return ConnectionPool(
+        timeout=DEFAULT_TIMEOUT,
+        validate_certs=validate_certs,
+        maxsize=maxsize,
+    )
+
+
+def _uses_proxy(url):
+    parts = urlparse(url)
+    if parts.scheme not in getproxies():
+        return False
+    return not proxy_bypass(parts.hostname or "")
+
+
+class ConnectionPool:
+    """Reuses keep-alive HTTP(S) connections, keyed by scheme and host.
+
+    Safe to share between threads: a connection is only ever used by one
+    request at a time and goes back to the pool once its response is read.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, validate_certs=True, maxsize=MAX_IDLE_CONNECTIONS):
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.validate_certs = validate_certs
+        # Loading the CA bundle is expensive, so build the context once and only for HTTPS
+        self._ssl_context = None
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        parts = urlparse(url)
+        key = (parts.scheme, parts.netloc)
+        target = parts.path or "/"
+        if parts.query:
+            target = "{0}?{1}".format(target, parts.query)
+        if isinstance(body, str):
+            # http.client would encode text bodies as latin-1
+            body = body.encode("utf-8")
+
+        while True:
+            conn, reused = self._checkout(key)
+            phases = {}
+            answered = False
+            try:
+                if not reused:
+                    _timed_connect(conn, phases)
+                sent = time.perf_counter()
+                conn.request(method, target, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                answered = True
+                phases["ttfb"] = time.perf_counter() - sent
+                data, size = _read_body(resp, resp.status, sink)
+            except _SinkFailed as e:
+                # The body was not read to the end, so the connection can't be reused
+                conn.close()
+                raise e.error
+            except _STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused and not answered and method.upper() in retry.IDEMPOTENT_METHODS:
+                    # The server dropped the idle socket, try a fresh one. Other methods may
+                    # have reached the server before it went away, the retry policy decides.
+                    continue
+                # Part of the body may have reached the sink, the client's retry resets it
+                return _failed(e)
+            except (http_client.HTTPException, socket.error) as e:
+                conn.close()
+                return _failed(e)
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+
+            return Response(
+                status=resp.status,
+                headers=dict((k.lower(), v) for k, v in resp.getheaders()),
+                body=data,
+                msg="OK ({0} bytes)".format(size) if resp.status < 400 else resp.reason,
+                phases=phases,
+            )
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _checkout(self, key):
+        with self._lock:
+            conns = self._idle.get(key)
+            if conns:
+                return conns.pop(), True
+        return self._connect(key), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.maxsize:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def _connect(self, key):
+        scheme, netloc = key
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = _ssl_context(self.validate_certs)
+            return http_client.HTTPSConnection(netloc, timeout=self.timeout, context=self._ssl_context)
+        return http_client.HTTPConnection(netloc, timeout=self.timeout)
+
+
+class ReplicaSet:
+    """Spreads requests over several replicas of the same Connect server.
+
+    Each request goes to the better of two replicas picked at random, the one
+    with the lowest average latency once weighed by its recent errors and the
+    requests it is already serving. A replica that can't be reached, or that
+    answers with server errors EJECT_AFTER_ERRORS times in a row, is left alone
+    for EJECT_COOLDOWN seconds. When every replica is ejected, the one whose
+    cooldown ends first is used anyway.
+
+    Requests with an idempotent method that fail to reach a replica are sent to
+    the next one right away, unless part of their body already went to a sink.
+    """
+
+    def __init__(self, replicas, cooldown=EJECT_COOLDOWN, clock=time.monotonic, rng=None):
+        """
+        :param replicas: (hostname, transport) of each replica. Only the scheme and
+            host of request URLs are replaced by the ones of the chosen replica.
+        """
+        self._replicas = [_Replica(hostname, replica_transport) for hostname, replica_transport in replicas]
+        self.cooldown = cooldown
+        self._clock = clock
+        self._random = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        parts = urlparse(url)
+        target = parts.path or "/"
+        if parts.query:
+            target = "{0}?{1}".format(target, parts.query)
+
+        written = []
+        if sink is not None:
+            def _sink(chunk):
+                written.append(len(chunk))
+                sink(chunk)
+            options = {"sink": _sink}
+        else:
+            options = {}
+
+        tried = []
+        while True:
+            replica = self._pick(tried)
+            tried.append(replica)
+
+            start = time.perf_counter()
+            resp = replica.transport.request(method, replica.base + target, headers=headers, body=body, **options)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                replica.in_flight -= 1
+                replica.observe(resp.status, elapsed, self._clock(), self.cooldown)
+
+            can_fail_over = method.upper() in retry.IDEMPOTENT_METHODS and not written
+            if resp.status != -1 or not can_fail_over or len(tried) == len(self._replicas):
+                return resp
+
+    def close(self):
+        for replica in self._replicas:
+            replica.transport.close()
+
+    def _pick(self, tried):
+        with self._lock:
+            now = self._clock()
+            left = [r for r in self._replicas if r not in tried]
+            healthy = [r for r in left if r.ejected_until <= now]
+            if len(healthy) > 1:
+                first, second = self._random.sample(healthy, 2)
+                replica = first if first.score() <= second.score() else second
+            elif healthy:
+                replica = healthy[0]
+            else:
+                replica = min(left, key=lambda r: r.ejected_until)
+            replica.in_flight += 1
+            return replica
+
+
+class _Replica:
+
+    def __init__(self, hostname, replica_transport):
+        parts = urlparse(hostname)
+        self.base = "{0}://{1}".format(parts.scheme, parts.netloc)
+        self.transport = replica_transport
+        # Average seconds per request, None until a request succeeds
+        self.latency = None
+        self.errors = 0
+        self.ejected_until = 0
+        self.in_flight = 0
+
+    def observe(self, status, elapsed, now, cooldown):
+        if status == -1 or status >= 500:
+            self.errors += 1
+            if status == -1 or self.errors >= EJECT_AFTER_ERRORS:
+                self.ejected_until = now + cooldown
+            return
+
+        self.errors = 0
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency = EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * self.latency
+
+    def score(self):
+        # Replicas that never answered yet are tried first
+        return (self.latency or 0.0) * (1 + self.errors) * (1 + self.in_flight)
+
+
+class HedgedTransport:
+    """Sends a second copy of slow reads and returns whichever answer comes first.
+
+    A GET that hasn't been answered once `percentile` of the recent read
+    latencies has passed is sent again through the same transport, which may
+    pick another replica. The first answer that isn't a connection failure
+    wins, the other request is left to finish in the background. Hedges are
+    capped to `max_ratio` of the reads, so the extra load on the server stays
+    bounded. Requests streaming to a sink and other methods are sent once.
+    """
+
+    def __init__(self, inner, percentile, max_ratio=DEFAULT_HEDGE_RATIO):
+        self._inner = inner
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self._latencies = deque(maxlen=_HEDGE_WINDOW)
+        self.reads = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        if method.upper() != "GET" or sink is not None:
+            options = {"sink": sink} if sink is not None else {}
+            return self._inner.request(method, url, headers=headers, body=body, **options)
+
+        with self._lock:
+            self.reads += 1
+            delay = self.delay()
+
+        answers = queue.Queue()
+        self._send(answers, method, url, headers, body)
+        try:
+            return answers.get(timeout=delay)
+        except queue.Empty:
+            if not self._take_hedge():
+                return answers.get()
+
+        self._send(answers, method, url, headers, body)
+        resp = answers.get()
+        if resp.status == -1:
+            # The retry policy only sees a connection failure if both copies failed
+            resp = answers.get()
+        return resp._replace(hedged=True)
+
+    def delay(self):
+        """Seconds a read waits for its answer before it is sent again"""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return HEDGE_INITIAL_DELAY
+        ordered = sorted(self._latencies)
+        rank = max(1, int(round(self.percentile / 100.0 * len(ordered))))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def close(self):
+        self._inner.close()
+
+    def _take_hedge(self):
+        # The first read may always be hedged, the later ones within `max_ratio`
+        with self._lock:
+            if self.hedges > self.max_ratio * (self.reads - 1):
+                return False
+            self.hedges += 1
+            return True
+
+    def _send(self, answers, method, url, headers, body):
+        def _run():
+            start = time.perf_counter()
+            try:
+                resp = self._inner.request(method, url, headers=headers, body=body)
+            except Exception as e:
+                # The caller waits on the queue, it must get an answer
+                resp = _failed(e)
+            if resp.status != -1:
+                with self._lock:
+                    self._latencies.append(time.perf_counter() - start)
+            answers.put(resp)
+
+        # A daemon thread doesn't keep the module running once the other copy answered
+        thread = threading.Thread(target=_run)
+        thread.daemon = True
+        thread.start()
+
+
+class RateLimitedTransport:
+    """Sends requests at the pace allowed by a rate limiter shared with other processes.
+
+    See ratelimit.SharedRateLimiter. Every answer is reported to the limiter,
+    with its latency unless the body was streamed to a sink, since a large
+    download is slow without the server being busy.
+    """
+
+    def __init__(self, inner, limiter):
+        self._inner = inner
+        self.limiter = limiter
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        self.limiter.acquire()
+        options = {"sink": sink} if sink is not None else {}
+        start = time.perf_counter()
+        resp = self._inner.request(method, url, headers=headers, body=body, **options)
+        self.limiter.observe(resp.status, latency=None if sink is not None else time.perf_counter() - start)
+        return resp
+
+    def close(self):
+        self._inner.close()
+
+
+def hedged(inner, percentile, max_ratio=DEFAULT_HEDGE_RATIO):
+    """Wraps `inner` in a HedgedTransport, unless hedging is disabled or can't help.
+
+    The persistent connection of the httpapi plugin answers one request at a time.
+    """
+    sender = inner._inner if isinstance(inner, RateLimitedTransport) else inner
+    if not percentile or percentile <= 0 or isinstance(sender, PersistentTransport):
+        return inner
+    return HedgedTransport(inner, percentile, max_ratio=max_ratio)
+
+
+class FetchUrlTransport:
+    """Sends every request with Ansible's `fetch_url` on a new connection."""
+
+    def __init__(self, module):
+        self._module = module
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        resp, info = fetch_url(self._module, url, data=body, headers=headers, method=method)
+
+        if resp is not None:
+            try:
+                data, _size = _read_body(resp, info.get("status"), sink)
+            except _SinkFailed as e:
+                raise e.error
+            except (http_client.HTTPException, socket.error) as e:
+                return _failed(e)
+        else:
+            data = info.get("body")
+
+        return Response(
+            status=info.get("status"),
+            headers=dict((k, v) for k, v in info.items() if k not in ("body", "msg", "status", "url")),
+            body=data,
+            msg=info.get("msg"),
+        )
+
+    def close(self):
+        pass
+
+
+class OpenUrlTransport:
+    """Sends every request with Ansible's `open_url`, for callers without a module."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, validate_certs=True):
+        self.timeout = timeout
+        self.validate_certs = validate_certs
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        try:
+            resp = open_url(
+                url,
+                data=body,
+                headers=headers,
+                method=method,
+                timeout=self.timeout,
+                validate_certs=self.validate_certs,
+            )
+        except HTTPError as e:
+            return Response(
+                status=e.code,
+                headers=dict((k.lower(), v) for k, v in e.headers.items()),
+                body=e.read(),
+                msg=str(e),
+            )
+        except (URLError, http_client.HTTPException, socket.error) as e:
+            return _failed(e)
+
+        try:
+            data, size = _read_body(resp, resp.getcode(), sink)
+        except _SinkFailed as e:
+            raise e.error
+        except (http_client.HTTPException, socket.error) as e:
+            return _failed(e)
+        return Response(
+            status=resp.getcode(),
+            headers=dict((k.lower(), v) for k, v in resp.headers.items()),
+            body=data,
+            msg="OK ({0} bytes)".format(size),
+        )
+
+    def close(self):
+        pass
+
+
+class PersistentTransport:
+    """Sends requests through the httpapi persistent connection process.
+
+    The connection knows the Connect server address, so only the path and
+    query string of each URL are used. Bodies cross the connection socket
+    whole, so a sink gets them in one chunk.
+    """
+
+    def __init__(self, socket_path):
+        self._connection = Connection(socket_path)
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        parts = urlparse(url)
+        path = "/" + parts.path.lstrip("/")
+        if parts.query:
+            path = "{0}?{1}".format(path, parts.query)
+
+        try:
+            resp = self._connection.send_request(path, method=method, body=body, headers=headers)
+        except ConnectionError as e:
+            return _failed(e)
+
+        data = to_bytes(resp.get("body"))
+        if sink is not None and 200 <= resp["status"] < 300:
+            sink(data)
+            data = b""
+        return Response(
+            status=resp["status"],
+            headers=resp.get("headers") or {},
+            body=data,
+            msg=resp.get("msg") or "",
+        )
+
+    def close(self):
+        pass
+
+
+class _SinkFailed(Exception):
+    """Carries an error raised by a sink, like a full disk, past the handling of connection errors"""
+
+    def __init__(self, error):
+        super(_SinkFailed, self).__init__(error)
+        self.error = error
+
+
+def _read_body(resp, status, sink=None):
+    """Reads a response body, or passes it to `sink` one chunk at a time if the request succeeded.
+
+    Returns the body kept in memory, empty if it went to the sink, and the body's size.
+    """
+    if sink is None or status is None or not 200 <= status < 300:
+        data = resp.read()
+        return data, len(data or b"")
+
+    size = 0
+    while True:
+        chunk = resp.read(CHUNK_SIZE)
+        if not chunk:
+            return b"", size
+        size += len(chunk)
+        try:
+            sink(chunk)
+        except Exception as e:
+            raise _SinkFailed(e)
+
+
+def _timed_connect(conn, phases):
+    """Opens a connection, recording how long DNS, TCP and TLS took in `phases`"""
+    conn._create_connection = functools.partial(_timed_create_connection, phases)
+    start = time.perf_counter()
+    conn.connect()
+    if isinstance(conn, http_client.HTTPSConnection):
+        # TLS is negotiated once the socket is open
+        phases["tls"] = max(0.0, time.perf_counter() - start - phases["dns"] - phases["connect"])
+
+
+def _timed_create_connection(phases, address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None):
+    host, port = address
+    start = time.perf_counter()
+    addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    resolved = time.perf_counter()
+    phases["dns"] = resolved - start
+
+    error = None
+    for _family, _type, _proto, _name, sockaddr in addresses:
+        try:
+            # Connecting to the resolved address skips a second lookup
+            sock = socket.create_connection(sockaddr[:2], timeout, source_address)
+        except socket.error as e:
+            error = e
+            continue
+        phases["connect"] = time.perf_counter() - resolved
+        return sock
+    raise error or socket.error("getaddrinfo returned no addresses")
+
+
+def _ssl_context(validate_certs):
+    context = ssl.create_default_context()
+    if not validate_certs:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _failed(err):
+    return Response(status=-1, headers={}, body=None, msg="Request failed: {0}".format(err))
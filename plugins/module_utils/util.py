@@ -13,3 +13,14 @@ def utf8_normalize(raw):
 
     unicode_normalized = unicodedata.normalize("NFKD", text_type(raw))
     return unicode_normalized.strip()
+
+
+def split_hostnames(hostname):
+    """Returns the URLs of the Connect servers given as one URL, a comma-separated string or a list"""
+    if not hostname:
+        return []
+    if isinstance(hostname, (list, tuple)):
+        values = hostname
+    else:
+        values = text_type(hostname).split(",")
+    return [value.strip() for value in values if value and value.strip()]
@@ -2,11 +2,13 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
+import threading
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 from ansible.module_utils.common.dict_transformations import recursive_diff
-from ansible_collections.onepassword.connect.plugins.module_utils import errors, fields, const
+from ansible_collections.onepassword.connect.plugins.module_utils import api, errors, fields, const
 
 Section = namedtuple("Section", ["id", "label"])
 
@@ -36,6 +38,133 @@ def find_item(params, api_client):
         return None
 
 
+def reconcile_item(params, api_client, check_mode=False):
+    """
+    Creates, updates or deletes a single item so it matches the given parameters.
+
+    :param params: dict Item parameters in the shape of specs.op_item()
+    :param api_client: Connect API client
+    :param check_mode: Whether Ansible is running in check mode. No changes saved if True.
+    :return: (bool, dict) Where bool represents whether action modified an Item in 1Password.
+    """
+    item = find_item(params, api_client)
+
+    if params["state"].lower() == "absent":
+        return delete_item(item, api_client, check_mode=check_mode)
+
+    if not item:
+        return create_item(params, api_client, check_mode=check_mode)
+
+    return update_item(params, item, api_client, check_mode=check_mode)
+
+
+def reconcile_items(items_params, api_client, concurrency=1, check_mode=False):
+    """
+    Reconciles many items at once, spreading the work over a pool of threads.
+
+    A failure only affects the item that caused it.
+
+    :param list of dict items_params: Parameters for each item, see reconcile_item()
+    :param api_client: Connect API client. Must be safe to share between threads.
+    :param int concurrency: Maximum number of items reconciled at the same time
+    :param check_mode: Whether Ansible is running in check mode. No changes saved if True.
+    :return: list of dict with the result for each item, in the same order as items_params
+    """
+
+    def _reconcile(params):
+        result = {"op_item": {}, "changed": False, "failed": False}
+        try:
+            changed, item = reconcile_item(params, api_client, check_mode=check_mode)
+            result.update({"op_item": item, "changed": bool(changed)})
+        except TypeError as e:
+            result.update({"failed": True, "msg": "Invalid Item config: {err}".format(err=e)})
+        except errors.Error as e:
+            result.update({"failed": True, "msg": e.message})
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(_reconcile, items_params))
+
+
+def get_item(vault, item, api_client):
+    """
+    Reads an item given the name or ID of both the vault and the item.
+
+    :param vault: Vault name or ID
+    :param item: Item title or ID
+    :param api_client: Connect API client instance
+    :return: dict
+    """
+    if not api.valid_client_uuid(vault):
+        vault = api_client.get_vault_id_by_name(vault)
+
+    return _get_item_in_vault(vault, item, api_client)
+
+
+def _get_item_in_vault(vault_id, item, api_client):
+    if not api.valid_client_uuid(item):
+        return api_client.get_item_by_name(vault_id, item)
+    return api_client.get_item_by_id(vault_id, item)
+
+
+def search_vaults(item, vault_ids, api_client, concurrency=1):
+    """
+    Looks for an item name or ID in several vaults at once.
+
+    Vaults are searched in parallel, but the outcome is the same as searching
+    them one by one in the given order: the item from the first vault that has
+    it is returned, unless a vault before it fails with another error (like an
+    ambiguous item name), in which case that error is raised.
+    Vaults after the deciding one are not searched any further.
+
+    As in get_item(), the item is looked up by ID if it looks like one, by title otherwise.
+
+    :param item: Item title or ID
+    :param list vault_ids: IDs of the vaults to search, in order of preference
+    :param api_client: Connect API client. Must be safe to share between threads.
+    :param int concurrency: Maximum number of vaults searched at the same time
+    :return: dict
+    """
+    lock = threading.Lock()
+    # Index of the first vault that decided the outcome so far
+    decided = [len(vault_ids)]
+
+    def _settle(index):
+        with lock:
+            decided[0] = min(decided[0], index)
+
+    def _skip(index):
+        with lock:
+            return index > decided[0]
+
+    def _search(index, vault_id):
+        if _skip(index):
+            raise errors.NotFoundError
+        try:
+            found = _get_item_in_vault(vault_id, item, api_client)
+        except errors.NotFoundError:
+            raise
+        except Exception:
+            _settle(index)
+            raise
+        _settle(index)
+        return found
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    futures = [executor.submit(_search, i, vault_id) for i, vault_id in enumerate(vault_ids)]
+    try:
+        for future in futures:
+            try:
+                return future.result()
+            except errors.NotFoundError:
+                continue
+        raise errors.NotFoundError
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
 def create_item(params, api_client, check_mode=False):
     """
     Creates a new Item in the designated Vault.
@@ -100,25 +229,66 @@ def update_item(params, original_item, api_client, check_mode=False):
         urls=params.get("urls"),
         favorite=params.get("favorite"),
         tags=params.get("tags"),
-        fieldset=item_fields
+        fieldset=item_fields,
+        previous_sections=original_item.get("sections")
     )
 
     updated_item.update({
         "id": original_item["id"],
     })
-    changed = recursive_diff(original_item, updated_item)
+    changed = recursive_diff(canonical_item(original_item), canonical_item(updated_item))
 
     if not bool(changed):
-        original_item["fields"] = fields.flatten_fields(original_item["fields"])
+        original_item["fields"] = fields.flatten_fieldset(original_item.get("fields"))
         return False, original_item
 
     if check_mode:
         updated_item["fields"] = fields.flatten_fieldset(updated_item.get("fields"))
-        return changed, updated_item
+        return True, updated_item
 
     item = api_client.update_item(updated_item["vault"]["id"], item=updated_item)
     item["fields"] = fields.flatten_fieldset(item.get("fields"))
-    return bool(changed), item
+    return True, item
+
+
+def canonical_item(item):
+    """
+    Projects an item onto the properties Ansible manages, so a desired item
+    can be compared with the one returned by the server.
+
+    Keys owned by the server (version, timestamps, field IDs, entropy, ...)
+    are left out, and sections are compared by label instead of ID.
+
+    :param dict item: Item as sent to or returned by 1Password Connect
+    :return: dict
+    """
+    section_labels = dict(
+        (section.get("id"), section.get("label"))
+        for section in item.get("sections") or []
+    )
+
+    def _field(field):
+        section_id = (field.get("section") or {}).get("id")
+        return {
+            "label": field.get("label"),
+            "type": (field.get("type") or const.FieldType.STRING).upper(),
+            "purpose": field.get("purpose") or const.PURPOSE_NONE,
+            "section": section_labels.get(section_id, section_id),
+            # A generated value is always new
+            "value": None if field.get("generate") else field.get("value") or "",
+            "generate": bool(field.get("generate")),
+        }
+
+    return {
+        "id": item.get("id"),
+        "title": item.get("title"),
+        "vault": (item.get("vault") or {}).get("id"),
+        "category": item.get("category"),
+        "favorite": bool(item.get("favorite")),
+        "tags": sorted(item.get("tags") or []),
+        "urls": [url.get("href") for url in item.get("urls") or []],
+        "fields": [_field(field) for field in item.get("fields") or []],
+    }
 
 
 def delete_item(item, api_client, check_mode=False):
@@ -157,6 +327,7 @@ def assemble_item(
         tags=None,
         favorite=None,
         fieldset=None,
+        previous_sections=None,
 ):
     """
     Create a serialized Item from the given module parameters
@@ -168,6 +339,7 @@ def assemble_item(
     :param list of str tags: Searchable tags added to the item
     :param bool favorite: Toggle the Item's `favorite` setting
     :param list of dict fieldset: collection of fields for this Item
+    :param list of dict previous_sections: Sections of the existing Item. Their IDs are reused for sections with the same label.
     :return: Assembled Item dict
     :rtype: dict
     """
@@ -183,6 +355,11 @@ def assemble_item(
     }
 
     sections = {}
+    previous_section_ids = {}
+    for section in previous_sections or []:
+        label = (section.get("label") or "").strip()
+        if label and section.get("id"):
+            previous_section_ids.setdefault(label, section["id"])
 
     if fieldset is not None:
         for field in _prepare_fields(fieldset, category):
@@ -195,7 +372,10 @@ def assemble_item(
 
                 section = sections.setdefault(
                     section_name,
-                    Section(id=str(uuid4()), label=section_name)
+                    Section(
+                        id=previous_section_ids.get(section_name) or str(uuid4()),
+                        label=section_name
+                    )
                 )
 
             field.update({
@@ -31,6 +31,7 @@ short_description: Returns the value of a field in a 1Password item.
 description:
   - Get the value a single field given its label.
   - You may provide a section label to limit the search to that item section.
+  - Use C(fields) to get several fields of the same item with a single item lookup.
 options:
   item:
     type: str
@@ -39,10 +40,34 @@ options:
       - Name or ID of the item
   field:
     type: str
-    required: True
     description:
       - The field label to search for.
       - If the section parameter is undefined, the  field label must be unique across all item fields.
+      - Exactly one of C(field) or C(fields) is required.
+  fields:
+    type: list
+    elements: dict
+    version_added: 2.5.0
+    description:
+      - Several fields to search for in the item.
+      - The item is read once and every field is resolved from that copy.
+      - Exactly one of C(field) or C(fields) is required.
+    suboptions:
+      field:
+        type: str
+        required: True
+        description:
+          - The field label or ID to search for.
+      section:
+        type: str
+        description:
+          - An item section label or ID to limit the search to.
+          - Defaults to the module's C(section) option.
+      key:
+        type: str
+        description:
+          - Key of this field in the returned C(fields) dictionary.
+          - Defaults to the value of C(field).
   vault:
     type: str
     required: True
@@ -57,6 +82,8 @@ options:
 
 extends_documentation_fragment:
   - onepassword.connect.api_params
+  - onepassword.connect.controller
+  - onepassword.connect.controller.reads
 '''
 
 EXAMPLES = '''
@@ -73,13 +100,28 @@ EXAMPLES = '''
     section: Credentials
     field: username
     vault: 2zbeu4smcibizsuxmyvhdh57b6
+
+- name: Find the connection settings of a database with one item lookup.
+  onepassword.connect.field_info:
+    item: MySQL Database
+    vault: 2zbeu4smcibizsuxmyvhdh57b6
+    fields:
+      - field: username
+      - field: password
+      - field: hostname
+        section: Connection
+        key: host
+      - field: port
+        section: Connection
+  register: db
+  no_log: true
 '''
 
 RETURN = '''
 field:
     description: The value and metadata of the field
     type: complex
-    returned: always
+    returned: when C(field) is set
     contains:
       value:
         type: str
@@ -93,133 +135,111 @@ field:
         returned: success
         description: UUID for the returned field
         sample: "fb3b40ac85f5435d26e"
+fields:
+    description:
+      - The value and metadata of each requested field, keyed by the selector's C(key).
+      - Each value has the same structure as C(field).
+    type: dict
+    returned: when C(fields) is set
+    sample: {"username": {"value": "admin", "section": null, "id": "fb3b40ac85f5435d26e"}}
+op_timings:
+    description:
+      - The requests sent to 1Password Connect, in the order they were sent, with their totals.
+      - See the C(timings) option for what each request reports.
+    type: dict
+    returned: when C(timings) is enabled
+    sample:
+      calls:
+        - method: GET
+          path: /vaults/{vault_id}/items?filter=title
+          status: 200
+          bytes_out: 0
+          bytes_in: 187
+          retries: 0
+          total_ms: 14.2
+          dns_ms: 0.9
+          connect_ms: 1.1
+          tls_ms: 6.3
+          ttfb_ms: 5.4
+      requests: 1
+      retries: 0
+      bytes_out: 0
+      bytes_in: 187
+      total_ms: 14.2
+      cache_hits: 0
+      cache_misses: 0
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, errors, fields, util  # pylint: disable=unused-import
+from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, errors, fields, timings, vault
 from ansible.module_utils.common.text.converters import to_native
 
 
-def find_field(field_identifier, item, section=None) -> dict:
-    """
-    Tries to find the requested field within the provided item.
-
-    The field may be a valid client UUID or it may be the field's label.
-    If the section kwarg is provided, the function limits its search
-    to fields within that section.
-    """
-    if not item.get("fields"):
-        raise errors.NotFoundError("Item has no fields")
-
-    section_uuid = None
-    if section:
-        section_uuid = _get_section_uuid(item.get("sections"), section)
-
-    if api.valid_client_uuid(field_identifier):
-        return _find_field_by_id(field_identifier, item["fields"], section_uuid)
-
-    return _find_field_by_label(field_identifier, item["fields"], section_uuid)
-
-
-def _find_section_id_by_label(sections, label):
-    label = util.utf8_normalize(label)
-
-    for section in sections:
-        if util.utf8_normalize(section["label"]) == label:
-            return section["id"]
-
-    raise errors.NotFoundError("Section label not found in item")
-
-
-def _get_section_uuid(sections, section_identifier):
-    if not sections:
-        return None
-
-    if not api.valid_client_uuid(section_identifier):
-        return _find_section_id_by_label(sections, section_identifier)
-    return section_identifier
-
-
-def _find_field_by_label(field_label, fields, section_id=None):
-    wanted_label = util.utf8_normalize(field_label)
+MUTUALLY_EXCLUSIVE = [("field", "fields")]
+REQUIRED_ONE_OF = [("field", "fields")]
 
-    for field in fields:
-        label = util.utf8_normalize(field["label"])
-        if section_id is None and label == wanted_label:
-            return field
 
-        if field.get("section", {}).get("id") == section_id \
-                and label == wanted_label:
-            return field
-
-    raise errors.NotFoundError("Field with provided label not found in item")
-
-
-def _find_field_by_id(field_id, fields, section_id=None):
-    for field in fields:
-
-        if section_id is None and field["id"] == field_id:
-            return field
-
-        if field.get("section", {}).get("id") == section_id \
-                and field["id"] == field_id:
-            return field
+def _to_field_info(field) -> dict:
+    return {
+        "value": field.get("value"),
+        "section": (field.get("section") or {}).get("id"),
+        "id": field.get("id")
+    }
 
-    raise errors.NotFoundError("Field not found in item")
 
+def _find_fields(item, selectors, default_section=None) -> dict:
+    index = fields.FieldIndex(item)
+    found = {}
 
-def get_item(vault, item, op_client):
-    if not api.valid_client_uuid(vault):
-        vault = _get_vault_id(vault, op_client.get_vaults())
+    for selector in selectors:
+        section = selector.get("section") or default_section
+        try:
+            field = index.find(selector["field"], section=section)
+        except errors.NotFoundError as e:
+            raise errors.NotFoundError(message="{field}: {err}".format(field=selector["field"], err=e.message))
+        found[selector.get("key") or selector["field"]] = _to_field_info(field)
 
-    if not api.valid_client_uuid(item):
-        return op_client.get_item_by_name(vault, item)
-    return op_client.get_item_by_id(vault, item)
+    return found
 
 
-def _get_vault_id(vault_name, all_vaults):
-    normalized_vault_name = util.utf8_normalize(vault_name)
+def read_fields(params, api_client, get_item=vault.get_item):
+    """Reads the fields selected by the module parameters and returns the module result
 
-    for vault in all_vaults:
-        if normalized_vault_name == util.utf8_normalize(vault.get("name")):
-            return vault["id"]
-    raise errors.NotFoundError("Vault not found")
+    :param get_item: Called like `vault.get_item` to read the item
+    """
+    # Only the key of the option in use is returned, even on failure
+    result = {} if params.get("fields") else {"field": {}}
+    section_label = params.get("section")
 
+    try:
+        item = get_item(params["vault"], params["item"], api_client)
+        if params.get("fields"):
+            result.update({"fields": _find_fields(item, params["fields"], default_section=section_label)})
+        else:
+            field = fields.find_field(params["field"], item, section=section_label)
+            result.update({"field": _to_field_info(field)})
+    except errors.NotFoundError as e:
+        result.update({"failed": True, "msg": to_native("Field not found: {err}".format(err=e))})
+    except errors.Error as e:
+        result.update({"failed": True, "msg": to_native(e)})
 
-def _to_field_info(field) -> dict:
-    return {
-        "value": field.get("value"),
-        "section": field.get("section", {}).get("id"),
-        "id": field.get("id")
-    }
+    result.update(timings.result(api_client))
+    return result
 
 
 def main():
-    result = {"field": {}}
-
     module = AnsibleModule(
         argument_spec=specs.op_field_info(),
+        mutually_exclusive=MUTUALLY_EXCLUSIVE,
+        required_one_of=REQUIRED_ONE_OF,
         supports_check_mode=True
     )
 
     api_client = api.create_client(module)
 
-    field_label = module.params.get("field")
-    vault_id = module.params.get("vault")
-    item_id = module.params.get("item")
-    section_label = module.params.get("section")
-
-    try:
-        item = get_item(vault_id, item_id, api_client)
-        field = find_field(field_label, item, section=section_label)
-        result.update({"field": _to_field_info(field)})
-    except errors.NotFoundError as e:
-        result.update({"msg": to_native("Field not found: {err}".format(err=e))})
+    result = read_fields(module.params, api_client)
+    if result.get("failed"):
         module.fail_json(**result)
-    except errors.Error as e:
-        result.update({"msg": to_native(e)})
-        module.fail_json(**result)
-
     module.exit_json(**result)
 
 
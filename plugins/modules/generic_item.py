@@ -180,6 +180,7 @@ extends_documentation_fragment:
   - onepassword.connect.item_tags
   - onepassword.connect.item_state
   - onepassword.connect.api_params
+  - onepassword.connect.controller
 '''
 
 EXAMPLES = '''
@@ -311,64 +312,78 @@ msg:
     type: str
     returned: failure
     sample: Invalid Vault ID
+op_timings:
+    description:
+      - The requests sent to 1Password Connect, in the order they were sent, with their totals.
+      - See the C(timings) option for what each request reports.
+    type: dict
+    returned: when C(timings) is enabled
+    sample:
+      calls:
+        - method: GET
+          path: /vaults/{vault_id}/items?filter=title
+          status: 200
+          bytes_out: 0
+          bytes_in: 187
+          retries: 0
+          total_ms: 14.2
+          dns_ms: 0.9
+          connect_ms: 1.1
+          tls_ms: 6.3
+          ttfb_ms: 5.4
+      requests: 1
+      retries: 0
+      bytes_out: 0
+      bytes_in: 187
+      total_ms: 14.2
+      cache_hits: 0
+      cache_misses: 0
 '''
 
 from ansible.module_utils.common.text.converters import to_native
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, vault, errors
+from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, vault, errors, timings
 
 
-def main():
-    # Name always required when creating a new Item
-    required_if = [
-        ("state", "present", ("name",))
-    ]
+# Name always required when creating a new Item
+REQUIRED_IF = [
+    ("state", "present", ("name",))
+]
+
+
+def reconcile(params, api_client, check_mode=False):
+    """Converges the item described by the module parameters and returns the module result"""
+    results = {"op_item": {}, "changed": False}
+
+    try:
+        changed, api_response = vault.reconcile_item(params, api_client, check_mode=check_mode)
+    except TypeError as e:
+        results.update({"failed": True, "msg": to_native("Invalid Item config: {err}".format(err=e))})
+    except errors.Error as e:
+        results.update({"failed": True, "msg": to_native(e.message)})
+    else:
+        results.update({"op_item": api_response, "changed": bool(changed)})
+
+    results.update(timings.result(api_client))
+    return results
 
+
+def main():
     module = AnsibleModule(
         argument_spec=specs.op_item(),
         supports_check_mode=True,
-        required_if=required_if
+        required_if=REQUIRED_IF
     )
 
-    results = {"op_item": {}, "changed": False}
-
-    changed = False
-    api_response = {}
     try:
         api_client = api.create_client(module)
-        state = module.params["state"].lower()
-
-        item = vault.find_item(module.params, api_client)
-
-        if state == "absent":
-            changed, api_response = vault.delete_item(
-                item,
-                api_client,
-                check_mode=module.check_mode
-            )
-        else:
-            if not item:
-                changed, api_response = vault.create_item(
-                    module.params,
-                    api_client,
-                    check_mode=module.check_mode
-                )
-            else:
-                changed, api_response = vault.update_item(
-                    module.params,
-                    item,
-                    api_client,
-                    check_mode=module.check_mode
-                )
-    except TypeError as e:
-        results.update({"msg": to_native("Invalid Item config: {err}".format(err=e))})
-        module.fail_json(**results)
     except errors.Error as e:
-        results.update({"msg": to_native(e.message)})
-        module.fail_json(**results)
+        module.fail_json(op_item={}, changed=False, msg=to_native(e.message))
 
-    results.update({"op_item": api_response, "changed": bool(changed)})
+    results = reconcile(module.params, api_client, check_mode=module.check_mode)
+    if results.get("failed"):
+        module.fail_json(**results)
     module.exit_json(**results)
 
 
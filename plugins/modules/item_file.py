@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020  1Password & Agilebits (@1Password)
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: item_file
+author:
+  - 1Password (@1Password)
+requirements: []
+version_added: 2.5.0
+short_description: Lists the files attached to a 1Password item and downloads them
+description:
+  - Returns the files attached to an item, like the file of a Document item or the attachments of any other item.
+  - With C(file) and C(dest), downloads the content of one file to the host the module runs on.
+  - The content is written to disk as it arrives, so large files download with constant memory.
+    It is written to a temporary file next to C(dest), checked against the size reported by 1Password Connect
+    and against C(checksum), and only then moved over C(dest).
+  - C(dest) is left untouched when its content is already the same.
+options:
+  item:
+    type: str
+    required: True
+    description:
+      - Name or ID of the item.
+  vault:
+    type: str
+    required: True
+    description:
+      - Name or ID of the vault containing the item.
+  file:
+    type: str
+    description:
+      - Name or ID of the file to return or download.
+      - Names are compared after unicode normalization. A name shared by several files of the item is an error.
+  dest:
+    type: path
+    description:
+      - Path the file is downloaded to. Requires C(file).
+      - If C(dest) is a directory, the file is saved in it under its name in 1Password.
+      - A new file is only readable by its owner unless C(mode) says otherwise.
+        An existing file keeps its mode and owner.
+  checksum:
+    type: str
+    description:
+      - Expected checksum of the file's content, as C(<algorithm>:<hex digest>), for example C(sha256:9f86d08...).
+        A bare digest is taken as sha256. Requires C(dest).
+      - If C(dest) already has this checksum, nothing is downloaded.
+      - A download that doesn't match it fails and leaves C(dest) untouched.
+notes:
+  - In check mode nothing is downloaded. Without C(checksum), an existing C(dest) of the same size as the file
+    is reported as unchanged.
+  - Over the C(onepassword.connect.connect) httpapi connection, the content crosses the persistent connection in one piece.
+  - 1Password Connect can't create, replace or attach files, so this module only reads them.
+    Upload documents and attachments with the 1Password apps or the 1Password CLI (C(op document create)).
+extends_documentation_fragment:
+  - onepassword.connect.api_params
+  - ansible.builtin.files
+'''
+
+EXAMPLES = '''
+---
+- name: List the files attached to an item
+  onepassword.connect.item_file:
+    item: TLS Keystore
+    vault: Infra
+  register: keystore
+
+- name: Download the keystore of a Document item
+  onepassword.connect.item_file:
+    item: TLS Keystore
+    vault: Infra
+    file: keystore.p12
+    dest: /etc/app/keystore.p12
+    mode: "0600"
+    owner: app
+
+- name: Download an attachment only if the local copy is different
+  onepassword.connect.item_file:
+    item: TLS Keystore
+    vault: Infra
+    file: truststore.jks
+    dest: /etc/app/
+    checksum: "sha256:5e884898da28047151d0e56f8dc6292773603d0d6aabbdd62a11ef721d1542d8"
+'''
+
+RETURN = '''
+files:
+    description: The files attached to the item, without their content.
+    type: list
+    elements: dict
+    returned: success
+    sample:
+      - id: qm3f7xbo7rm7ye5jgfzbgfclcm
+        name: keystore.p12
+        size: 4512
+        content_path: /v1/vaults/2zbeu4smcibizsuxmyvhdh57b6/items/lixyh6993asdfq9njdzf221d3z/files/qm3f7xbo7rm7ye5jgfzbgfclcm/content
+file:
+    description: The file selected by C(file).
+    type: dict
+    returned: when C(file) is set
+    sample:
+      id: qm3f7xbo7rm7ye5jgfzbgfclcm
+      name: keystore.p12
+      size: 4512
+      content_path: /v1/vaults/2zbeu4smcibizsuxmyvhdh57b6/items/lixyh6993asdfq9njdzf221d3z/files/qm3f7xbo7rm7ye5jgfzbgfclcm/content
+dest:
+    description: Path the file was downloaded to.
+    type: str
+    returned: when C(dest) is set
+    sample: /etc/app/keystore.p12
+checksum:
+    description:
+      - Checksum of the file's content, as C(<algorithm>:<hex digest>).
+      - Uses the algorithm of C(checksum), sha256 otherwise.
+    type: str
+    returned: when C(dest) is set, except in check mode without C(checksum)
+    sample: "sha256:5e884898da28047151d0e56f8dc6292773603d0d6aabbdd62a11ef721d1542d8"
+op_timings:
+    description:
+      - The requests sent to 1Password Connect, in the order they were sent, with their totals.
+      - See the C(timings) option for what each request reports.
+    type: dict
+    returned: when C(timings) is enabled
+    sample:
+      calls:
+        - method: GET
+          path: /vaults/{vault_id}/items/{item_id}/files/{file_id}/content
+          status: 200
+          bytes_out: 0
+          bytes_in: 4512
+          retries: 0
+          total_ms: 14.2
+          dns_ms: 0.9
+          connect_ms: 1.1
+          tls_ms: 6.3
+          ttfb_ms: 5.4
+      requests: 1
+      retries: 0
+      bytes_out: 0
+      bytes_in: 4512
+      total_ms: 14.2
+      cache_hits: 0
+      cache_misses: 0
+'''
+
+import os
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, errors, files, timings, vault
+from ansible.module_utils.common.text.converters import to_native
+
+
+REQUIRED_BY = {"dest": "file", "checksum": "dest"}
+
+
+def read_files(params, api_client, check_mode=False):
+    """Lists the files of the item described by the module parameters, downloading one if asked,
+    and returns the module result
+    """
+    result = {"changed": False, "files": []}
+
+    try:
+        try:
+            item = vault.get_item(params["vault"], params["item"], api_client)
+        except errors.NotFoundError:
+            raise errors.NotFoundError(message="Item not found")
+        result["files"] = files.item_files(item, api_client)
+
+        if params.get("file"):
+            attachment = files.find_file(result["files"], params["file"])
+            result["file"] = attachment
+
+            if params.get("dest"):
+                result["dest"] = files.destination(params["dest"], attachment)
+                changed, checksum = files.download(
+                    api_client, item["vault"]["id"], item["id"], attachment, result["dest"],
+                    checksum=params.get("checksum"), check_mode=check_mode,
+                )
+                result["changed"] = changed
+                if checksum:
+                    result["checksum"] = checksum
+    except errors.Error as e:
+        result.update({"failed": True, "msg": to_native(e.message)})
+    except (IOError, OSError) as e:
+        result.update({"failed": True, "msg": "Could not write {0}: {1}".format(result.get("dest"), to_native(e))})
+
+    result.update(timings.result(api_client))
+    return result
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=specs.op_item_file(),
+        required_by=REQUIRED_BY,
+        add_file_common_args=True,
+        supports_check_mode=True
+    )
+
+    api_client = api.create_client(module)
+
+    result = read_files(module.params, api_client, check_mode=module.check_mode)
+    if result.get("failed"):
+        module.fail_json(**result)
+
+    if result.get("dest") and os.path.exists(result["dest"]):
+        file_args = module.load_file_common_arguments(module.params, path=result["dest"])
+        result["changed"] = module.set_fs_attributes_if_different(file_args, result["changed"])
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
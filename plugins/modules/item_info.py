@@ -39,6 +39,7 @@ options:
     required: True
     description:
       - Name or ID of the item as shown in the 1Password UI.
+      - A value made of 26 lowercase letters and digits is looked up as an item ID, anything else as an item name.
   field:
     type: str
     description:
@@ -48,6 +49,13 @@ options:
     description:
       - Name or ID of the Vault in which the Item is stored.
       - If not specified, the module searches through every vault accessible by the API token.
+  concurrency:
+    type: int
+    default: 8
+    version_added: 2.5.0
+    description:
+      - Maximum number of vaults searched at the same time when C(vault) is not specified.
+      - If the item is in more than one vault, the first vault listed by 1Password Connect still wins.
   flatten_fields_by_label:
     type: bool
     default: true
@@ -59,6 +67,8 @@ options:
         - Beginning in C(3.0.0) this setting will default to C(false)
 extends_documentation_fragment:
   - onepassword.connect.api_params
+  - onepassword.connect.controller
+  - onepassword.connect.controller.reads
 '''
 
 EXAMPLES = '''
@@ -174,20 +184,39 @@ field:
         returned: success
         description: Type identifier for the field
         sample: "concealed"
+op_timings:
+    description:
+      - The requests sent to 1Password Connect, in the order they were sent, with their totals.
+      - See the C(timings) option for what each request reports.
+    type: dict
+    returned: when C(timings) is enabled
+    sample:
+      calls:
+        - method: GET
+          path: /vaults/{vault_id}/items?filter=title
+          status: 200
+          bytes_out: 0
+          bytes_in: 187
+          retries: 0
+          total_ms: 14.2
+          dns_ms: 0.9
+          connect_ms: 1.1
+          tls_ms: 6.3
+          ttfb_ms: 5.4
+      requests: 1
+      retries: 0
+      bytes_out: 0
+      bytes_in: 187
+      total_ms: 14.2
+      cache_hits: 0
+      cache_misses: 0
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, errors, fields, util
+from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, errors, fields, timings, util, vault
 from ansible.module_utils.common.text.converters import to_native
 
 
-def _get_item(op, item, vault_id):
-    try:
-        return op.get_item_by_id(vault_id, item)
-    except (errors.NotFoundError, errors.BadRequestError):
-        return op.get_item_by_name(vault_id, item)
-
-
 def _find_item_field(item, selected_field):
     selected_field = util.utf8_normalize(selected_field)
     for field in item["fields"]:
@@ -196,36 +225,24 @@ def _find_item_field(item, selected_field):
     return None
 
 
-def _get_item_with_vault_id(op, item, vault_id):
-    return _get_item(op, item, vault_id)
-
-
-def _get_item_without_vault(op, item):
-    vaults = op.get_vaults()
-    for vault in vaults:
-        try:
-            return _get_item_with_vault_id(op, item, vault["id"])
-        except errors.NotFoundError:
-            pass
-    raise errors.NotFoundError
+def _get_item_without_vault(op, item, concurrency=1):
+    vault_ids = [v["id"] for v in op.get_vaults()]
+    return vault.search_vaults(item, vault_ids, op, concurrency=concurrency)
 
 
-def _try_get_item(op, item, vault):
-    if vault:
-        try:
-            return _get_item_with_vault_id(op, item, vault)
-        except errors.BadRequestError:
-            vault = op.get_vault_id_by_name(vault)
-            return _get_item_with_vault_id(op, item, vault)
+def _try_get_item(op, item, vault_name, concurrency=1):
+    if vault_name:
+        return vault.get_item(vault_name, item, op)
 
-    return _get_item_without_vault(op, item)
+    return _get_item_without_vault(op, item, concurrency=concurrency)
 
 
-def to_result(*, item=None, msg=None, **kwargs):
+def to_result(*, item=None, msg=None, client=None, **kwargs):
     """Builds response dict with mandatory keys. If defined, optional keys in kwargs
     are included.
 
     If provided, the "msg" value is converted to the native text format with to_native.
+    The requests recorded by `client` are included when it records them.
     """
     result = {
         "op_item": item or {},
@@ -233,51 +250,56 @@ def to_result(*, item=None, msg=None, **kwargs):
     }
     if kwargs.get("field"):
         result["field"] = kwargs.get("field")
+    result.update(timings.result(client))
 
     return result
 
 
-def main():
-    arg_spec = specs.op_item_info()
-
-    module = AnsibleModule(
-        argument_spec=arg_spec,
-        supports_check_mode=True,
-    )
-
-    api_client = api.create_client(module)
-    field_label = module.params.get("field")
-    flatten_fields_by_label = module.params.get("flatten_fields_by_label")
-    vault = module.params.get("vault")
-    # Either the item's label or its UUID
-    item_identifier = module.params.get("item")
+def read_item(params, api_client, get_item=_try_get_item):
+    """Reads the item described by the module parameters and returns the module result
 
+    :param get_item: Called like `_try_get_item` to read the item
+    """
     try:
-        item = _try_get_item(api_client, item_identifier, vault)
+        item = get_item(api_client, params["item"], params.get("vault"), concurrency=params["concurrency"])
     except errors.NotFoundError:
-        module.fail_json(**to_result(msg="Item not found"))
-        return
+        return dict(to_result(msg="Item not found", client=api_client), failed=True)
     except TypeError as e:
-        module.fail_json(**to_result(
-            msg="Invalid Item config: {err}".format(err=e))
-        )
-        return
+        return dict(to_result(msg="Invalid Item config: {err}".format(err=e), client=api_client), failed=True)
     except errors.Error as e:
-        module.fail_json(**to_result(msg=e.message))
-        return
+        return dict(to_result(msg=e.message, client=api_client), failed=True)
 
+    field_label = params.get("field")
     if field_label:
         field = _find_item_field(item, field_label)
         if not field:
-            module.fail_json(**to_result(item=item, msg="Field not found"))
-            return
-        module.exit_json(**to_result(item=item, field=field))
-        return
+            return dict(to_result(item=item, msg="Field not found", client=api_client), failed=True)
+        return to_result(item=item, field=field, client=api_client)
 
-    if flatten_fields_by_label:
+    if params.get("flatten_fields_by_label"):
         item["fields"] = fields.flatten_fieldset(item["fields"])
 
-    module.exit_json(**to_result(item=item))
+    return to_result(item=item, client=api_client)
+
+
+def main():
+    arg_spec = specs.op_item_info()
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True,
+    )
+
+    concurrency = module.params["concurrency"]
+    if concurrency < 1:
+        module.fail_json(**to_result(msg="concurrency must be at least 1"))
+
+    api_client = api.create_client(module, max_connections=concurrency)
+
+    result = read_item(module.params, api_client)
+    if result.get("failed"):
+        module.fail_json(**result)
+    module.exit_json(**result)
 
 
 if __name__ == '__main__':
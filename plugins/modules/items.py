@@ -0,0 +1,340 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020  1Password & Agilebits (@1Password)
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: items
+author:
+  - 1Password (@1Password)
+requirements: []
+version_added: 2.5.0
+short_description: Creates, updates or deletes many 1Password Items in one task
+description:
+  - Reconciles a list of items in a single module run. Each item is handled like the C(onepassword.connect.generic_item) module handles it.
+  - Items are processed in parallel by a pool of C(concurrency) workers.
+  - A failing item does not stop the others. The module fails after processing every item if any of them failed.
+  - B(NOTE) Items in the list should be distinct. Two entries for the same item are processed concurrently and may conflict.
+options:
+  items:
+    type: list
+    elements: dict
+    required: True
+    description:
+      - The items to create, update or delete.
+      - Takes the same options as the C(onepassword.connect.generic_item) module, except for the API options.
+    suboptions:
+      vault_id:
+        type: str
+        description:
+          - ID of the 1Password vault containing the item.
+          - Defaults to the module's C(vault_id).
+      name:
+        type: str
+        aliases:
+          - title
+        description:
+          - Name of the Item. Required if C(state) is C(present).
+          - See C(onepassword.connect.generic_item) for how C(name) and C(uuid) are used to find the item.
+      uuid:
+        type: str
+        description:
+          - Unique ID for a single Item.
+      category:
+        type: str
+        default: api_credential
+        description:
+          - Applies the selected category template to the item.
+          - The category cannot be changed after creating an item.
+        choices:
+          - login
+          - password
+          - server
+          - database
+          - api_credential
+          - software_license
+          - secure_note
+          - wireless_router
+          - bank_account
+          - email_account
+          - credit_card
+          - membership
+          - passport
+          - outdoor_license
+          - driver_license
+          - identity
+          - reward_program
+          - social_security_number
+      urls:
+        type: list
+        elements: str
+        description:
+          - Store one or more URLs on an item
+      favorite:
+        type: bool
+        default: false
+        description: Toggles the 'favorite' attribute for an Item
+      tags:
+        type: list
+        elements: str
+        description:
+          - Collection of tags applied to the 1Password Item.
+      state:
+        type: str
+        default: present
+        choices:
+          - present
+          - absent
+        description:
+          - I(present) creates the item or updates it if it exists.
+          - I(absent) deletes the item if it exists.
+      fields:
+        description: List of fields associated with the Item
+        type: list
+        elements: dict
+        suboptions:
+          label:
+            type: str
+            required: true
+            description: The name of the field
+          value:
+            type: str
+            description: Sets the value of the field.
+          section:
+            type: str
+            description:
+              - Places the field into a named group. If section does not exist, it is created.
+              - If two or more fields belong to the same C(section), they are grouped together under that section.
+          field_type:
+            type: str
+            default: string
+            aliases:
+            - type
+            description:
+                - Sets expected value type for the field.
+                - >
+                    If C(generic_item.category) is C(login) or C(password), the field with type C(concealed) and
+                    named C(password) becomes the item's primary password.
+            choices:
+              - string
+              - email
+              - concealed
+              - url
+              - otp
+              - date
+              - month_year
+          generate_value:
+            type: str
+            default: 'never'
+            choices: ['always', 'on_create', 'never']
+            description:
+              - Generate a new value for the field using the C(generator_recipe).
+              - Overrides C(value) if I(generate_value=on_create) and field does not exist or if I(generate_value=always).
+              - I(generate_value=never) will use the data in C(value).
+              - I(generate_value=always) will assign a new value to this field every time Ansible runs the module.
+              - I(generate_value=on_create) will generate a new value and ignore C(value) if the field does not exist.
+                If the field does exist, the module will use the previously generated value and ignore
+                the C(value).
+              - The module searches for field by using a case-insensitive match for the C(label)
+                within the field's C(section).
+          generator_recipe:
+            type: dict
+            description:
+              - Configures 1Password's Secure Password Generator
+              - If C(generate_value) is 'never', these options have no effect.
+            suboptions:
+              length:
+                type: int
+                default: 32
+                description:
+                  - Defines number of characters in generated password
+              include_digits:
+                type: bool
+                default: true
+                description:
+                  - Toggle whether generated password includes digits (0-9)
+              include_letters:
+                type: bool
+                default: true
+                description:
+                  - Toggle whether generated password includes ASCII characters (a-zA-Z)
+              include_symbols:
+                type: bool
+                default: true
+                description:
+                  - Toggle whether generated password includes ASCII symbol characters
+  vault_id:
+    type: str
+    description:
+      - ID of the 1Password vault used for items that don't define their own C(vault_id).
+      - Uses environment variable C(OP_VAULT_ID) if not explicitly defined in the playbook.
+  concurrency:
+    type: int
+    default: 4
+    description:
+      - Maximum number of items processed at the same time.
+      - Higher values increase throughput until 1Password Connect becomes the bottleneck.
+
+extends_documentation_fragment:
+  - onepassword.connect.api_params
+'''
+
+EXAMPLES = '''
+- name: Create or update the credentials for every database
+  onepassword.connect.items:
+    vault_id: 2zbeu4smcibizsuxmyvhdh57b6
+    concurrency: 8
+    items:
+      - title: Orders DB
+        category: database
+        fields:
+          - label: password
+            field_type: concealed
+            generate_value: on_create
+      - title: Billing DB
+        category: database
+        fields:
+          - label: password
+            field_type: concealed
+            generate_value: on_create
+  no_log: true
+
+- name: Delete several items
+  onepassword.connect.items:
+    items:
+      - uuid: 3igj89sdf9ssdf89g
+        state: absent
+      - title: Old API Key
+        state: absent
+  no_log: true
+'''
+
+RETURN = '''
+results:
+  description: The outcome for each item, in the same order as the C(items) option.
+  type: list
+  elements: dict
+  returned: always
+  contains:
+    op_item:
+      description:
+        - Dictionary containing Item properties or an empty dictionary if I(state=absent) or the item failed.
+        - See C(onepassword.connect.generic_item) for the structure.
+      type: dict
+      returned: always
+    changed:
+      description: Whether the item was created, updated or deleted.
+      type: bool
+      returned: always
+    failed:
+      description: Whether reconciling the item failed.
+      type: bool
+      returned: always
+    msg:
+      description: Information returned when the item failed.
+      type: str
+      returned: failure
+      sample: Invalid Vault ID
+msg:
+    description: Information returned when an error occurs.
+    type: str
+    returned: failure
+    sample: 2 of 10 items failed
+op_timings:
+    description:
+      - The requests sent to 1Password Connect, in the order they were sent, with their totals.
+      - See the C(timings) option for what each request reports.
+    type: dict
+    returned: when C(timings) is enabled
+    sample:
+      calls:
+        - method: GET
+          path: /vaults/{vault_id}/items?filter=title
+          status: 200
+          bytes_out: 0
+          bytes_in: 187
+          retries: 0
+          total_ms: 14.2
+          dns_ms: 0.9
+          connect_ms: 1.1
+          tls_ms: 6.3
+          ttfb_ms: 5.4
+      requests: 1
+      retries: 0
+      bytes_out: 0
+      bytes_in: 187
+      total_ms: 14.2
+      cache_hits: 0
+      cache_misses: 0
+'''
+
+from ansible.module_utils.common.text.converters import to_native
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.onepassword.connect.plugins.module_utils import specs, api, vault, errors, timings
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=specs.op_items(),
+        supports_check_mode=True,
+    )
+
+    results = {"results": [], "changed": False}
+
+    concurrency = module.params["concurrency"]
+    if concurrency < 1:
+        module.fail_json(msg="concurrency must be at least 1", **results)
+
+    items_params = []
+    for item_params in module.params["items"]:
+        item_params = dict(item_params)
+        item_params["vault_id"] = item_params.get("vault_id") or module.params.get("vault_id")
+        items_params.append(item_params)
+
+    try:
+        api_client = api.create_client(module, max_connections=concurrency)
+    except errors.Error as e:
+        results.update({"msg": to_native(e.message)})
+        module.fail_json(**results)
+
+    item_results = vault.reconcile_items(
+        items_params,
+        api_client,
+        concurrency=concurrency,
+        check_mode=module.check_mode
+    )
+
+    failed = [r for r in item_results if r["failed"]]
+    results.update({
+        "results": item_results,
+        "changed": any(r["changed"] for r in item_results),
+    })
+    results.update(timings.result(api_client))
+
+    if failed:
+        results["msg"] = to_native("{0} of {1} items failed".format(len(failed), len(item_results)))
+        module.fail_json(**results)
+
+    module.exit_json(**results)
+
+
+if __name__ == '__main__':
+    main()
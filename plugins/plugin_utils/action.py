@@ -0,0 +1,155 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import functools
+
+from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.parameters import remove_values
+from ansible.module_utils.common.text.converters import to_native
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.release import __version__ as ansible_version
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, cache, errors, transport
+from ansible_collections.onepassword.connect.plugins.plugin_utils.item_cache import SharedItemCache
+
+"""
+Base of the action plugins that can run a module's logic on the controller.
+
+Modules of this collection only talk to 1Password Connect, so running them on
+the target host costs a module transfer and a Python start per host and task
+for nothing. With the `run_on_controller` option set, the action plugin
+validates the task's arguments against the module's argument spec and runs
+the module's logic in the controller process instead. Otherwise the module
+runs on the target as usual.
+
+Read modules can also share the items they read between the hosts of a
+playbook run, see `controller_cache_ttl` and item_cache.SharedItemCache.
+"""
+
+RUN_ON_CONTROLLER = "run_on_controller"
+
+
+class ConnectActionBase(ActionBase):
+    TRANSFERS_FILES = False
+
+    # Fully qualified name of the module run on the target host
+    MODULE = None
+
+    def argument_spec(self):
+        """Returns the module's argument spec and the constraints passed to AnsibleModule, like `required_if`"""
+        raise NotImplementedError
+
+    def run_module(self, params, api_client, check_mode=False):
+        """Runs the module's logic on the controller and returns the module result"""
+        raise NotImplementedError
+
+    def run(self, tmp=None, task_vars=None):
+        self._supports_check_mode = True
+        self._supports_async = True
+        result = super(ConnectActionBase, self).run(tmp, task_vars)
+
+        if not self._runs_on_controller():
+            # As the normal action does, async modules are wrapped unless the connection runs them itself
+            wrap_async = self._task.async_val and not self._connection.has_native_async
+            result.update(self._execute_module(
+                module_name=self.MODULE, module_args=self._task.args, task_vars=task_vars, wrap_async=wrap_async
+            ))
+            if not wrap_async:
+                self._remove_tmp_path(self._connection._shell.tmpdir)
+            return result
+
+        if self._task.async_val:
+            result.update({
+                "failed": True,
+                "msg": "{0} can't be used with async, the task runs in the controller process. "
+                       "Remove async or unset {0}.".format(RUN_ON_CONTROLLER),
+            })
+            return result
+
+        result.update(self._run_on_controller(dict(self._task.args)))
+        return result
+
+    def _runs_on_controller(self):
+        if not boolean(self._task.args.get(RUN_ON_CONTROLLER, False), strict=False):
+            return False
+        # The httpapi connection holds the Connect server address and session
+        return (self._play_context.connection or "").split(".")[-1] != "httpapi"
+
+    def _run_on_controller(self, args):
+        argument_spec, constraints = self.argument_spec()
+
+        environment = {}
+        self._compute_environment_string(environment)
+        _apply_environment_fallbacks(argument_spec, args, environment)
+
+        validation = ArgumentSpecValidator(argument_spec, **constraints).validate(args)
+        if validation.error_messages:
+            return {"failed": True, "msg": ", ".join(validation.error_messages)}
+        params = validation.validated_parameters
+
+        try:
+            api_client = self.create_client(params)
+            result = self.run_module(params, api_client, check_mode=bool(self._task.check_mode))
+        except errors.Error as e:
+            result = {"failed": True, "msg": to_native(e.message)}
+
+        result["invocation"] = {"module_args": params}
+        # Mask secrets like AnsibleModule does, the task's `no_log` still applies on top
+        return remove_values(result, validation._no_log_values)
+
+    def shared_reads(self, get_item, params, api_client, key):
+        """Wraps `get_item` so hosts asking for the same `key` during the run share one read.
+
+        Returns `get_item` as is if `controller_cache_ttl` is not set.
+        """
+        ttl = params.get("controller_cache_ttl")
+        if not ttl or ttl <= 0:
+            return get_item
+
+        try:
+            shared_cache = SharedItemCache(cache.namespace(params["hostname"], params["token"]), ttl=ttl)
+        except (IOError, OSError) as e:
+            self._display.warning("Items read by other hosts can't be shared: {0}".format(to_native(e)))
+            return get_item
+
+        def _get_item(*args, **kwargs):
+            item, cached = shared_cache.get_or_fetch(key, functools.partial(get_item, *args, **kwargs))
+            if api_client.recorder is not None:
+                api_client.recorder.cache_lookup(cached)
+            return item
+
+        return _get_item
+
+    def forget_shared_reads(self, params):
+        """Makes later reads of this run ask 1Password Connect again, after the task wrote an item"""
+        SharedItemCache.clear(cache.namespace(params["hostname"], params["token"]))
+
+    def create_client(self, params, max_connections=transport.MAX_IDLE_CONNECTIONS):
+        hostname = params.get("hostname")
+        if not hostname or not params.get("token"):
+            raise errors.AccessDeniedError(message="Server hostname or auth token not defined")
+
+        return api.client_from_params(
+            params,
+            hostname=hostname,
+            http_transport=transport.create(hostname, maxsize=max_connections),
+            ansible_version=ansible_version,
+        )
+
+
+def _apply_environment_fallbacks(argument_spec, args, environment):
+    """Fills options left unset from the task's environment, as the module would on the target.
+
+    Values missing there are looked up in the controller's environment during validation.
+    """
+    for name, option in argument_spec.items():
+        fallback = option.get("fallback")
+        if args.get(name) is not None or not fallback or fallback[0] is not env_fallback:
+            continue
+        for variable in fallback[1]:
+            if environment.get(variable) is not None:
+                args[name] = environment[variable]
+                break
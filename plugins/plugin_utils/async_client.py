@@ -0,0 +1,109 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, errors, transport
+
+"""
+asyncio client for the Connect API, for controller-side code that reads many items at once.
+
+Requests are sent by a regular `api.OnePassword` client on a pool of
+threads, so both clients build the same URLs, retry the same way and raise
+the same errors. A semaphore bounds the number of requests in flight.
+"""
+
+DEFAULT_CONCURRENCY = 8
+
+
+class AsyncOnePassword:
+
+    def __init__(self, hostname, token, concurrency=DEFAULT_CONCURRENCY, client=None, **client_options):
+        """
+        :param hostname: URL of the Connect server
+        :param token: Connect API token
+        :param int concurrency: Maximum number of requests in flight
+        :param client: Synchronous client to send the requests with.
+            Built from `hostname`, `token` and `client_options` if not given.
+        :param client_options: Passed on to api.OnePassword, like `retry_policy` or `cache`
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        if client is None:
+            client_options.setdefault("http_transport", transport.create(hostname, maxsize=concurrency))
+            client = api.OnePassword(hostname, token, **client_options)
+
+        self.concurrency = concurrency
+        self._client = client
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphore = None
+
+    @property
+    def sync(self):
+        """The synchronous client behind this one, with the same methods"""
+        return self._client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def _call(self, method, *args, **kwargs):
+        if self._semaphore is None:
+            # Created here so it belongs to the running event loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+    async def get_item_by_id(self, vault_id, item_id):
+        return await self._call(self._client.get_item_by_id, vault_id, item_id)
+
+    async def get_item_by_name(self, vault_id, item_name):
+        return await self._call(self._client.get_item_by_name, vault_id, item_name)
+
+    async def get_vaults(self):
+        return await self._call(self._client.get_vaults)
+
+    async def get_vault_id_by_name(self, vault_name):
+        return await self._call(self._client.get_vault_id_by_name, vault_name)
+
+    async def create_item(self, vault_id, item):
+        return await self._call(self._client.create_item, vault_id, item)
+
+    async def update_item(self, vault_id, item):
+        return await self._call(self._client.update_item, vault_id, item)
+
+    async def delete_item(self, vault_id, item_id):
+        return await self._call(self._client.delete_item, vault_id, item_id)
+
+    async def get_items(self, vault_id, identifiers):
+        """Reads many items of a vault at once, by ID or by title.
+
+        :param vault_id: ID of the vault holding the items
+        :param identifiers: Item IDs or titles
+        :return: list with, for each identifier, the item or the errors.Error raised while reading it
+        """
+        async def _get(identifier):
+            try:
+                if api.valid_client_uuid(identifier):
+                    return await self.get_item_by_id(vault_id, identifier)
+                return await self.get_item_by_name(vault_id, identifier)
+            except errors.Error as e:
+                return e
+
+        return await asyncio.gather(*(_get(identifier) for identifier in identifiers))
+
+
+def run(coroutine):
+    """Runs a coroutine to completion from synchronous code"""
+    return asyncio.run(coroutine)
@@ -0,0 +1,216 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import contextlib
+import copy
+import errno
+import fcntl
+import hashlib
+import multiprocessing
+import os
+import shutil
+import stat
+import tempfile
+import threading
+
+from ansible_collections.onepassword.connect.plugins.module_utils import cache
+
+"""
+Caches for Connect API reads made on the Ansible controller.
+
+`ItemCache` lives in the memory of one process. `SharedItemCache` is shared by
+the worker processes Ansible forks for each host and task of a playbook run.
+"""
+
+# Memory-backed on Linux, so cached items never reach a disk
+_SHARED_MEMORY_DIR = "/dev/shm"
+_ROOT_NAME = "onepassword_connect-{0}"
+
+
+def playbook_run_id():
+    """PID of the ansible-playbook process, from the process itself or one of its workers"""
+    if multiprocessing.parent_process() is None:
+        return os.getpid()
+    return os.getppid()
+
+
+def token_fingerprint(token):
+    """Hashes an API token so it can be part of a cache key without being stored"""
+    return hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ItemCache:
+    """Caches fetched values by key and collapses concurrent fetches of the same key.
+
+    The first caller asking for a missing key runs the fetch. Callers asking
+    for the same key while that fetch is in flight wait for it and share its
+    result, or its error. Errors are not cached.
+
+    Values are deep-copied on the way out so callers can't modify the cached copy.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key, fetch):
+        with self._lock:
+            if key in self._entries:
+                return copy.deepcopy(self._entries[key])
+
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fetch()
+        except Exception as e:
+            call.error = e
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = call.result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+        return copy.deepcopy(call.result)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedItemCache:
+    """Caches items for the playbook run, across the worker processes of every host.
+
+    Entries are files in a directory private to the user and to the running
+    `ansible-playbook` process, which is the parent of every worker. The first
+    worker asking for a missing key fetches it while holding a lock on the key;
+    workers asking for it meanwhile wait for the lock and read the entry it left.
+    Errors are not cached.
+
+    Directories left by finished runs are removed when the next run starts caching.
+    """
+
+    def __init__(self, namespace, ttl, base_dir=None, run_id=None, allow_disk=True):
+        """
+        :param str namespace: Scope of the entries, see cache.namespace
+        :param float ttl: Number of seconds an entry stays valid
+        :param str base_dir: Directory holding the runs' caches. Defaults to shared memory if available.
+        :param int run_id: PID of the ansible-playbook process. Defaults to playbook_run_id().
+        :param bool allow_disk: Whether the temporary directory may be used when there is no shared memory.
+            If False, OSError is raised instead, so items never reach a disk by default.
+        """
+        if base_dir is None and not allow_disk and not os.path.isdir(_SHARED_MEMORY_DIR):
+            raise OSError(errno.ENOENT, "No shared memory to keep the items in", _SHARED_MEMORY_DIR)
+        self.root = _private_dir(base_dir)
+        self.run_id = playbook_run_id() if run_id is None else run_id
+        self._entries = cache.FileCache(_run_dir(self.root, self.run_id), namespace=namespace, ttl=ttl)
+        _remove_finished_runs(self.root, keep=self.run_id)
+
+    def get_or_fetch(self, key, fetch):
+        """Returns the value cached for key and whether it came from the cache, calling fetch on a miss"""
+        key = _key(key)
+        value = self._entries.get(key)
+        if value is not None:
+            return value, True
+
+        with self._locked(key):
+            value = self._entries.get(key)
+            if value is not None:
+                return value, True
+            value = fetch()
+            self._entries.set(key, value)
+            return value, False
+
+    @staticmethod
+    def clear(namespace, base_dir=None, run_id=None):
+        """Drops the entries of a namespace cached during the playbook run, if any"""
+        root = os.path.join(_base_dir(base_dir), _ROOT_NAME.format(os.getuid()))
+        run_dir = _run_dir(root, playbook_run_id() if run_id is None else run_id)
+        shutil.rmtree(os.path.join(run_dir, namespace), ignore_errors=True)
+
+    @contextlib.contextmanager
+    def _locked(self, key):
+        if not os.path.isdir(self._entries.directory):
+            os.makedirs(self._entries.directory, mode=0o700)
+        lock_path = self._entries._path(key) + ".lock"
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _key(key):
+    return "\n".join(str(part) for part in key)
+
+
+def _base_dir(base_dir):
+    if base_dir is None:
+        return _SHARED_MEMORY_DIR if os.path.isdir(_SHARED_MEMORY_DIR) else tempfile.gettempdir()
+    return os.path.expanduser(base_dir)
+
+
+def _run_dir(root, run_id):
+    return os.path.join(root, "run-{0}".format(run_id))
+
+
+def _private_dir(base_dir):
+    path = os.path.join(_base_dir(base_dir), _ROOT_NAME.format(os.getuid()))
+
+    try:
+        os.mkdir(path, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    # The directory holds secrets, refuse one another user could read or replace
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(errno.EPERM, "Cache directory is not private to the current user", path)
+    return path
+
+
+def _remove_finished_runs(root, keep):
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+
+    for name in names:
+        if not name.startswith("run-") or not name[4:].isdigit() or int(name[4:]) == keep:
+            continue
+        if not _running(int(name[4:])):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def _running(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
@@ -0,0 +1,201 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+import os
+import tempfile
+import time
+
+from ansible_collections.onepassword.connect.plugins.module_utils import timings
+
+"""
+Play-wide statistics built from the `op_timings` reported by the modules.
+"""
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(values, quantile):
+    """Nearest-rank percentile of a list of numbers, None if it is empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(quantile * len(ordered))))
+    return ordered[rank - 1]
+
+
+class Stats:
+
+    def __init__(self, playbook=None):
+        self.playbook = playbook
+        self.tasks = 0
+        # Tasks whose result was hidden by `no_log`, timings included
+        self.censored_tasks = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latencies_ms = []
+        # Requests by (method, path template)
+        self.endpoints = {}
+        self.task_durations = []
+
+    def add(self, report, host=None, task=None, item=None):
+        """Adds the `op_timings` of one task result.
+
+        :param dict report: Value of the result's `op_timings` key
+        :param str host: Inventory name of the host the task ran for
+        :param str task: Name of the task
+        :param str item: Name or ID of the item the task read or wrote, if known
+        """
+        self.tasks += 1
+        self.cache_hits += report.get("cache_hits", 0)
+        self.cache_misses += report.get("cache_misses", 0)
+        self.retries += report.get("retries", 0)
+        self.bytes_in += report.get("bytes_in", 0)
+        self.bytes_out += report.get("bytes_out", 0)
+
+        for call in report.get("calls", []):
+            endpoint = (call.get("method"), call.get("path"))
+            self.endpoints[endpoint] = self.endpoints.get(endpoint, 0) + 1
+            if call.get("total_ms") is not None:
+                self.latencies_ms.append(call["total_ms"])
+
+        self.task_durations.append({
+            "host": host,
+            "task": task,
+            "item": item,
+            "requests": report.get("requests", 0),
+            "total_ms": report.get("total_ms", 0),
+        })
+
+    def add_censored(self):
+        self.tasks += 1
+        self.censored_tasks += 1
+
+    @property
+    def requests(self):
+        return sum(self.endpoints.values())
+
+    @property
+    def cache_hit_ratio(self):
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / float(lookups) if lookups else None
+
+    def slowest(self, count=5):
+        return sorted(self.task_durations, key=lambda t: t["total_ms"], reverse=True)[:count]
+
+    def summary(self, slowest=5):
+        return {
+            "playbook": self.playbook,
+            "tasks": self.tasks,
+            "censored_tasks": self.censored_tasks,
+            "requests": self.requests,
+            "retries": self.retries,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": self.cache_hit_ratio,
+            "latency_ms": dict(
+                ("p{0}".format(int(q * 100)), percentile(self.latencies_ms, q)) for q in QUANTILES
+            ),
+            "endpoints": [
+                {"method": method, "path": path, "requests": count}
+                for (method, path), count in sorted(self.endpoints.items(), key=lambda e: (-e[1], e[0]))
+            ],
+            "slowest": self.slowest(slowest),
+        }
+
+    def to_json(self, slowest=5):
+        return json.dumps(self.summary(slowest=slowest), indent=2, sort_keys=True)
+
+    def to_prometheus(self, now=None):
+        """Renders the statistics in the Prometheus text format, for the node exporter's textfile collector"""
+        playbook = {"playbook": self.playbook or ""}
+        lines = []
+
+        def _metric(name, help_text, metric_type, samples):
+            lines.append("# HELP {0} {1}".format(name, help_text))
+            lines.append("# TYPE {0} {1}".format(name, metric_type))
+            for suffix, labels, value in samples:
+                lines.append("{0}{1}{2} {3}".format(name, suffix, _labels(dict(playbook, **labels)), _number(value)))
+
+        _metric("onepassword_connect_tasks", "Tasks of the last run that reported their requests.", "gauge", [
+            ("", {"censored": "false"}, self.tasks - self.censored_tasks),
+            ("", {"censored": "true"}, self.censored_tasks),
+        ])
+        _metric("onepassword_connect_requests", "Requests sent to 1Password Connect during the last run.", "gauge", [
+            ("", {"method": method, "path": path}, count) for (method, path), count in sorted(self.endpoints.items())
+        ])
+        _metric("onepassword_connect_retries", "Requests sent again after a transient error during the last run.", "gauge", [
+            ("", {}, self.retries),
+        ])
+        _metric("onepassword_connect_bytes", "Request and response body bytes of the last run.", "gauge", [
+            ("", {"direction": "in"}, self.bytes_in),
+            ("", {"direction": "out"}, self.bytes_out),
+        ])
+        _metric("onepassword_connect_cache_lookups", "Lookups in the client caches during the last run.", "gauge", [
+            ("", {"result": "hit"}, self.cache_hits),
+            ("", {"result": "miss"}, self.cache_misses),
+        ])
+
+        seconds = [ms / 1000.0 for ms in self.latencies_ms]
+        duration_samples = [("", {"quantile": str(q)}, percentile(seconds, q)) for q in QUANTILES if seconds]
+        duration_samples.append(("_sum", {}, sum(seconds)))
+        duration_samples.append(("_count", {}, len(seconds)))
+        _metric("onepassword_connect_request_duration_seconds", "Duration of the requests of the last run.", "summary",
+                duration_samples)
+
+        _metric("onepassword_connect_last_run_timestamp_seconds", "Time the last run ended.", "gauge", [
+            ("", {}, time.time() if now is None else now),
+        ])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, report_format="json", slowest=5):
+        """Writes the report to `path`, replacing it atomically so collectors never read a partial file"""
+        if report_format == "prometheus":
+            content = self.to_prometheus()
+        else:
+            content = self.to_json(slowest=slowest) + "\n"
+
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            # mkstemp creates the file readable by its owner only
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def from_result(result):
+    """Returns the `op_timings` of a module result, or None if it has none"""
+    report = result.get(timings.RESULT_KEY) if isinstance(result, dict) else None
+    return report if isinstance(report, dict) else None
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join('{0}="{1}"'.format(k, _escape(v)) for k, v in sorted(labels.items())) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
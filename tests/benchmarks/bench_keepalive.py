@@ -0,0 +1,115 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+"""
+Per-task latency of a generic_item update with and without keep-alive connections.
+
+Each task builds a fresh client (as a module run does), looks the item up by
+title and writes it back: a title search, a GET and a PUT. The stand-in
+server sleeps once per new connection to model the TCP/TLS handshake cost
+of a remote Connect deployment.
+
+Run from a directory on the collections path:
+
+    python -m ansible_collections.onepassword.connect.tests.benchmarks.bench_keepalive
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, transport, vault
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+class BenchModule:
+    """Just enough of AnsibleModule for the API client and fetch_url."""
+
+    ansible_version = "benchmark"
+
+    def __init__(self):
+        self.params = {}
+        self.tmpdir = tempfile.gettempdir()
+
+    def jsonify(self, data):
+        return json.dumps(data)
+
+    def fail_json(self, **kwargs):
+        raise RuntimeError(kwargs.get("msg"))
+
+
+def _task_params(vault_id):
+    return {
+        "vault_id": vault_id,
+        "title": "Benchmark DB",
+        "name": "Benchmark DB",
+        "category": "database",
+        "favorite": False,
+        "fields": [
+            {"label": "username", "value": "admin", "field_type": "string", "generate_value": "never"},
+            {"label": "password", "value": "hunter2", "field_type": "concealed", "generate_value": "never"},
+        ],
+    }
+
+
+def _run_task(server, params, transport_factory):
+    module = BenchModule()
+    client = api.OnePassword(server.url, "token", module, http_transport=transport_factory(module))
+
+    item = vault.find_item(params, client)
+    vault.update_item(params, item, client)
+
+
+def run(tasks, request_latency, handshake_latency):
+    results = {}
+    transports = (
+        ("fetch_url", transport.FetchUrlTransport),
+        ("keep-alive", lambda module: transport.ConnectionPool()),
+    )
+
+    with MockConnect(latency=request_latency, connection_latency=handshake_latency) as server:
+        bench_vault = server.add_vault("Benchmark")
+        params = _task_params(bench_vault["id"])
+        server.add_item(bench_vault["id"], {"title": params["name"], "category": "DATABASE"})
+
+        for name, factory in transports:
+            server.reset_stats()
+            durations = []
+            for _ in range(tasks):
+                start = time.perf_counter()
+                _run_task(server, params, factory)
+                durations.append(time.perf_counter() - start)
+
+            results[name] = {
+                "requests": server.count(),
+                "connections": server.connections,
+                "p50_ms": statistics.median(durations) * 1000,
+                "mean_ms": statistics.mean(durations) * 1000,
+            }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keep-alive connections against a stand-in Connect server")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--request-latency", type=float, default=0.002,
+                        help="Seconds the server spends on each request")
+    parser.add_argument("--handshake-latency", type=float, default=0.02,
+                        help="Seconds the server spends on each new connection")
+    args = parser.parse_args()
+
+    results = run(args.tasks, args.request_latency, args.handshake_latency)
+
+    print("{0:<12} {1:>9} {2:>12} {3:>10} {4:>10}".format("transport", "requests", "connections", "p50 ms", "mean ms"))
+    for name, row in results.items():
+        print("{0:<12} {1:>9} {2:>12} {3:>10.2f} {4:>10.2f}".format(
+            name, row["requests"], row["connections"], row["p50_ms"], row["mean_ms"]
+        ))
+
+
+if __name__ == "__main__":
+    main()
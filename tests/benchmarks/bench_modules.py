@@ -0,0 +1,197 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+"""
+End-to-end benchmark of the collection's modules against a stand-in Connect server.
+
+Every task runs a module in its own Python process, the way Ansible runs a
+module task, and `--forks` tasks run at the same time. For each scenario and
+fork count the benchmark reports the round trips and response bytes per
+task, the task latency percentiles and the throughput in tasks per second.
+
+Run from a directory on the collections path:
+
+    python -m ansible_collections.onepassword.connect.tests.benchmarks.bench_modules --forks 1,10,100
+
+Use `--json` to get machine-readable results, for example to compare a
+branch against a baseline.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+TOKEN = "benchmark-token"
+
+_MODULE_PACKAGE = "ansible_collections.onepassword.connect.plugins.modules"
+
+# <root>/ansible_collections/onepassword/connect/tests/benchmarks/bench_modules.py
+_COLLECTIONS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 5))
+
+
+def _generic_item_args(vault_id):
+    return {
+        "vault_id": vault_id,
+        "title": "Orders DB",
+        "category": "database",
+        "fields": [
+            {"label": "username", "value": "orders", "field_type": "string"},
+            {"label": "password", "field_type": "concealed", "generate_value": "on_create"},
+            {"label": "host", "value": "orders.db.internal", "field_type": "string", "section": "Connection"},
+        ],
+    }
+
+
+SCENARIOS = {
+    # Converging an item that is already up to date
+    "generic_item": lambda vault: ("generic_item", _generic_item_args(vault["id"])),
+    "item_info": lambda vault: ("item_info", {"item": "Orders DB", "vault": vault["id"]}),
+    "item_info_no_vault": lambda vault: ("item_info", {"item": "Orders DB"}),
+    "field_info": lambda vault: ("field_info", {"item": "Orders DB", "vault": vault["name"], "field": "password"}),
+}
+
+
+def _seed(server, vaults):
+    bench_vault = None
+    for i in range(vaults):
+        bench_vault = server.add_vault("Vault {0}".format(i))
+    args = _generic_item_args(bench_vault["id"])
+    # Create the item the way generic_item would, so the converge finds nothing to change
+    _run_module(server, "generic_item", args, tempfile.gettempdir())
+    return bench_vault
+
+
+def _run_module(server, module_name, args, tmpdir):
+    module_args = dict(args, hostname=server.url, token=TOKEN)
+    fd, args_path = tempfile.mkstemp(dir=tmpdir, suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"ANSIBLE_MODULE_ARGS": module_args}, f)
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (_COLLECTIONS_ROOT, env.get("PYTHONPATH")) if p)
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "{0}.{1}".format(_MODULE_PACKAGE, module_name), args_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    elapsed = time.perf_counter() - start
+    os.remove(args_path)
+
+    try:
+        result = json.loads(proc.stdout.decode("utf-8"))
+    except ValueError:
+        result = {"failed": True, "msg": proc.stderr.decode("utf-8")[-500:]}
+    return elapsed, result
+
+
+def percentile(durations, pct):
+    """Nearest-rank percentile of a list of durations"""
+    ordered = sorted(durations)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def run_scenario(server, scenario, bench_vault, forks, tasks):
+    module_name, args = SCENARIOS[scenario](bench_vault)
+    server.reset_stats()
+    tmpdir = tempfile.mkdtemp()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=forks) as executor:
+        runs = list(executor.map(lambda _i: _run_module(server, module_name, args, tmpdir), range(tasks)))
+    wall = time.perf_counter() - start
+    os.rmdir(tmpdir)
+
+    durations = [elapsed for elapsed, _result in runs]
+    failures = [result.get("msg") for _elapsed, result in runs if result.get("failed")]
+
+    return {
+        "scenario": scenario,
+        "forks": forks,
+        "tasks": tasks,
+        "failed": len(failures),
+        "first_failure": failures[0] if failures else None,
+        "round_trips": server.count() / float(tasks),
+        "bytes": server.bytes_sent / float(tasks),
+        "p50_ms": statistics.median(durations) * 1000,
+        "p95_ms": percentile(durations, 95) * 1000,
+        "p99_ms": percentile(durations, 99) * 1000,
+        "tasks_per_sec": tasks / wall,
+    }
+
+
+def run(scenarios, forks, tasks, vaults, latency, error_rate):
+    results = []
+    with MockConnect(token=TOKEN, latency=latency, error_rate=error_rate, seed=0) as server:
+        bench_vault = _seed(server, vaults)
+        for scenario in scenarios:
+            for fork_count in forks:
+                results.append(run_scenario(server, scenario, bench_vault, fork_count, max(tasks, fork_count)))
+    return results
+
+
+def _print_table(results):
+    header = "{0:<20} {1:>5} {2:>6} {3:>6} {4:>11} {5:>9} {6:>9} {7:>9} {8:>9} {9:>10}"
+    row = "{0:<20} {1:>5} {2:>6} {3:>6} {4:>11.1f} {5:>9.0f} {6:>9.1f} {7:>9.1f} {8:>9.1f} {9:>10.1f}"
+    print(header.format("scenario", "forks", "tasks", "failed", "round trips", "bytes", "p50 ms", "p95 ms", "p99 ms", "tasks/sec"))
+    for r in results:
+        print(row.format(
+            r["scenario"], r["forks"], r["tasks"], r["failed"], r["round_trips"], r["bytes"],
+            r["p50_ms"], r["p95_ms"], r["p99_ms"], r["tasks_per_sec"]
+        ))
+    for r in results:
+        if r["first_failure"]:
+            print("{0} with {1} forks failed: {2}".format(r["scenario"], r["forks"], r["first_failure"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the collection's modules against a stand-in Connect server")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma-separated scenarios to run, from: {0}".format(", ".join(SCENARIOS)))
+    parser.add_argument("--forks", default="1,10,100",
+                        help="Comma-separated numbers of tasks run at the same time")
+    parser.add_argument("--tasks", type=int, default=100,
+                        help="Tasks run per scenario and fork count (at least one per fork)")
+    parser.add_argument("--vaults", type=int, default=20,
+                        help="Vaults on the server. The benchmark item is in the last one.")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Seconds the server spends on each request")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with a 503")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error("unknown scenarios: {0}".format(", ".join(unknown)))
+
+    results = run(
+        scenarios,
+        forks=[int(f) for f in args.forks.split(",")],
+        tasks=args.tasks,
+        vaults=args.vaults,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+"""
+Stand-in 1Password Connect server for tests and benchmarks.
+
+Implements the parts of the Connect API this collection talks to, keeps
+everything in memory and records each request it serves. It is not a
+faithful Connect implementation; it only mimics the response shapes the
+modules rely on.
+"""
+
+import json
+import os
+import base64
+import random
+import re
+import secrets
+import string
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+_TITLE_FILTER = re.compile(r'^title eq "(?P<value>.*)"$')
+_NAME_FILTER = re.compile(r'^name eq "(?P<value>.*)"$')
+
+_ACTIVITY_PATH = re.compile(r"^/v1/activity/?$")
+_VAULTS_PATH = re.compile(r"^/v1/vaults/?$")
+_VAULT_PATH = re.compile(r"^/v1/vaults/(?P<vault>[^/]+)/?$")
+_ITEMS_PATH = re.compile(r"^/v1/vaults/(?P<vault>[^/]+)/items/?$")
+_ITEM_PATH = re.compile(r"^/v1/vaults/(?P<vault>[^/]+)/items/(?P<item>[^/]+)/?$")
+_FILES_PATH = re.compile(r"^/v1/vaults/(?P<vault>[^/]+)/items/(?P<item>[^/]+)/files/?$")
+_FILE_PATH = re.compile(r"^/v1/vaults/(?P<vault>[^/]+)/items/(?P<item>[^/]+)/files/(?P<file>[^/]+)/?$")
+_FILE_CONTENT_PATH = re.compile(
+    r"^/v1/vaults/(?P<vault>[^/]+)/items/(?P<item>[^/]+)/files/(?P<file>[^/]+)/content/?$"
+)
+
+# Actions logged in the activity feed for requests on items
+_ACTIONS = {"GET": "READ", "POST": "CREATE", "PUT": "UPDATE", "DELETE": "DELETE"}
+
+# Keys Connect leaves out of item summaries returned by the list endpoint
+_DETAIL_KEYS = ("fields", "sections", "files")
+
+# Bytes written at a time when sending file content
+_CHUNK_SIZE = 64 * 1024
+
+
+def new_uuid():
+    """Returns a 26-character ID in the same shape Connect uses."""
+    return base64.b32encode(os.urandom(16)).decode("utf-8").rstrip("=").lower()
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MockConnect:
+    """In-memory Connect server running on a background thread.
+
+    Usable as a context manager:
+
+        with MockConnect() as server:
+            vault = server.add_vault("Infra")
+            ... point the client at server.url ...
+    """
+
+    def __init__(
+            self,
+            token=None,
+            latency=0.0,
+            connection_latency=0.0,
+            idle_timeout=None,
+            error_rate=0.0,
+            seed=None,
+            vault_filter=True,
+    ):
+        """
+        :param token: Bearer token the server expects. Any token is accepted if None.
+        :param latency: Seconds to wait before answering each request.
+        :param connection_latency: Seconds to wait once per accepted connection,
+            standing in for the TCP and TLS handshake cost of a remote server.
+        :param idle_timeout: Seconds after which an idle keep-alive connection is closed.
+        :param error_rate: Fraction of requests answered with a 503, picked at random.
+        :param seed: Seed for the random errors, to make a run repeatable.
+        :param vault_filter: Whether vault listings can be filtered by name.
+            If False, filtered requests fail with a 400 like older Connect servers.
+        """
+        self.token = token
+        self.latency = latency
+        self.connection_latency = connection_latency
+        self.idle_timeout = idle_timeout
+        self.error_rate = error_rate
+        self.vault_filter = vault_filter
+        self.vaults = {}
+        self.items = {}
+        # File content by file ID
+        self.files = {}
+        # Requests on items, oldest first, as listed by the activity endpoint
+        self.activity = []
+        self.requests = []
+        self.statuses = {}
+        self.connections = 0
+        self.bytes_sent = 0
+        self._failures = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return "http://{0}:{1}".format(host, port)
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = []
+            self.statuses = {}
+            self.connections = 0
+            self.bytes_sent = 0
+
+    def count(self, method=None):
+        """Number of requests served, optionally only for one HTTP method."""
+        with self._lock:
+            return sum(1 for m, _path in self.requests if method is None or m == method)
+
+    def inject_error(self, status, times=1, method=None, path=None, retry_after=None):
+        """Makes the next matching requests fail.
+
+        :param int status: HTTP status of the error response
+        :param int times: Number of requests that fail
+        :param str method: Only fail requests using this HTTP method
+        :param str path: Only fail requests whose path matches this regular expression
+        :param retry_after: Value of the Retry-After header sent with the error
+        """
+        with self._lock:
+            self._failures.append({
+                "status": status,
+                "times": times,
+                "method": method,
+                "path": re.compile(path) if path else None,
+                "retry_after": retry_after,
+            })
+
+    def _take_failure(self, method, path):
+        for failure in self._failures:
+            if failure["method"] and failure["method"] != method:
+                continue
+            if failure["path"] and not failure["path"].search(path):
+                continue
+            failure["times"] -= 1
+            if failure["times"] <= 0:
+                self._failures.remove(failure)
+            return failure
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return {"status": 503, "retry_after": None}
+        return None
+
+    def add_vault(self, name, vault_id=None):
+        vault = {"id": vault_id or new_uuid(), "name": name}
+        with self._lock:
+            self.vaults[vault["id"]] = vault
+            self.items.setdefault(vault["id"], {})
+        return vault
+
+    def add_item(self, vault_id, item):
+        """Stores an item as if it was created through the API and returns the stored copy."""
+        with self._lock:
+            return _copy(self._store(vault_id, item))
+
+    def add_file(self, vault_id, item_id, name, content, section_id=None):
+        """Attaches a file to a stored item and returns its description, as listed by Connect."""
+        with self._lock:
+            item = self.items[vault_id][item_id]
+            file_id = new_uuid()
+            attachment = {
+                "id": file_id,
+                "name": name,
+                "size": len(content),
+                "content_path": "/v1/vaults/{0}/items/{1}/files/{2}/content".format(vault_id, item_id, file_id),
+            }
+            if section_id:
+                attachment["section"] = {"id": section_id}
+            item.setdefault("files", []).append(attachment)
+            self.files[file_id] = content
+            return _copy(attachment)
+
+    def _log_activity(self, method, path, status, payload):
+        # Listing items isn't logged, creating one is
+        match = _ITEM_PATH.match(path) or (_ITEMS_PATH.match(path) if method == "POST" else None)
+        if not match or method not in _ACTIONS or status == 404:
+            return
+        item_id = match.groupdict().get("item") or (payload or {}).get("id")
+        self.activity.append({
+            "requestId": new_uuid(),
+            "timestamp": _timestamp(),
+            "action": _ACTIONS[method],
+            "result": "SUCCESS" if status < 400 else "DENY",
+            "actor": {"id": "MOCKCONNECTUSER", "account": "MOCKACCOUNT", "userAgent": "mock"},
+            "resource": {
+                "type": "ITEM",
+                "vault": {"id": match.group("vault")},
+                "item": {"id": item_id},
+                "itemVersion": (payload or {}).get("version"),
+            },
+        })
+
+    def _store(self, vault_id, body, previous=None):
+        now = _timestamp()
+        item = {
+            "id": (previous or {}).get("id") or body.get("id") or new_uuid(),
+            "title": body.get("title"),
+            "vault": {"id": vault_id},
+            "category": body.get("category") or "API_CREDENTIAL",
+            "version": (previous or {}).get("version", 0) + 1,
+            "createdAt": (previous or {}).get("createdAt", now),
+            "updatedAt": now,
+            "lastEditedBy": "MOCKCONNECTUSER",
+            "tags": sorted(body.get("tags") or []),
+        }
+        if body.get("favorite"):
+            item["favorite"] = True
+        if body.get("urls"):
+            item["urls"] = [
+                dict(url, primary=True) if i == 0 else dict(url)
+                for i, url in enumerate(body["urls"])
+            ]
+        if body.get("sections"):
+            item["sections"] = [
+                {"id": s.get("id") or new_uuid(), "label": s.get("label")}
+                for s in body["sections"]
+            ]
+        item["fields"] = [_store_field(f) for f in body.get("fields") or []]
+        if (previous or {}).get("files"):
+            # Files can't be changed through the API, so they stay attached
+            item["files"] = previous["files"]
+
+        self.items.setdefault(vault_id, {})[item["id"]] = item
+        return item
+
+
+def _store_field(field):
+    stored = {
+        "id": field.get("id") or new_uuid(),
+        "type": field.get("type") or "STRING",
+        "label": field.get("label"),
+        "value": field.get("value"),
+    }
+    if field.get("purpose"):
+        stored["purpose"] = field["purpose"]
+    if field.get("section"):
+        stored["section"] = {"id": field["section"]["id"]}
+    if field.get("generate"):
+        length = (field.get("recipe") or {}).get("length") or 32
+        stored["value"] = "".join(secrets.choice(string.ascii_letters + string.digits) for _i in range(length))
+        stored["entropy"] = float(length * 5)
+    return stored
+
+
+def _etag(item):
+    return '"{0}-{1}"'.format(item["id"], item.get("version", 0))
+
+
+def _copy(obj):
+    return json.loads(json.dumps(obj))
+
+
+def _handler_for(server):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        timeout = server.idle_timeout
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super(Handler, self).setup()
+            with server._lock:
+                server.connections += 1
+            if server.connection_latency:
+                time.sleep(server.connection_latency)
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_PUT(self):
+            self._dispatch("PUT")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def _dispatch(self, method):
+            url = urlparse(self.path)
+            path = unquote(url.path)
+            query = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+            length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(length) if length else b""
+
+            with server._lock:
+                server.requests.append((method, path))
+                failure = server._take_failure(method, path)
+
+            if server.latency:
+                time.sleep(server.latency)
+
+            if failure:
+                headers = {}
+                if failure["retry_after"] is not None:
+                    headers["Retry-After"] = str(failure["retry_after"])
+                return self._error(failure["status"], "Injected failure", headers)
+
+            if server.token and self.headers.get("Authorization") != "Bearer {0}".format(server.token):
+                return self._error(401, "Invalid token")
+
+            try:
+                body = json.loads(raw_body.decode("utf-8")) if raw_body else None
+            except ValueError:
+                return self._error(400, "Invalid request body")
+
+            with server._lock:
+                status, payload = self._route(method, path, query, body)
+                server._log_activity(method, path, status, payload)
+
+            if status >= 400:
+                return self._error(status, payload)
+
+            headers = {}
+            if _ITEM_PATH.match(path) and isinstance(payload, dict):
+                headers["ETag"] = _etag(payload)
+                if method == "GET" and self.headers.get("If-None-Match") == headers["ETag"]:
+                    return self._send(304, None, headers)
+            self._send(status, payload, headers)
+
+        def _route(self, method, path, query, body):
+            if _ACTIVITY_PATH.match(path) and method == "GET":
+                limit = int(query.get("limit", 50))
+                offset = int(query.get("offset", 0))
+                newest_first = server.activity[::-1]
+                return 200, _copy(newest_first[offset:offset + limit])
+
+            match = _VAULTS_PATH.match(path)
+            if match and method == "GET":
+                return _list_vaults(server.vaults, query.get("filter"), server.vault_filter)
+
+            match = _VAULT_PATH.match(path)
+            if match and method == "GET":
+                vault = server.vaults.get(match.group("vault"))
+                return (200, _copy(vault)) if vault else (404, "Vault not found")
+
+            match = _ITEMS_PATH.match(path)
+            if match:
+                items = server.items.get(match.group("vault"))
+                if items is None:
+                    return 404, "Vault not found"
+                if method == "GET":
+                    return 200, _list_items(items, query.get("filter"))
+                if method == "POST":
+                    return 200, _copy(server._store(match.group("vault"), body or {}))
+
+            match = _FILES_PATH.match(path) or _FILE_PATH.match(path) or _FILE_CONTENT_PATH.match(path)
+            if match and method == "GET":
+                item = server.items.get(match.group("vault"), {}).get(match.group("item"))
+                if item is None:
+                    return 404, "Item not found"
+                files = item.get("files") or []
+                if match.re is _FILES_PATH:
+                    return 200, _copy(files)
+                attachment = next((f for f in files if f["id"] == match.group("file")), None)
+                if attachment is None:
+                    return 404, "File not found"
+                if match.re is _FILE_PATH:
+                    return 200, _copy(attachment)
+                return 200, server.files[attachment["id"]]
+
+            match = _ITEM_PATH.match(path)
+            if match:
+                items = server.items.get(match.group("vault"), {})
+                item = items.get(match.group("item"))
+                if item is None:
+                    return 404, "Item not found"
+                if method == "GET":
+                    return 200, _copy(item)
+                if method == "PUT":
+                    return 200, _copy(server._store(match.group("vault"), body or {}, previous=item))
+                if method == "DELETE":
+                    del items[item["id"]]
+                    return 204, None
+
+            return 404, "Not found"
+
+        def _send(self, status, payload, headers=None):
+            # File content is sent as is, everything else as JSON
+            raw = isinstance(payload, bytes)
+            if raw:
+                data = payload
+            else:
+                data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if data:
+                self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+            if status != 304:
+                self.send_header("Content-Length", str(len(data)))
+            with server._lock:
+                server.bytes_sent += len(data)
+                server.statuses[status] = server.statuses.get(status, 0) + 1
+            self.end_headers()
+            for offset in range(0, len(data), _CHUNK_SIZE):
+                self.wfile.write(data[offset:offset + _CHUNK_SIZE])
+
+        def _error(self, status, message, headers=None):
+            self._send(status, {"status": status, "message": message}, headers)
+
+    return Handler
+
+
+def _list_vaults(vaults, query_filter, filter_supported):
+    if not query_filter:
+        return 200, _copy(list(vaults.values()))
+    match = _NAME_FILTER.match(query_filter)
+    if not filter_supported or not match:
+        return 400, "Invalid filter"
+    return 200, _copy([v for v in vaults.values() if v["name"] == match.group("value")])
+
+
+def _list_items(items, query_filter):
+    title = None
+    if query_filter:
+        match = _TITLE_FILTER.match(query_filter)
+        if not match:
+            return []
+        title = match.group("value")
+
+    return [
+        dict((k, v) for k, v in _copy(item).items() if k not in _DETAIL_KEYS)
+        for item in items.values()
+        if title is None or item.get("title") == title
+    ]
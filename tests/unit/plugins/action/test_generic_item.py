@@ -0,0 +1,129 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import pytest
+
+from ansible.plugins.loader import action_loader
+
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+@pytest.fixture
+def server():
+    with MockConnect(token="secret-token") as mock_server:
+        yield mock_server
+
+
+def _action(mocker, args, check_mode=False, environment=None, connection="ssh", async_val=0):
+    task = mocker.MagicMock()
+    task.args = args
+    task.async_val = async_val
+    task.check_mode = check_mode
+    task.environment = [environment] if environment else None
+
+    play_context = mocker.MagicMock()
+    play_context.connection = connection
+
+    templar = mocker.MagicMock()
+    templar.template.side_effect = lambda value: value
+
+    ssh = mocker.MagicMock()
+    ssh.has_native_async = False
+
+    return action_loader.get(
+        "onepassword.connect.generic_item",
+        task=task,
+        connection=ssh,
+        play_context=play_context,
+        loader=mocker.MagicMock(),
+        templar=templar,
+        shared_loader_obj=None,
+    )
+
+
+def _args(server, vault_id, **kwargs):
+    args = {
+        "token": "secret-token",
+        "vault_id": vault_id,
+        "title": "Database",
+        "run_on_controller": True,
+        "fields": [{"label": "password", "value": "hunter2", "field_type": "concealed"}],
+    }
+    args.update(kwargs)
+    return args
+
+
+def test_runs_on_controller(mocker, server):
+    vault_id = server.add_vault("Infra")["id"]
+    action = _action(mocker, _args(server, vault_id), environment={"OP_CONNECT_HOST": server.url})
+    execute_module = mocker.patch.object(action, "_execute_module")
+
+    result = action.run(task_vars={})
+
+    assert not result.get("failed"), result
+    assert result["changed"] is True
+    assert result["op_item"]["title"] == "Database"
+    # Secrets passed as module options are masked, like AnsibleModule does
+    assert result["op_item"]["fields"]["password"]["value"] == "VALUE_SPECIFIED_IN_NO_LOG_PARAMETER"
+    assert result["invocation"]["module_args"]["hostname"] == [server.url]
+    assert list(server.items[vault_id].values())[0]["fields"][0]["value"] == "hunter2"
+    execute_module.assert_not_called()
+
+
+def test_check_mode_on_controller(mocker, server):
+    vault_id = server.add_vault("Infra")["id"]
+    action = _action(mocker, _args(server, vault_id, hostname=server.url), check_mode=True)
+
+    result = action.run(task_vars={})
+
+    assert result["changed"] is True
+    assert server.items.get(vault_id) in (None, {})
+
+
+def test_reports_invalid_arguments(mocker, server):
+    vault_id = server.add_vault("Infra")["id"]
+    args = _args(server, vault_id, hostname=server.url)
+    del args["title"]
+    action = _action(mocker, args)
+
+    result = action.run(task_vars={})
+
+    assert result["failed"] is True
+    assert "missing: name" in result["msg"]
+
+
+@pytest.mark.parametrize("args, connection", [
+    ({"run_on_controller": False}, "ssh"),
+    ({}, "ssh"),
+    ({"run_on_controller": True}, "ansible.netcommon.httpapi"),
+])
+def test_runs_module_on_target(mocker, args, connection):
+    action = _action(mocker, dict(args, vault_id="abc", title="Database"), connection=connection)
+    execute_module = mocker.patch.object(action, "_execute_module", return_value={"changed": False, "op_item": {}})
+
+    result = action.run(task_vars={})
+
+    assert result["changed"] is False
+    assert execute_module.call_args[1]["module_name"] == "onepassword.connect.generic_item"
+
+
+def test_runs_async_module_on_target(mocker):
+    action = _action(mocker, {"vault_id": "abc", "title": "Database"}, async_val=30)
+    execute_module = mocker.patch.object(action, "_execute_module", return_value={"started": 1, "ansible_job_id": "j1"})
+
+    result = action.run(task_vars={})
+
+    assert result["ansible_job_id"] == "j1"
+    assert execute_module.call_args[1]["wrap_async"]
+
+
+def test_async_is_refused_on_controller(mocker, server):
+    vault_id = server.add_vault("Infra")["id"]
+    action = _action(mocker, _args(server, vault_id, hostname=server.url), async_val=30)
+
+    result = action.run(task_vars={})
+
+    assert result["failed"] is True
+    assert "async" in result["msg"]
+    assert server.items[vault_id] == {}
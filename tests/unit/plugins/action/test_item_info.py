@@ -0,0 +1,123 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import pytest
+
+from ansible.plugins.loader import action_loader
+
+from ansible_collections.onepassword.connect.plugins.plugin_utils import item_cache
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    monkeypatch.setattr(item_cache, "_SHARED_MEMORY_DIR", str(tmp_path))
+
+    with MockConnect(token="secret-token") as mock_server:
+        vault = mock_server.add_vault("Infra")
+        mock_server.add_item(vault["id"], {
+            "title": "Monitoring",
+            "fields": [{"label": "api_key", "value": "hunter2", "type": "CONCEALED"}],
+        })
+        yield mock_server
+
+
+def _action(mocker, module, args, async_val=0):
+    task = mocker.MagicMock()
+    task.args = args
+    task.async_val = async_val
+    task.check_mode = False
+    task.environment = None
+
+    connection = mocker.MagicMock()
+    connection.has_native_async = False
+
+    return action_loader.get(
+        "onepassword.connect.{0}".format(module),
+        task=task,
+        connection=connection,
+        play_context=mocker.MagicMock(connection="ssh"),
+        loader=mocker.MagicMock(),
+        templar=mocker.MagicMock(),
+        shared_loader_obj=None,
+    )
+
+
+def _run(mocker, module, args):
+    return _action(mocker, module, args).run(task_vars={})
+
+
+def _args(server, **kwargs):
+    args = {
+        "hostname": server.url,
+        "token": "secret-token",
+        "vault": "Infra",
+        "item": "Monitoring",
+        "run_on_controller": True,
+        "controller_cache_ttl": 60,
+    }
+    args.update(kwargs)
+    return args
+
+
+def test_hosts_share_one_read(mocker, server):
+    # Every host of the play reads the same item
+    results = [_run(mocker, "item_info", _args(server, timings=True)) for _host in range(5)]
+    results.append(_run(mocker, "field_info", _args(server, field="api_key")))
+
+    assert server.count() == 3
+    assert all(r["op_item"]["fields"]["api_key"]["value"] == "hunter2" for r in results[:5])
+    assert results[-1]["field"]["value"] == "hunter2"
+    assert [r["op_timings"]["cache_hits"] for r in results[:5]] == [0, 1, 1, 1, 1]
+
+
+def test_each_host_reads_without_ttl(mocker, server):
+    for _host in range(3):
+        result = _run(mocker, "field_info", _args(server, field="api_key", controller_cache_ttl=0))
+        assert result["field"]["value"] == "hunter2"
+
+    assert server.count() == 9
+
+
+def test_writes_on_the_controller_are_read_again(mocker, server):
+    vault_id = list(server.vaults)[0]
+    _run(mocker, "field_info", _args(server, field="api_key"))
+
+    _run(mocker, "generic_item", {
+        "hostname": server.url,
+        "token": "secret-token",
+        "vault_id": vault_id,
+        "title": "Monitoring",
+        "run_on_controller": True,
+        "fields": [{"label": "api_key", "value": "rotated", "field_type": "concealed"}],
+    })
+
+    assert _run(mocker, "field_info", _args(server, field="api_key"))["field"]["value"] == "rotated"
+
+
+def test_returns_only_the_selected_fields(mocker, server):
+    result = _run(mocker, "field_info", _args(server, fields=[{"field": "api_key", "key": "key"}]))
+
+    assert result["fields"]["key"]["value"] == "hunter2"
+    assert "field" not in result
+
+
+def test_reports_missing_items(mocker, server):
+    result = _run(mocker, "item_info", _args(server, item="Nope"))
+
+    assert result["failed"] is True
+    assert result["msg"] == "Item not found"
+
+
+@pytest.mark.parametrize("module", ["item_info", "field_info"])
+def test_async_tasks_run_on_target(mocker, server, module):
+    action = _action(mocker, module, _args(server, run_on_controller=False, field="api_key"), async_val=30)
+    execute_module = mocker.patch.object(action, "_execute_module", return_value={"started": 1, "ansible_job_id": "j1"})
+
+    result = action.run(task_vars={})
+
+    assert result["ansible_job_id"] == "j1"
+    assert execute_module.call_args[1]["module_name"] == "onepassword.connect.{0}".format(module)
+    assert execute_module.call_args[1]["wrap_async"]
+    assert server.count() == 0
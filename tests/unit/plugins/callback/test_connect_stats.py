@@ -0,0 +1,103 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible.plugins.loader import callback_loader
+
+from ansible_collections.onepassword.connect.plugins.plugin_utils import stats
+
+
+def _report(*calls, **totals):
+    report = {
+        "calls": [
+            {"method": method, "path": path, "total_ms": total_ms, "retries": 0}
+            for method, path, total_ms in calls
+        ],
+        "requests": len(calls),
+        "total_ms": sum(c[2] for c in calls),
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "bytes_in": 0,
+        "bytes_out": 0,
+        "retries": 0,
+    }
+    report.update(totals)
+    return report
+
+
+GET_ITEM = ("GET", "/vaults/{vault_id}/items/{item_id}")
+BY_TITLE = ("GET", "/vaults/{vault_id}/items?filter=title")
+
+
+@pytest.fixture
+def callback(tmp_path):
+    plugin = callback_loader.get("onepassword.connect.connect_stats")
+    plugin.set_options(direct={"report_path": str(tmp_path / "report.json")})
+    return plugin
+
+
+def _result(mocker, data, host="web01", task_name="Read password", args=None, action="onepassword.connect.field_info"):
+    result = mocker.MagicMock()
+    result._host.get_name.return_value = host
+    result._task.get_name.return_value = task_name
+    result._task.args = args or {}
+    result._task.resolved_action = action
+    result._result = data
+    return result
+
+
+def test_stats_summary():
+    play_stats = stats.Stats(playbook="site.yml")
+    play_stats.add(_report(BY_TITLE + (20.0,), GET_ITEM + (10.0,), cache_misses=1, bytes_in=500),
+                   host="web01", task="Read", item="DB")
+    play_stats.add(_report(GET_ITEM + (5.0,), cache_hits=3, bytes_in=300), host="web02", task="Read", item="DB")
+    play_stats.add_censored()
+
+    summary = play_stats.summary(slowest=1)
+
+    assert summary["tasks"] == 3
+    assert summary["censored_tasks"] == 1
+    assert summary["requests"] == 3
+    assert summary["bytes_in"] == 800
+    assert summary["cache_hit_ratio"] == 0.75
+    assert summary["latency_ms"]["p95"] == 20.0
+    assert summary["endpoints"][0] == {"method": "GET", "path": GET_ITEM[1], "requests": 2}
+    assert summary["slowest"] == [{"host": "web01", "task": "Read", "item": "DB", "requests": 2, "total_ms": 30.0}]
+
+
+def test_stats_prometheus_report():
+    play_stats = stats.Stats(playbook='deploy "prod".yml')
+    play_stats.add(_report(GET_ITEM + (250.0,), cache_hits=1))
+
+    lines = play_stats.to_prometheus(now=1700000000).splitlines()
+
+    assert ('onepassword_connect_requests{method="GET",path="/vaults/{vault_id}/items/{item_id}",'
+            'playbook="deploy \\"prod\\".yml"} 1') in lines
+    assert 'onepassword_connect_request_duration_seconds{playbook="deploy \\"prod\\".yml",quantile="0.95"} 0.25' in lines
+    assert 'onepassword_connect_cache_lookups{playbook="deploy \\"prod\\".yml",result="hit"} 1' in lines
+    assert "# TYPE onepassword_connect_request_duration_seconds summary" in lines
+
+
+def test_callback_collects_task_results(mocker, callback, tmp_path):
+    callback.v2_runner_on_ok(_result(mocker, {"op_timings": _report(GET_ITEM + (10.0,))}, args={"item": "DB"}))
+    # A loop, with one iteration failing
+    callback.v2_runner_on_failed(_result(mocker, {"results": [
+        {"op_timings": _report(BY_TITLE + (1.0,)), "invocation": {"module_args": {"item": "Other"}}},
+        {"op_timings": _report(BY_TITLE + (2.0,), GET_ITEM + (3.0,)), "invocation": {"module_args": {"item": "DB"}}},
+    ]}), ignore_errors=True)
+    # Hidden by no_log, or not one of the collection's tasks
+    callback.v2_runner_on_ok(_result(mocker, {"censored": "hidden"}))
+    callback.v2_runner_on_ok(_result(mocker, {"censored": "hidden"}, action="ansible.builtin.debug"))
+    callback.v2_runner_on_ok(_result(mocker, {"changed": False}, action="ansible.builtin.ping"))
+
+    callback.v2_playbook_on_stats(None)
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["tasks"] == 4
+    assert report["censored_tasks"] == 1
+    assert report["requests"] == 4
+    assert [t["item"] for t in report["slowest"]] == ["DB", "DB", "Other"]
@@ -0,0 +1,48 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import io
+
+import pytest
+
+pytest.importorskip("ansible_collections.ansible.netcommon")
+
+from ansible_collections.onepassword.connect.plugins.httpapi.connect import HttpApi  # noqa: E402
+
+
+@pytest.fixture
+def httpapi(mocker):
+    connection = mocker.MagicMock()
+    connection.send.return_value = (
+        mocker.MagicMock(getcode=lambda: 200, headers={"Content-Type": "application/json"}),
+        io.BytesIO(b'[{"id": "abc", "name": "Infra"}]'),
+    )
+    plugin = HttpApi(connection)
+    plugin.set_options(var_options={"ansible_httpapi_op_vault_cache_ttl": 60})
+    return plugin
+
+
+def test_vault_listing_served_from_cache(httpapi):
+    headers = {"Authorization": "Bearer token"}
+
+    first = httpapi.send_request("/v1/vaults", headers=headers)
+    second = httpapi.send_request("/v1/vaults", headers=headers)
+
+    assert first == second
+    assert first["body"] == '[{"id": "abc", "name": "Infra"}]'
+    assert httpapi.connection.send.call_count == 1
+
+
+def test_vault_cache_is_scoped_to_token(httpapi):
+    httpapi.send_request("/v1/vaults", headers={"Authorization": "Bearer one"})
+    httpapi.send_request("/v1/vaults", headers={"Authorization": "Bearer two"})
+
+    assert httpapi.connection.send.call_count == 2
+
+
+def test_items_are_not_cached(httpapi):
+    httpapi.send_request("/v1/vaults/abc/items/xyz")
+    httpapi.send_request("/v1/vaults/abc/items/xyz")
+
+    assert httpapi.connection.send.call_count == 2
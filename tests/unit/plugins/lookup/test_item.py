@@ -0,0 +1,141 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+import multiprocessing
+import threading
+
+import pytest
+
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.onepassword.connect.plugins.lookup import item as item_lookup
+from ansible_collections.onepassword.connect.plugins.plugin_utils import item_cache
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    monkeypatch.setattr(item_lookup, "_ITEM_CACHE", item_lookup.ItemCache())
+    (tmp_path / "shm").mkdir()
+    monkeypatch.setattr(item_cache, "_SHARED_MEMORY_DIR", str(tmp_path / "shm"))
+
+    with MockConnect(token="secret-token", latency=0.05) as mock_server:
+        vault = mock_server.add_vault("Infra")
+        mock_server.add_item(vault["id"], {
+            "title": "MySQL",
+            "sections": [{"id": "admin", "label": "Admin"}],
+            "fields": [
+                {"label": "username", "value": "app"},
+                {"label": "username", "value": "root", "section": {"id": "admin"}},
+                {"label": "password", "value": "hunter2", "type": "CONCEALED"},
+            ],
+        })
+        yield mock_server
+
+
+def _lookup(server, *terms, **kwargs):
+    kwargs.setdefault("vault", "Infra")
+    kwargs.setdefault("hostname", server.url)
+    kwargs.setdefault("token", "secret-token")
+    return lookup_loader.get("onepassword.connect.item").run(list(terms), variables={}, **kwargs)
+
+
+def test_lookup_field_value(server):
+    assert _lookup(server, "MySQL", field="password") == ["hunter2"]
+    assert _lookup(server, "MySQL", field="username", section="Admin") == ["root"]
+
+
+def test_lookup_whole_item(server):
+    item = _lookup(server, "MySQL")[0]
+
+    assert item["title"] == "MySQL"
+    assert len(item["fields"]) == 3
+
+
+def test_lookup_caches_items(server):
+    _lookup(server, "MySQL", field="password")
+    requests_after_first_lookup = server.count()
+
+    _lookup(server, "MySQL", field="username")
+    _lookup(server, "MySQL")
+
+    assert server.count() == requests_after_first_lookup
+
+
+def test_concurrent_lookups_share_one_fetch(server):
+    results = []
+
+    def worker():
+        results.append(_lookup(server, "MySQL", field="password"))
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [["hunter2"]] * 10
+    # List vaults, search by title, read the item
+    assert server.count() == 3
+
+
+def _lookup_in_worker(url, results):
+    # A fresh worker process, with none of the parent's items in memory
+    item_lookup._ITEM_CACHE.clear()
+    lookup = lookup_loader.get("onepassword.connect.item")
+    results.put(lookup.run(["MySQL"], variables={}, vault="Infra", hostname=url, token="secret-token", field="password",
+                           shared_cache_ttl=60))
+
+
+def test_lookups_of_all_workers_share_one_fetch(server):
+    # Workers of the same playbook run, forked by this process as ansible-playbook does
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_lookup_in_worker, args=(server.url, results)) for _ in range(5)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [results.get(timeout=5) for _ in workers] == [["hunter2"]] * 5
+    # List vaults, search by title, read the item
+    assert server.count() == 3
+
+
+def test_shared_cache_stays_off_disk_unless_allowed(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(item_cache, "_SHARED_MEMORY_DIR", str(tmp_path / "no-shm"))
+    monkeypatch.setattr(item_cache.tempfile, "tempdir", str(tmp_path / "tmp"))
+    (tmp_path / "tmp").mkdir()
+    warnings = []
+    monkeypatch.setattr(item_lookup.display, "warning", warnings.append)
+
+    assert item_lookup._shared_cache(server.url, "secret-token", 60) is None
+    assert len(warnings) == 1
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+    shared_cache = item_lookup._shared_cache(server.url, "secret-token", 60, on_disk=True)
+    assert shared_cache.root.startswith(str(tmp_path / "tmp"))
+
+
+def test_lookup_missing_item(server):
+    with pytest.raises(AnsibleLookupError, match="not found"):
+        _lookup(server, "Nope", field="password")
+
+
+def test_lookup_requires_credentials(server, monkeypatch):
+    monkeypatch.delenv("OP_CONNECT_TOKEN", raising=False)
+
+    with pytest.raises(AnsibleLookupError, match="auth token not defined"):
+        _lookup(server, "MySQL", token=None)
+
+
+def test_lookups_share_the_rate_limit(server, tmp_path):
+    assert _lookup(server, "MySQL", field="password", rate_limit=50, cache_dir=str(tmp_path)) == ["hunter2"]
+
+    # The bucket every fork of the controller takes its requests from
+    state_files = [p for p in tmp_path.iterdir() if p.name.startswith("ratelimit-")]
+    assert len(state_files) == 1
+    assert json.loads(state_files[0].read_text())["rate"] == 50
@@ -7,6 +7,7 @@ import json
 import pytest
 
 from ansible_collections.onepassword.connect.plugins.module_utils import api, errors
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
 
 
 def _format_error(error):
@@ -37,6 +38,7 @@ def test_building_api_endpoint(hostname, path, version, params, expected):
     (_format_error({"status": 401, "body": "unauthenticated"}), errors.AccessDeniedError),
     (_format_error({"status": 403, "body": "unauthorized"}), errors.AccessDeniedError),
     (_format_error({"status": 400, "body": "badRequest"}), errors.BadRequestError),
+    (_format_error({"status": 429, "body": "tooManyRequests"}), errors.RateLimitError),
     (_format_error({"status": 499, "body": "generalCatchAll"}), errors.APIError),  # Any 4XX except the 4XX errors
 ))
 def test_raise_for_error(response_info, expected_exception):
@@ -84,3 +86,37 @@ def test_valid_client_uuid(uuid, expected):
 def test_create_client_uuid():
     uuid = api.create_client_uuid()
     assert api.valid_client_uuid(uuid) is True
+
+
+def test_vault_id_by_name_uses_server_filter():
+    with MockConnect() as server:
+        for i in range(50):
+            server.add_vault("Vault {0}".format(i))
+        infra = server.add_vault("Infra")
+        code = server.add_vault(u"\uff23ode")
+        client = api.OnePassword(server.url, "token", ansible_version="test")
+
+        assert client.get_vault_id_by_name("Infra") == infra["id"]
+        assert server.bytes_sent < 100
+
+        # Answers are remembered by normalized name
+        assert client.get_vault_id_by_name(" Infra") == infra["id"]
+        assert server.count() == 1
+
+        # A name that only matches once normalized needs the full listing
+        assert client.get_vault_id_by_name("Code") == code["id"]
+        assert server.count() == 3
+
+
+def test_vault_id_by_name_without_server_filter():
+    with MockConnect(vault_filter=False) as server:
+        infra = server.add_vault("Infra")
+        apps = server.add_vault("Apps")
+        client = api.OnePassword(server.url, "token", ansible_version="test")
+
+        assert client.get_vault_id_by_name("Infra") == infra["id"]
+        assert client.get_vault_id_by_name("Apps") == apps["id"]
+        assert server.statuses == {400: 1, 200: 2}
+
+        with pytest.raises(errors.NotFoundError, match="Vault not found"):
+            client.get_vault_id_by_name("Missing")
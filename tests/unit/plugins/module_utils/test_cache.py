@@ -0,0 +1,337 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import os
+import time
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import activity, api, cache, errors
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _cache(tmp_path, clock, namespace="ns", ttl=60, max_entries=10):
+    return cache.FileCache(str(tmp_path), namespace=namespace, ttl=ttl, max_entries=max_entries, clock=clock)
+
+
+def test_get_returns_stored_value(tmp_path, clock):
+    file_cache = _cache(tmp_path, clock)
+    assert file_cache.get("vaults") is None
+
+    file_cache.set("vaults", [{"id": "abc", "name": "Infra"}])
+
+    assert file_cache.get("vaults") == [{"id": "abc", "name": "Infra"}]
+    # Written atomically, no temporary files left behind
+    assert all(name.endswith(".json") for name in os.listdir(file_cache.directory))
+
+
+def test_entries_expire(tmp_path, clock):
+    file_cache = _cache(tmp_path, clock, ttl=60)
+    file_cache.set("vaults", [])
+
+    clock.now += 59
+    assert file_cache.get("vaults") == []
+
+    clock.now += 2
+    assert file_cache.get("vaults") is None
+    assert os.listdir(file_cache.directory) == []
+
+
+def test_invalidate(tmp_path, clock):
+    file_cache = _cache(tmp_path, clock)
+    file_cache.set("item-id/vault/title", "item")
+
+    file_cache.invalidate("item-id/vault/title")
+    file_cache.invalidate("never-stored")
+
+    assert file_cache.get("item-id/vault/title") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    file_cache = _cache(tmp_path, clock, max_entries=2)
+    file_cache.set("first", 1)
+    file_cache.set("second", 2)
+    os.utime(file_cache._path("first"), (1, 1))
+    os.utime(file_cache._path("second"), (2, 2))
+
+    # Reading refreshes the entry's position
+    assert file_cache.get("first") == 1
+    file_cache.set("third", 3)
+
+    assert file_cache.get("first") == 1
+    assert file_cache.get("second") is None
+    assert file_cache.get("third") == 3
+
+
+def test_caches_are_scoped_by_server_and_token(tmp_path, clock):
+    one = _cache(tmp_path, clock, namespace=cache.namespace("https://connect", "token-one"))
+    two = _cache(tmp_path, clock, namespace=cache.namespace("https://connect", "token-two"))
+
+    one.set("vaults", ["one"])
+
+    assert two.get("vaults") is None
+    assert cache.namespace("https://connect", "token-one") != cache.namespace("https://other", "token-one")
+
+
+def test_cache_disabled_by_default():
+    assert cache.from_params({"cache_ttl": 0}, "https://connect", "token") is None
+    assert cache.from_params({}, "https://connect", "token") is None
+
+
+def test_client_resolves_names_from_cache(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        item = server.add_item(vault_id, {"title": "Database", "category": "DATABASE"})
+
+        def _client():
+            file_cache = cache.from_params({"cache_ttl": 60, "cache_dir": str(tmp_path)}, server.url, "token")
+            return api.OnePassword(server.url, "token", ansible_version="test", cache=file_cache)
+
+        assert _client().get_vault_id_by_name("Infra") == vault_id
+        assert _client().get_item_by_name(vault_id, "Database")["id"] == item["id"]
+        server.reset_stats()
+
+        # A new client, like the next task, only fetches the item itself
+        client = _client()
+        assert client.get_vault_id_by_name("Infra") == vault_id
+        assert client.get_item_by_name(vault_id, "Database")["id"] == item["id"]
+        assert server.requests == [("GET", "/v1/vaults/{0}/items/{1}".format(vault_id, item["id"]))]
+
+
+def test_client_refreshes_stale_entries(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        old_item = server.add_item(vault_id, {"title": "Database"})
+        file_cache = cache.from_params({"cache_ttl": 60, "cache_dir": str(tmp_path)}, server.url, "token")
+        client = api.OnePassword(server.url, "token", ansible_version="test", cache=file_cache)
+
+        client.get_vault_id_by_name("Infra")
+        client.get_item_by_name(vault_id, "Database")
+
+        # The item is replaced and a vault is added behind the cache's back
+        del server.items[vault_id][old_item["id"]]
+        new_item = server.add_item(vault_id, {"title": "Database"})
+        new_vault_id = server.add_vault("Apps")["id"]
+
+        assert client.get_item_by_name(vault_id, "Database")["id"] == new_item["id"]
+        assert client.get_vault_id_by_name("Apps") == new_vault_id
+        assert file_cache.get("item-id/{0}/Database".format(vault_id)) == new_item["id"]
+
+
+def test_client_does_not_follow_renamed_items(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        item = server.add_item(vault_id, {"title": "Old"})
+        other = server.add_item(vault_id, {"title": "Other"})
+
+        def _client():
+            file_cache = cache.from_params({"cache_ttl": 300, "cache_dir": str(tmp_path)}, server.url, "token")
+            return api.OnePassword(server.url, "token", ansible_version="test", cache=file_cache)
+
+        # Renamed through a client, which drops the titles it was looked up by
+        client = _client()
+        old = client.get_item_by_name(vault_id, "Old")
+        client.update_item(vault_id, dict(old, title="New"))
+        assert client.cache.get("item-id/{0}/Old".format(vault_id)) is None
+        with pytest.raises(errors.NotFoundError):
+            _client().get_item_by_name(vault_id, "Old")
+        assert _client().get_item_by_name(vault_id, "New")["id"] == item["id"]
+
+        # Renamed behind the cache's back: the cached ID leads to an item with another title
+        _client().get_item_by_name(vault_id, "Other")
+        server.items[vault_id][other["id"]]["title"] = "Renamed"
+        with pytest.raises(errors.NotFoundError):
+            _client().get_item_by_name(vault_id, "Other")
+
+        # Deleting an item drops its titles too
+        client = _client()
+        client.delete_item(vault_id, item["id"])
+        assert client.cache.get("item-id/{0}/New".format(vault_id)) is None
+
+
+def test_client_revalidates_cached_items(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        item = server.add_item(vault_id, {
+            "title": "Database",
+            "fields": [{"label": "field {0}".format(i), "value": "x" * 100} for i in range(50)],
+        })
+
+        def _client():
+            file_cache = cache.from_params({"cache_ttl": 60, "cache_dir": str(tmp_path)}, server.url, "token")
+            return api.OnePassword(server.url, "token", ansible_version="test", cache=file_cache, item_cache=file_cache)
+
+        first = _client().get_item_by_id(vault_id, item["id"])
+        assert server.bytes_sent > 5000
+        server.reset_stats()
+
+        again = _client().get_item_by_id(vault_id, item["id"])
+
+        assert again == first
+        assert server.count() == 1
+        assert server.bytes_sent == 0
+
+        # A changed item is downloaded again
+        client = _client()
+        client.update_item(vault_id, dict(first, title="Database v2"))
+        assert client.get_item_by_id(vault_id, item["id"])["title"] == "Database v2"
+        assert _client().get_item_by_id(vault_id, item["id"])["title"] == "Database v2"
+
+
+def test_client_drops_deleted_items(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        item = server.add_item(vault_id, {"title": "Database"})
+        file_cache = cache.from_params({"cache_ttl": 60, "cache_dir": str(tmp_path)}, server.url, "token")
+        client = api.OnePassword(server.url, "token", ansible_version="test", cache=file_cache, item_cache=file_cache)
+
+        client.get_item_by_id(vault_id, item["id"])
+        del server.items[vault_id][item["id"]]
+
+        with pytest.raises(errors.NotFoundError):
+            client.get_item_by_id(vault_id, item["id"])
+        assert file_cache.get("item/{0}/{1}".format(vault_id, item["id"])) is None
+
+
+def test_client_remembers_missing_items_briefly(tmp_path, clock):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+
+        def _client():
+            file_cache = _cache(tmp_path, clock, namespace=cache.namespace(server.url, "token"))
+            return api.OnePassword(server.url, "token", ansible_version="test", cache=file_cache)
+
+        for _task in range(3):
+            with pytest.raises(errors.NotFoundError):
+                _client().get_item_by_name(vault_id, "Database")
+        assert server.count() == 1
+
+        clock.now += cache.MISSING_TTL + 1
+        with pytest.raises(errors.NotFoundError):
+            _client().get_item_by_name(vault_id, "Database")
+        assert server.count() == 2
+
+        # Creating the item through a client makes it visible right away
+        _client().create_item(vault_id, {"title": "Database", "vault": {"id": vault_id}})
+        assert _client().get_item_by_name(vault_id, "Database")["title"] == "Database"
+
+
+def _activity_client(server, tmp_path, interval=60):
+    file_cache = cache.from_params({"cache_ttl": 3600, "cache_dir": str(tmp_path)}, server.url, "token")
+    return api.OnePassword(server.url, "token", ansible_version="test", cache=file_cache, activity_interval=interval)
+
+
+def _activity_polls(server):
+    return sum(1 for _method, path in server.requests if path == "/v1/activity")
+
+
+def _expire_poll(file_cache):
+    file_cache.set(activity.CURSOR_KEY, dict(file_cache.get(activity.CURSOR_KEY), polled_at=0))
+
+
+def test_activity_drops_entries_of_changed_items(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        renamed = server.add_item(vault_id, {"title": "Database"})
+        untouched = server.add_item(vault_id, {"title": "Queue"})
+
+        client = _activity_client(server, tmp_path)
+        client.get_item_by_name(vault_id, "Database")
+        client.get_item_by_name(vault_id, "Queue")
+
+        # Another Connect client renames the item and gives its title to a new one
+        other = api.OnePassword(server.url, "token", ansible_version="test")
+        other.update_item(vault_id, dict(other.get_item_by_id(vault_id, renamed["id"]), title="Database (old)"))
+        replacement = other.create_item(vault_id, {"title": "Database", "vault": {"id": vault_id}})
+
+        _expire_poll(client.cache)
+        server.reset_stats()
+        client = _activity_client(server, tmp_path)
+
+        assert client.get_item_by_name(vault_id, "Database")["id"] == replacement["id"]
+        assert client.get_item_by_name(vault_id, "Queue")["id"] == untouched["id"]
+        # Only the changed title is looked up again
+        assert [path for _method, path in server.requests] == [
+            "/v1/activity",
+            "/v1/vaults/{0}/items".format(vault_id),
+            "/v1/vaults/{0}/items/{1}".format(vault_id, replacement["id"]),
+            "/v1/vaults/{0}/items/{1}".format(vault_id, untouched["id"]),
+        ]
+
+
+def test_activity_is_read_once_per_interval(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        server.add_item(vault_id, {"title": "Database"})
+
+        for _task in range(3):
+            _activity_client(server, tmp_path).get_item_by_name(vault_id, "Database")
+
+        assert _activity_polls(server) == 1
+
+
+def test_long_lived_client_reads_activity_every_interval(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        item = server.add_item(vault_id, {"title": "Database"})
+        client = _activity_client(server, tmp_path, interval=1)
+        client.get_item_by_name(vault_id, "Database")
+        client.get_item_by_name(vault_id, "Database")
+        assert _activity_polls(server) == 1
+
+        other = api.OnePassword(server.url, "token", ansible_version="test")
+        other.delete_item(vault_id, item["id"])
+        time.sleep(1.1)
+
+        # The same client notices the deletion once the interval is over
+        with pytest.raises(errors.NotFoundError):
+            client.get_item_by_name(vault_id, "Database")
+        assert _activity_polls(server) == 2
+
+
+def test_activity_cursor_lost_drops_cache(tmp_path):
+    with MockConnect() as server:
+        vault_id = server.add_vault("Infra")["id"]
+        server.add_item(vault_id, {"title": "Database"})
+        client = _activity_client(server, tmp_path)
+        client.get_item_by_name(vault_id, "Database")
+
+        # The request the last poll saw is no longer in the feed
+        client.cache.set(activity.CURSOR_KEY, {"request_id": "gone", "polled_at": 0})
+        server.reset_stats()
+        _activity_client(server, tmp_path).get_item_by_name(vault_id, "Database")
+
+        assert server.count() == 3
+        assert server.requests[1] == ("GET", "/v1/vaults/{0}/items".format(vault_id))
+
+
+def test_activity_pages_back_to_cursor():
+    feed = [{"requestId": str(i), "action": "UPDATE", "resource": {
+        "type": "ITEM", "vault": {"id": "v"}, "item": {"id": "item{0}".format(i % 3)}
+    }} for i in range(10, 0, -1)]
+    feed[0]["result"] = "DENY"
+
+    def _page(limit, offset):
+        return feed[offset:offset + limit]
+
+    changed, head, complete = activity.changes_since(_page, {"request_id": "4"}, page_size=2)
+    assert (changed, head, complete) == ({("v", "item0"), ("v", "item1"), ("v", "item2")}, "10", True)
+
+    # More changes than the pages read
+    assert activity.changes_since(_page, {"request_id": "4"}, page_size=2, max_pages=2)[2] is False
+    # No cursor yet, only the newest request is read
+    assert activity.changes_since(_page, None) == (set(), "10", False)
@@ -0,0 +1,55 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import fields, errors
+
+SECTION_ID = "s" * 26
+FIELD_ID = "f" * 26
+
+ITEM = {
+    "sections": [{"id": SECTION_ID, "label": "Admin"}],
+    "fields": [
+        {"id": "a1", "label": "username", "value": "app"},
+        {"id": FIELD_ID, "label": "username", "value": "root", "section": {"id": SECTION_ID}},
+        {"id": "a3", "label": "password", "value": "hunter2", "section": None},
+    ]
+}
+
+
+@pytest.mark.parametrize("identifier, section, expected_value", (
+    ("username", None, "app"),
+    ("username", "Admin", "root"),
+    ("username", SECTION_ID, "root"),
+    (FIELD_ID, None, "root"),
+    ("password", None, "hunter2"),
+))
+def test_find_field(identifier, section, expected_value):
+    assert fields.find_field(identifier, ITEM, section=section)["value"] == expected_value
+
+
+@pytest.mark.parametrize("identifier, section, message", (
+    ("missing", None, "Field with provided label not found in item"),
+    ("username", "Missing Section", "Section label not found in item"),
+    ("password", "Admin", "Field with provided label not found in item"),
+    ("x" * 26, None, "Field not found in item"),
+))
+def test_find_field_not_found(identifier, section, message):
+    with pytest.raises(errors.NotFoundError) as exc:
+        fields.find_field(identifier, ITEM, section=section)
+
+    assert exc.value.message == message
+
+
+def test_find_field_in_item_without_fields():
+    with pytest.raises(errors.NotFoundError, match="Item has no fields"):
+        fields.find_field("username", {"fields": []})
+
+
+def test_field_index_resolves_many_fields():
+    index = fields.FieldIndex(ITEM)
+
+    assert [index.find(label)["value"] for label in ("username", "password")] == ["app", "hunter2"]
+    assert index.find("username", section="Admin")["value"] == "root"
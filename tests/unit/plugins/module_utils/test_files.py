@@ -0,0 +1,154 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import hashlib
+import os
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, errors, files, retry, transport
+from ansible_collections.onepassword.connect.plugins.modules import item_file
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+CONTENT = os.urandom(3 * transport.CHUNK_SIZE + 100)
+CHECKSUM = "sha256:" + hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def server():
+    with MockConnect() as mock_server:
+        yield mock_server
+
+
+@pytest.fixture
+def client(server):
+    return api.OnePassword(server.url, "token", ansible_version="test")
+
+
+@pytest.fixture
+def keystore(server):
+    vault = server.add_vault("Infra")
+    item = server.add_item(vault["id"], {"title": "TLS Keystore", "category": "DOCUMENT"})
+    server.add_file(vault["id"], item["id"], "keystore.p12", CONTENT)
+    server.add_file(vault["id"], item["id"], "README", b"read me")
+    return item
+
+
+def _params(**kwargs):
+    params = {"vault": "Infra", "item": "TLS Keystore", "file": "keystore.p12", "dest": None, "checksum": None}
+    params.update(kwargs)
+    return params
+
+
+def _downloads(server):
+    return sum(1 for _method, path in server.requests if path.endswith("/content"))
+
+
+def test_lists_files(client, keystore):
+    result = item_file.read_files(_params(file=None), client)
+
+    assert not result.get("failed")
+    assert [(f["name"], f["size"]) for f in result["files"]] == [("keystore.p12", len(CONTENT)), ("README", 7)]
+    assert "file" not in result
+
+
+def test_downloads_to_directory(client, server, keystore, tmp_path):
+    result = item_file.read_files(_params(dest=str(tmp_path)), client)
+
+    dest = tmp_path / "keystore.p12"
+    assert result["changed"]
+    assert result["dest"] == str(dest)
+    assert result["checksum"] == CHECKSUM
+    assert dest.read_bytes() == CONTENT
+    assert os.listdir(str(tmp_path)) == ["keystore.p12"]
+    # Whatever the umask, a new file is only readable by its owner
+    assert dest.stat().st_mode & 0o777 == 0o600
+
+
+def test_same_content_is_left_untouched(client, server, keystore, tmp_path):
+    dest = tmp_path / "keystore.p12"
+    dest.write_bytes(CONTENT)
+    inode = dest.stat().st_ino
+
+    downloaded = item_file.read_files(_params(dest=str(dest)), client)
+    # With a matching checksum, nothing is downloaded
+    skipped = item_file.read_files(_params(dest=str(dest), checksum=CHECKSUM), client)
+
+    assert not downloaded["changed"]
+    assert not skipped["changed"]
+    assert skipped["checksum"] == CHECKSUM
+    assert dest.stat().st_ino == inode
+    assert _downloads(server) == 1
+
+
+def test_checksum_mismatch_keeps_dest(client, keystore, tmp_path):
+    dest = tmp_path / "keystore.p12"
+    dest.write_bytes(b"previous")
+
+    result = item_file.read_files(_params(dest=str(dest), checksum="sha256:" + "0" * 64), client)
+
+    assert result["failed"]
+    assert result["msg"].startswith("Checksum of keystore.p12 is " + CHECKSUM)
+    assert dest.read_bytes() == b"previous"
+    assert os.listdir(str(tmp_path)) == ["keystore.p12"]
+
+
+def test_truncated_download_fails(client, server, keystore, tmp_path):
+    for attachment in server.items[keystore["vault"]["id"]][keystore["id"]]["files"]:
+        attachment["size"] += 1
+
+    result = item_file.read_files(_params(dest=str(tmp_path)), client)
+
+    assert result["failed"]
+    assert "Received {0} bytes of keystore.p12".format(len(CONTENT)) in result["msg"]
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_check_mode_downloads_nothing(client, server, keystore, tmp_path):
+    dest = tmp_path / "keystore.p12"
+
+    missing = item_file.read_files(_params(dest=str(dest)), client, check_mode=True)
+    dest.write_bytes(CONTENT)
+    same_size = item_file.read_files(_params(dest=str(dest)), client, check_mode=True)
+
+    assert missing["changed"]
+    assert not same_size["changed"]
+    assert _downloads(server) == 0
+
+
+def test_file_selection(keystore):
+    attached = [{"id": "a", "name": "cert.pem"}, {"id": "b", "name": "cert.pem"}, {"id": "c", "name": "key.pem"}]
+
+    assert files.find_file(attached, "b")["id"] == "b"
+    assert files.find_file(attached, "key.pem")["id"] == "c"
+    with pytest.raises(errors.FileNotUnique):
+        files.find_file(attached, "cert.pem")
+    with pytest.raises(errors.NotFoundError):
+        files.find_file(attached, "missing.pem")
+
+
+def test_retried_download_starts_over(mocker, tmp_path):
+    class DroppingTransport:
+        """Sends part of the body, drops the connection, then sends the whole body"""
+
+        def __init__(self):
+            self.attempts = 0
+
+        def request(self, method, url, headers=None, body=None, sink=None):
+            self.attempts += 1
+            sink(b"partial")
+            if self.attempts == 1:
+                return transport.Response(status=-1, headers={}, body=None, msg="Request failed: reset")
+            sink(b" and the rest")
+            return transport.Response(status=200, headers={}, body=b"", msg="OK")
+
+    policy = retry.RetryPolicy(retries=1, sleep=lambda _s: None)
+    client = api.OnePassword("http://connect", "token", http_transport=DroppingTransport(), retry_policy=policy)
+
+    with open(str(tmp_path / "file"), "w+b") as f:
+        size, digest = client.download_file("vault", "item", "file", f)
+
+    assert (tmp_path / "file").read_bytes() == b"partial and the rest"
+    assert size == len(b"partial and the rest")
+    assert digest == hashlib.sha256(b"partial and the rest").hexdigest()
@@ -162,6 +162,59 @@ def test_item_with_fields_in_sections():
     assert item_sections == sorted(sections)
 
 
+def test_item_reuses_previous_section_ids():
+    fieldset = [
+        {"label": "host", "section": "Connection", "value": "db", "type": const.FieldType.STRING},
+        {"label": "port", "section": " Connection ", "value": "5432", "type": const.FieldType.STRING},
+        {"label": "user", "section": "Admin", "value": "root", "type": const.FieldType.STRING},
+    ]
+    previous_sections = [
+        {"id": "connectionsection", "label": "Connection"},
+        {"id": "unusedsection", "label": "Unused"},
+    ]
+
+    item = vault.assemble_item(
+        vault_id="abc123",
+        category="custom",
+        fieldset=fieldset,
+        previous_sections=previous_sections
+    )
+
+    section_ids = dict((section["label"], section["id"]) for section in item["sections"])
+    assert section_ids["Connection"] == "connectionsection"
+    assert section_ids["Admin"] not in ("connectionsection", "unusedsection")
+    assert [field["section"]["id"] for field in item["fields"][:2]] == ["connectionsection"] * 2
+
+
+def test_canonical_item_ignores_server_owned_keys():
+    desired = vault.assemble_item(
+        vault_id="abc123",
+        category="LOGIN",
+        title="Database",
+        urls=["https://db.example.com"],
+        tags=["b", "a"],
+        fieldset=[{"label": "host", "section": "Connection", "value": "db", "type": const.FieldType.STRING}],
+    )
+    stored = {
+        "id": None,
+        "title": "Database",
+        "vault": {"id": "abc123"},
+        "category": "LOGIN",
+        "version": 4,
+        "createdAt": "2020-11-23T15:29:07.312397-08:00",
+        "updatedAt": "2020-11-24T15:29:07.312397-08:00",
+        "tags": ["a", "b"],
+        "urls": [{"href": "https://db.example.com", "primary": True}],
+        "sections": [{"id": "serversection", "label": "Connection"}],
+        "fields": [{"id": "fieldid", "label": "host", "value": "db", "type": "STRING", "section": {"id": "serversection"}}],
+    }
+
+    assert vault.canonical_item(desired) == vault.canonical_item(stored)
+
+    stored["fields"][0]["value"] = "other"
+    assert vault.canonical_item(desired) != vault.canonical_item(stored)
+
+
 def test_field_value_generation_on_create_only():
     previous_fields = [{
         "label": "EXAMPLE 123",
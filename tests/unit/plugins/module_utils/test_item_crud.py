@@ -2,7 +2,13 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
-from ansible_collections.onepassword.connect.plugins.module_utils import vault, const
+import copy
+import time
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, vault, const, errors
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
 
 
 def test_create_item(mocker):
@@ -122,3 +128,144 @@ def test_update_item(mocker):
     assert updated_item["favorite"] == params["favorite"]
     assert updated_item["title"] == params["title"]
     assert updated_item["vault"]["id"] == original_item["vault"]["id"]
+
+
+def test_reconcile_items_reports_each_item(mocker):
+    mock_api = mocker.Mock()
+    mock_api.get_item_by_name.side_effect = errors.NotFoundError
+    mock_api.create_item.side_effect = lambda vault_id, item: dict(item, id="new-" + item["title"])
+
+    items_params = [
+        {"vault_id": "Abc123", "name": "First", "title": "First", "category": "login", "state": "present"},
+        {"vault_id": None, "name": "No Vault", "title": "No Vault", "category": "login", "state": "present"},
+        {"vault_id": "Abc123", "name": "Second", "title": "Second", "category": "login", "state": "present"},
+    ]
+
+    results = vault.reconcile_items(items_params, mock_api, concurrency=2)
+
+    assert [r["failed"] for r in results] == [False, True, False]
+    assert [r["changed"] for r in results] == [True, False, True]
+    assert results[0]["op_item"]["id"] == "new-First"
+    assert results[1]["msg"] == errors.MissingVaultID.DEFAULT_MSG
+    assert results[2]["op_item"]["id"] == "new-Second"
+
+
+def test_reconcile_items_against_server():
+    with MockConnect(latency=0.01) as server:
+        vault_id = server.add_vault("Bulk")["id"]
+        server.add_item(vault_id, {"title": "Stale", "category": "LOGIN"})
+
+        client = api.OnePassword(server.url, "token", ansible_version="test")
+        items_params = [
+            {"vault_id": vault_id, "name": "Item {0}".format(i), "title": "Item {0}".format(i),
+             "category": "login", "state": "present", "fields": None}
+            for i in range(8)
+        ]
+        items_params.append({"vault_id": vault_id, "title": "Stale", "name": None, "state": "absent"})
+
+        results = vault.reconcile_items(items_params, client, concurrency=4)
+
+        assert all(r["changed"] and not r["failed"] for r in results)
+        assert sorted(i["title"] for i in server.items[vault_id].values()) == ["Item {0}".format(i) for i in range(8)]
+
+
+def test_search_vaults_prefers_first_vault_in_order(mocker):
+    mock_api = mocker.Mock()
+    mock_api.get_item_by_id.side_effect = errors.NotFoundError
+
+    def _by_name(vault_id, item):
+        if vault_id in ("v2", "v3"):
+            return {"id": "item", "vault": {"id": vault_id}}
+        raise errors.NotFoundError
+
+    mock_api.get_item_by_name.side_effect = _by_name
+
+    item = vault.search_vaults("My Item", ["v1", "v2", "v3", "v4"], mock_api, concurrency=4)
+
+    assert item["vault"]["id"] == "v2"
+
+
+def test_search_vaults_raises_errors_before_the_match(mocker):
+    mock_api = mocker.Mock()
+    mock_api.get_item_by_id.side_effect = errors.NotFoundError
+
+    def _by_name(vault_id, item):
+        if vault_id == "v1":
+            raise errors.APIError(message="More than 1 match found")
+        return {"id": "item", "vault": {"id": vault_id}}
+
+    mock_api.get_item_by_name.side_effect = _by_name
+
+    with pytest.raises(errors.APIError, match="More than 1 match"):
+        vault.search_vaults("My Item", ["v1", "v2"], mock_api, concurrency=2)
+
+    # An error after the match doesn't matter
+    assert vault.search_vaults("My Item", ["v2", "v1"], mock_api, concurrency=2)["vault"]["id"] == "v2"
+
+
+def test_search_vaults_not_found(mocker):
+    mock_api = mocker.Mock()
+    mock_api.get_item_by_id.side_effect = errors.NotFoundError
+    mock_api.get_item_by_name.side_effect = errors.NotFoundError
+
+    with pytest.raises(errors.NotFoundError):
+        vault.search_vaults("My Item", ["v1", "v2", "v3"], mock_api, concurrency=2)
+
+    with pytest.raises(errors.NotFoundError):
+        vault.search_vaults("My Item", [], mock_api)
+
+
+def test_search_vaults_in_parallel():
+    with MockConnect(latency=0.1) as server:
+        vault_ids = [server.add_vault("Vault {0}".format(i))["id"] for i in range(20)]
+        server.add_item(vault_ids[15], {"title": "Needle", "category": "LOGIN"})
+        client = api.OnePassword(server.url, "token", ansible_version="test")
+
+        start = time.monotonic()
+        item = vault.search_vaults("Needle", vault_ids, client, concurrency=20)
+        elapsed = time.monotonic() - start
+
+        assert item["title"] == "Needle"
+        # Searching 16 vaults one at a time takes at least 32 round trips, 3.2s
+        assert elapsed < 1.5
+
+
+def test_unchanged_item_is_not_written_again():
+    with MockConnect() as server:
+        vault_id = server.add_vault("Converge")["id"]
+        client = api.OnePassword(server.url, "token", ansible_version="test")
+        params = {
+            "vault_id": vault_id,
+            "name": "Database",
+            "title": "Database",
+            "uuid": None,
+            "category": "database",
+            "state": "present",
+            "favorite": False,
+            "urls": ["https://db.example.com"],
+            "tags": ["prod", "db"],
+            "fields": [
+                {"label": "password", "field_type": "concealed", "generate_value": "on_create"},
+                {"label": "host", "field_type": "string", "value": "db.example.com", "section": "Connection"},
+                {"label": "port", "field_type": "string", "value": "5432", "section": "Connection"},
+            ],
+        }
+
+        changed, created = vault.reconcile_item(copy.deepcopy(params), client)
+        assert changed
+        section_ids = [s["id"] for s in server.items[vault_id][created["id"]]["sections"]]
+
+        for _run in range(3):
+            changed, _item = vault.reconcile_item(copy.deepcopy(params), client)
+            assert not changed
+
+        assert server.count("POST") == 1
+        assert server.count("PUT") == 0
+
+        params["fields"][2]["value"] = "5433"
+        changed, updated = vault.reconcile_item(copy.deepcopy(params), client)
+
+        assert changed
+        assert server.count("PUT") == 1
+        assert updated["fields"]["port"]["value"] == "5433"
+        assert [s["id"] for s in server.items[vault_id][created["id"]]["sections"]] == section_ids
@@ -0,0 +1,144 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+import multiprocessing
+import time
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, errors, ratelimit, transport
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+@pytest.fixture
+def fake_time():
+    return FakeTime()
+
+
+def _limiter(tmp_path, fake_time, max_rate=10):
+    return ratelimit.SharedRateLimiter(
+        str(tmp_path / "limits" / "ratelimit.json"),
+        max_rate=max_rate,
+        clock=fake_time.clock,
+        sleep=fake_time.sleep,
+    )
+
+
+def _state(limiter):
+    with open(limiter.path) as f:
+        return json.load(f)
+
+
+def test_limiters_share_one_bucket(tmp_path, fake_time):
+    first, second = _limiter(tmp_path, fake_time, max_rate=2), _limiter(tmp_path, fake_time, max_rate=2)
+
+    waits = [first.acquire(), second.acquire(), first.acquire(), second.acquire()]
+
+    # Two requests fit in the bucket, the next ones queue up behind each other
+    assert waits == [0, 0, 0.5, 1.0]
+
+    fake_time.now += 10
+    assert second.acquire() == 0
+
+
+def test_overload_halves_rate_once_per_interval(tmp_path, fake_time):
+    limiter = _limiter(tmp_path, fake_time, max_rate=10)
+
+    for _ in range(5):
+        limiter.observe(429)
+    assert _state(limiter)["rate"] == 5
+
+    fake_time.now += ratelimit.DECREASE_INTERVAL
+    limiter.observe(503)
+    assert _state(limiter)["rate"] == 2.5
+
+    # Failed connections don't tell about the server's load
+    limiter.observe(-1)
+    assert _state(limiter)["rate"] == 2.5
+
+    for _ in range(100):
+        limiter.observe(200, latency=0.01)
+    assert _state(limiter)["rate"] == 10
+
+
+def test_overload_keeps_a_low_rate_limit(tmp_path, fake_time):
+    limiter = _limiter(tmp_path, fake_time, max_rate=0.5)
+
+    limiter.observe(429)
+
+    assert _state(limiter)["rate"] == 0.5
+    assert [limiter.acquire() for _ in range(2)] == [0, 2.0]
+
+
+def test_rising_latency_lowers_rate(tmp_path, fake_time):
+    limiter = _limiter(tmp_path, fake_time, max_rate=10)
+
+    for _ in range(10):
+        limiter.observe(200, latency=0.01)
+    limiter.observe(200, latency=0.5)
+
+    assert _state(limiter)["rate"] == 10 * ratelimit.LATENCY_DECREASE
+
+
+def test_unusable_state_file_lets_requests_through(tmp_path, fake_time):
+    (tmp_path / "file").write_text("")
+    limiter = ratelimit.SharedRateLimiter(str(tmp_path / "file" / "ratelimit.json"), max_rate=1, sleep=fake_time.sleep)
+
+    assert [limiter.acquire() for _ in range(3)] == [0, 0, 0]
+    limiter.observe(429)
+
+
+def _acquire_many(path, count):
+    limiter = ratelimit.SharedRateLimiter(path, max_rate=20)
+    for _ in range(count):
+        limiter.acquire()
+
+
+def test_processes_respect_the_shared_rate(tmp_path):
+    path = str(tmp_path / "ratelimit.json")
+    processes = [
+        multiprocessing.get_context("fork").Process(target=_acquire_many, args=(path, 10))
+        for _ in range(4)
+    ]
+
+    start = time.monotonic()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    # 20 requests go through at once, the 20 others at 20 per second
+    assert time.monotonic() - start >= 0.9
+
+
+def test_client_reports_answers_to_limiter(tmp_path):
+    with MockConnect() as server:
+        server.add_vault("Infra", vault_id="v" * api.CLIENT_UUID_LENGTH)
+        client = api.client_from_params(
+            {"token": "token", "rate_limit": 50, "cache_dir": str(tmp_path), "retries": 0},
+            server.url,
+            http_transport=transport.ConnectionPool(),
+        )
+        assert client.get_vaults()[0]["name"] == "Infra"
+
+        server.inject_error(429)
+        with pytest.raises(errors.RateLimitError):
+            client.get_vaults()
+
+    limiter = client._transport.limiter
+    assert limiter.path.startswith(str(tmp_path))
+    assert _state(limiter)["rate"] == 25
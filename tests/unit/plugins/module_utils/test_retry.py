@@ -0,0 +1,168 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, errors, retry, transport
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedTransport:
+    """Returns the given responses in order and records each request method"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.methods = []
+
+    def request(self, method, url, headers=None, body=None):
+        self.methods.append(method)
+        return self.responses.pop(0)
+
+
+def _response(status, body=None, headers=None):
+    if body is None and status >= 400:
+        body = {"status": status, "message": "error"}
+    return transport.Response(
+        status=status,
+        headers=headers or {},
+        body=json.dumps(body).encode("utf-8") if body is not None else None,
+        msg="",
+    )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def policy(clock):
+    return retry.RetryPolicy(retries=3, max_delay=30, sleep=clock.sleep, clock=clock)
+
+
+def _client(mocker, policy, http_transport):
+    module = mocker.MagicMock()
+    module.params = {}
+    module.jsonify = json.dumps
+    return api.OnePassword("http://localhost:8080", "token", module, http_transport=http_transport, retry_policy=policy)
+
+
+@pytest.mark.parametrize("status", (-1, 429, 500, 502, 503, 504))
+def test_retries_transient_errors(mocker, policy, clock, status):
+    fake_transport = ScriptedTransport(_response(status), _response(200, [{"id": "abc", "name": "Infra"}]))
+
+    vaults = _client(mocker, policy, fake_transport).get_vaults()
+
+    assert vaults == [{"id": "abc", "name": "Infra"}]
+    assert fake_transport.methods == ["GET", "GET"]
+    assert len(clock.sleeps) == 1
+
+
+@pytest.mark.parametrize("status, expected_exception", (
+    (429, errors.RateLimitError),
+    (503, errors.ServerError),
+))
+def test_raises_after_retries_exhausted(mocker, policy, clock, status, expected_exception):
+    fake_transport = ScriptedTransport(*[_response(status)] * 4)
+
+    with pytest.raises(expected_exception):
+        _client(mocker, policy, fake_transport).get_vaults()
+
+    assert len(fake_transport.methods) == 4
+    assert len(clock.sleeps) == 3
+
+
+def test_does_not_retry_create(mocker, policy, clock):
+    fake_transport = ScriptedTransport(_response(503))
+
+    with pytest.raises(errors.ServerError):
+        _client(mocker, policy, fake_transport).create_item("abc", {"title": "New"})
+
+    assert fake_transport.methods == ["POST"]
+    assert clock.sleeps == []
+
+
+def test_does_not_retry_client_errors(mocker, policy, clock):
+    fake_transport = ScriptedTransport(_response(404))
+
+    with pytest.raises(errors.NotFoundError):
+        _client(mocker, policy, fake_transport).get_item_by_id("abc", "xyz")
+
+    assert clock.sleeps == []
+
+
+def test_honors_retry_after(policy, clock):
+    attempt = policy.start("GET")
+
+    assert attempt.backoff(429, retry_after="7") is True
+    assert clock.sleeps == [7.0]
+
+
+def test_skips_retry_after_beyond_budget(policy, clock):
+    attempt = policy.start("GET")
+
+    assert attempt.backoff(503, retry_after="120") is False
+    assert clock.sleeps == []
+
+
+def test_backoff_stays_within_budget(clock):
+    policy = retry.RetryPolicy(retries=50, max_delay=10, sleep=clock.sleep, clock=clock)
+    attempt = policy.start("GET")
+
+    while attempt.backoff(503):
+        pass
+
+    assert all(delay >= 0 for delay in clock.sleeps)
+    assert sum(clock.sleeps) <= 10
+
+
+def test_zero_retries_disables_retrying(clock):
+    policy = retry.RetryPolicy(retries=0, sleep=clock.sleep, clock=clock)
+
+    assert policy.start("GET").backoff(503) is False
+
+
+def test_policy_defaults_from_unset_params():
+    policy = retry.RetryPolicy.from_params({"retries": None})
+
+    assert policy.retries == retry.DEFAULT_RETRIES
+    assert policy.max_delay == retry.DEFAULT_MAX_DELAY
+
+
+@pytest.mark.parametrize("value, expected", (
+    (None, None),
+    ("", None),
+    ("5", 5.0),
+    ("not a date", None),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+))
+def test_parse_retry_after(value, expected):
+    assert retry.parse_retry_after(value) == expected
+
+
+def test_retries_against_server(policy, clock):
+    with MockConnect() as server:
+        vault = server.add_vault("Infra")
+        server.inject_error(503, times=2, path="^/v1/vaults$")
+        server.inject_error(429, method="GET", retry_after=4)
+        client = api.OnePassword(server.url, "token", ansible_version="test", retry_policy=policy)
+
+        assert client.get_vaults() == [vault]
+        assert server.statuses == {503: 2, 429: 1, 200: 1}
+        assert clock.sleeps[-1] == 4
@@ -0,0 +1,216 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+"""
+Round-trip budgets for each path through the modules.
+
+Every request the API client sends is recorded, and each test asserts the
+exact sequence. A change that adds a request to one of these paths has to
+update its budget here.
+"""
+
+import copy
+import re
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, vault
+from ansible_collections.onepassword.connect.plugins.modules import item_file, item_info
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+TITLE = "Orders DB"
+BY_TITLE = 'GET /vaults/{{vault}}/items?filter=title eq "{0}"'.format(TITLE)
+GET_ITEM = "GET /vaults/{vault}/items/{item}"
+
+
+def _describe(method, path, params):
+    path = re.sub(r"^/vaults/[^/]+", "/vaults/{vault}", path)
+    path = re.sub(r"/items/[^/]+", "/items/{item}", path)
+    path = re.sub(r"/files/[^/]+", "/files/{file}", path)
+    if params:
+        path = "{0}?{1}".format(path, "&".join("{0}={1}".format(k, v) for k, v in sorted(params.items())))
+    return "{0} {1}".format(method, path)
+
+
+@pytest.fixture
+def round_trips(monkeypatch):
+    """Records every request sent by OnePassword clients, with IDs replaced by placeholders"""
+    calls = []
+    send = api.OnePassword._request
+
+    def _recording(self, path, method="GET", data=None, params=None, headers=None, sink=None):
+        calls.append(_describe(method, path, params))
+        return send(self, path, method=method, data=data, params=params, headers=headers, sink=sink)
+
+    monkeypatch.setattr(api.OnePassword, "_request", _recording)
+    return calls
+
+
+@pytest.fixture
+def server():
+    with MockConnect() as mock_server:
+        yield mock_server
+
+
+@pytest.fixture
+def client(server):
+    return api.OnePassword(server.url, "token", ansible_version="test")
+
+
+@pytest.fixture
+def vault_id(server):
+    server.add_vault("Other")
+    return server.add_vault("Infra")["id"]
+
+
+def _params(vault_id, **kwargs):
+    params = {
+        "vault_id": vault_id,
+        "name": TITLE,
+        "title": TITLE,
+        "uuid": None,
+        "category": "database",
+        "state": "present",
+        "favorite": False,
+        "urls": None,
+        "tags": None,
+        "fields": [
+            {"label": "username", "value": "orders", "field_type": "string"},
+            {"label": "host", "value": "db.internal", "field_type": "string", "section": "Connection"},
+        ],
+    }
+    params.update(kwargs)
+    return params
+
+
+def _create(client, vault_id):
+    return vault.reconcile_item(_params(vault_id), client)[1]
+
+
+def test_create(client, vault_id, round_trips):
+    vault.reconcile_item(_params(vault_id), client)
+
+    assert round_trips == [BY_TITLE, "POST /vaults/{vault}/items"]
+
+
+def test_update_unchanged(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    vault.reconcile_item(_params(vault_id), client)
+
+    assert round_trips == [BY_TITLE, GET_ITEM]
+
+
+def test_update_changed(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    vault.reconcile_item(_params(vault_id, tags=["prod"]), client)
+
+    assert round_trips == [BY_TITLE, GET_ITEM, "PUT /vaults/{vault}/items/{item}"]
+
+
+def test_delete(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    vault.reconcile_item(_params(vault_id, state="absent"), client)
+
+    assert round_trips == [BY_TITLE, GET_ITEM, "DELETE /vaults/{vault}/items/{item}"]
+
+
+def test_update_by_uuid(client, vault_id, round_trips):
+    item = _create(client, vault_id)
+    del round_trips[:]
+
+    vault.reconcile_item(_params(vault_id, uuid=item["id"]), client)
+
+    assert round_trips == [GET_ITEM]
+
+
+def test_item_info_lookup_by_name(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    item_info._try_get_item(client, TITLE, vault_id)
+
+    assert round_trips == [BY_TITLE, GET_ITEM]
+
+
+def test_item_info_lookup_by_names(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    item_info._try_get_item(client, TITLE, "Infra")
+
+    assert round_trips == ['GET /vaults?filter=name eq "Infra"', BY_TITLE, GET_ITEM]
+
+
+def test_item_info_lookup_by_uuid(client, vault_id, round_trips):
+    item = _create(client, vault_id)
+    del round_trips[:]
+
+    item_info._try_get_item(client, item["id"], vault_id)
+
+    assert round_trips == [GET_ITEM]
+
+
+def test_item_info_lookup_without_vault(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    item_info._try_get_item(client, TITLE, None, concurrency=1)
+
+    assert round_trips == [
+        "GET /vaults",
+        # "Other" vault
+        BY_TITLE,
+        # "Infra" vault
+        BY_TITLE, GET_ITEM,
+    ]
+
+
+def test_field_info_lookup_by_names(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    vault.get_item("Infra", TITLE, client)
+
+    assert round_trips == ['GET /vaults?filter=name eq "Infra"', BY_TITLE, GET_ITEM]
+
+
+def test_field_info_lookup_by_ids(client, vault_id, round_trips):
+    item = _create(client, vault_id)
+    del round_trips[:]
+
+    vault.get_item(vault_id, item["id"], client)
+
+    assert round_trips == [GET_ITEM]
+
+
+def test_item_file_download_by_names(client, server, vault_id, round_trips, tmp_path):
+    item = _create(client, vault_id)
+    server.add_file(vault_id, item["id"], "keystore.p12", b"keystore")
+    del round_trips[:]
+
+    item_file.read_files({"vault": "Infra", "item": TITLE, "file": "keystore.p12", "dest": str(tmp_path)}, client)
+
+    # The item lists its files, so they aren't asked for separately
+    assert round_trips == [
+        'GET /vaults?filter=name eq "Infra"', BY_TITLE, GET_ITEM, "GET /vaults/{vault}/items/{item}/files/{file}/content"
+    ]
+
+
+def test_bulk_items_cost_the_same_per_item(client, vault_id, round_trips):
+    _create(client, vault_id)
+    del round_trips[:]
+
+    items = [_params(vault_id), _params(vault_id, name="Billing DB", title="Billing DB")]
+    vault.reconcile_items(copy.deepcopy(items), client, concurrency=1)
+
+    assert sorted(round_trips) == sorted([
+        BY_TITLE, GET_ITEM,
+        'GET /vaults/{vault}/items?filter=title eq "Billing DB"', "POST /vaults/{vault}/items",
+    ])
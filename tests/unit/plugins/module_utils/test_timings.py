@@ -0,0 +1,121 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, cache, errors, retry, timings, transport
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+@pytest.fixture
+def server():
+    with MockConnect() as mock_server:
+        yield mock_server
+
+
+def _client(server, **kwargs):
+    return api.OnePassword(
+        server.url,
+        "secret-token",
+        ansible_version="test",
+        http_transport=transport.ConnectionPool(),
+        recorder=timings.Recorder(),
+        **kwargs
+    )
+
+
+@pytest.mark.parametrize("path, params, expected", [
+    ("/vaults", None, "/vaults"),
+    ("/vaults", {"filter": 'name eq "Infra"'}, "/vaults?filter=name"),
+    ("/vaults/abc/items", {"filter": 'title eq "Orders DB"'}, "/vaults/{vault_id}/items?filter=title"),
+    ("/vaults/abc/items/def", None, "/vaults/{vault_id}/items/{item_id}"),
+    ("vaults/abc/items/def/files/ghi/content", None, "/vaults/{vault_id}/items/{item_id}/files/{file_id}/content"),
+])
+def test_path_template_redacts_ids_and_query_values(path, params, expected):
+    assert timings.path_template(path, params) == expected
+
+
+def test_timings_are_opt_in(server):
+    assert timings.from_params({"timings": False}) is None
+    assert timings.from_params({}) is None
+    assert timings.result(api.OnePassword(server.url, "token", ansible_version="test")) == {}
+    assert timings.result(None) == {}
+
+
+def test_client_records_each_request(server):
+    vault_id = server.add_vault("Infra")["id"]
+    item = server.add_item(vault_id, {"title": "Orders DB", "fields": [{"label": "password", "value": "hunter2"}]})
+    client = _client(server)
+
+    client.get_item_by_name(vault_id, "Orders DB")
+    client.update_item(vault_id, dict(item, title="Orders DB v2"))
+
+    report = timings.result(client)[timings.RESULT_KEY]
+    calls = report["calls"]
+    assert [(c["method"], c["path"], c["status"]) for c in calls] == [
+        ("GET", "/vaults/{vault_id}/items?filter=title", 200),
+        ("GET", "/vaults/{vault_id}/items/{item_id}", 200),
+        ("PUT", "/vaults/{vault_id}/items/{item_id}", 200),
+    ]
+    assert report["requests"] == 3
+    assert report["bytes_in"] == server.bytes_sent
+    assert calls[2]["bytes_out"] > 0 and calls[0]["bytes_out"] == 0
+    assert all(c["ttfb_ms"] is not None and c["total_ms"] >= c["ttfb_ms"] for c in calls)
+
+    # Only the first request opened a connection, without TLS
+    assert calls[0]["dns_ms"] is not None and calls[0]["connect_ms"] is not None
+    assert all(c["dns_ms"] is None for c in calls[1:])
+    assert all(c["tls_ms"] is None for c in calls)
+
+    # No IDs, titles, secrets or tokens
+    serialized = json.dumps(report)
+    for value in (vault_id, item["id"], "Orders DB", "hunter2", "secret-token"):
+        assert value not in serialized
+
+
+def test_client_records_retries_and_failures(server):
+    vault_id = server.add_vault("Infra")["id"]
+    server.inject_error(503, times=2)
+    client = _client(server, retry_policy=retry.RetryPolicy(retries=3, base_delay=0.01, sleep=lambda _s: None))
+
+    client.get_vaults()
+    with pytest.raises(errors.NotFoundError):
+        client.get_item_by_id(vault_id, "x" * api.CLIENT_UUID_LENGTH)
+
+    calls = client.recorder.report()["calls"]
+    assert [(c["status"], c["retries"]) for c in calls] == [(200, 2), (404, 0)]
+    assert client.recorder.report()["retries"] == 2
+
+
+def test_client_counts_cache_lookups(server, tmp_path):
+    vault_id = server.add_vault("Infra")["id"]
+    server.add_item(vault_id, {"title": "Orders DB"})
+    file_cache = cache.from_params({"cache_ttl": 60, "cache_dir": str(tmp_path)}, server.url, "secret-token")
+
+    _client(server, cache=file_cache, item_cache=file_cache).get_item_by_name(vault_id, "Orders DB")
+    client = _client(server, cache=file_cache, item_cache=file_cache)
+    client.get_item_by_name(vault_id, "Orders DB")
+
+    # The item ID comes from the cache and the item is revalidated with a 304
+    report = client.recorder.report()
+    assert (report["cache_hits"], report["cache_misses"]) == (2, 0)
+    assert [c["status"] for c in report["calls"]] == [304]
+
+
+def test_hedged_reads_are_flagged(monkeypatch):
+    monkeypatch.setattr(transport, "HEDGE_INITIAL_DELAY", 0.01)
+    with MockConnect(latency=0.1) as server:
+        client = api.client_from_params(
+            {"token": "secret-token", "timings": True, "hedge_percentile": 95, "hedge_max_ratio": 0},
+            server.url,
+            http_transport=transport.ConnectionPool(),
+        )
+        client.get_vaults()
+        client.get_vaults()
+
+    report = client.recorder.report()
+    assert [c["hedged"] for c in report["calls"]] == [True, False]
+    assert report["hedges"] == 1
@@ -0,0 +1,397 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import api, errors, transport
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+@pytest.fixture
+def server():
+    with MockConnect() as mock_server:
+        yield mock_server
+
+
+@pytest.fixture
+def module(mocker):
+    mock_module = mocker.MagicMock()
+    mock_module.params = {}
+    mock_module.jsonify = json.dumps
+    mock_module._socket_path = None
+    return mock_module
+
+
+def test_pool_reuses_connection(server):
+    pool = transport.ConnectionPool()
+
+    for _ in range(3):
+        resp = pool.request("GET", server.url + "/v1/vaults")
+        assert resp.status == 200
+
+    assert server.count() == 3
+    assert server.connections == 1
+
+
+def test_pool_replaces_stale_connection():
+    with MockConnect(idle_timeout=0.1) as server:
+        pool = transport.ConnectionPool()
+        pool.request("GET", server.url + "/v1/vaults")
+
+        # Server closes the idle keep-alive socket in the meantime
+        time.sleep(0.3)
+        resp = pool.request("GET", server.url + "/v1/vaults")
+
+    assert resp.status == 200
+    assert server.connections == 2
+
+
+def test_pool_reports_connection_failure():
+    pool = transport.ConnectionPool(timeout=1)
+
+    resp = pool.request("GET", "http://127.0.0.1:1/v1/vaults")
+
+    assert resp.status == -1
+    assert resp.msg.startswith("Request failed")
+
+
+def test_client_calls_share_one_connection(server, module):
+    vault = server.add_vault("Infra")
+    server.add_item(vault["id"], {"title": "DB", "fields": [{"label": "password", "value": "hunter2"}]})
+
+    client = api.OnePassword(server.url, "token", module, http_transport=transport.ConnectionPool())
+
+    item = client.get_item_by_name(vault["id"], "DB")
+    item["title"] = "DB (renamed)"
+    client.update_item(vault["id"], item)
+
+    with pytest.raises(errors.NotFoundError):
+        client.get_item_by_id(vault["id"], "x" * api.CLIENT_UUID_LENGTH)
+
+    assert server.count() == 4
+    assert server.connections == 1
+
+
+def test_proxy_routes_through_fetch_url(monkeypatch, module):
+    monkeypatch.setenv("http_proxy", "http://proxy.example:3128")
+    monkeypatch.setenv("no_proxy", "localhost")
+
+    assert isinstance(transport.create("http://connect.example", module=module), transport.FetchUrlTransport)
+    assert isinstance(transport.create("http://connect.example"), transport.OpenUrlTransport)
+    assert isinstance(transport.create("http://localhost:8080", module=module), transport.ConnectionPool)
+
+
+def test_open_url_transport_reports_errors(server):
+    vault = server.add_vault("Infra")
+    open_url_transport = transport.OpenUrlTransport()
+
+    found = open_url_transport.request("GET", server.url + "/v1/vaults")
+    missing = open_url_transport.request("GET", "{0}/v1/vaults/{1}/items/nope".format(server.url, vault["id"]))
+
+    assert found.status == 200
+    assert json.loads(found.body.decode("utf-8"))[0]["id"] == vault["id"]
+    assert missing.status == 404
+    assert json.loads(missing.body.decode("utf-8"))["status"] == 404
+
+
+def test_pool_sends_utf8_body(server):
+    vault = server.add_vault("Infra")
+    pool = transport.ConnectionPool()
+
+    resp = pool.request(
+        "POST",
+        "{0}/v1/vaults/{1}/items".format(server.url, vault["id"]),
+        body=json.dumps({"title": "Zürich ☃"}, ensure_ascii=False),
+    )
+
+    assert resp.status == 200
+    assert json.loads(resp.body.decode("utf-8"))["title"] == "Zürich ☃"
+
+
+def test_persistent_transport_sends_path_over_connection(mocker):
+    connection = mocker.patch.object(transport, "Connection").return_value
+    connection.send_request.return_value = {"status": 200, "headers": {}, "body": '[{"id": "abc"}]'}
+
+    persistent = transport.PersistentTransport("/tmp/socket")
+    resp = persistent.request(
+        "GET", "v1/vaults/abc/items?filter=title+eq+%22DB%22", headers={"Authorization": "Bearer token"}
+    )
+
+    connection.send_request.assert_called_once_with(
+        "/v1/vaults/abc/items?filter=title+eq+%22DB%22",
+        method="GET",
+        body=None,
+        headers={"Authorization": "Bearer token"},
+    )
+    assert resp.status == 200
+    assert resp.body == b'[{"id": "abc"}]'
+
+
+def test_persistent_transport_reports_connection_failure(mocker):
+    connection = mocker.patch.object(transport, "Connection").return_value
+    connection.send_request.side_effect = transport.ConnectionError("socket closed")
+
+    resp = transport.PersistentTransport("/tmp/socket").request("GET", "v1/vaults")
+
+    assert resp.status == -1
+
+
+def test_client_uses_persistent_connection_without_hostname(mocker, module):
+    mocker.patch.object(transport, "Connection")
+    module._socket_path = "/tmp/socket"
+    module.params = {"token": "exampleToken"}
+
+    client = api.create_client(module)
+
+    assert isinstance(client._transport, transport.PersistentTransport)
+
+
+def test_pool_streams_successful_body_to_sink(server):
+    vault = server.add_vault("Infra")
+    item = server.add_item(vault["id"], {"title": "Keystore"})
+    content = bytes(bytearray(range(256))) * 1024
+    attachment = server.add_file(vault["id"], item["id"], "keystore.p12", content)
+    pool = transport.ConnectionPool()
+    chunks = []
+
+    resp = pool.request("GET", server.url + attachment["content_path"], sink=chunks.append)
+    missing = pool.request("GET", server.url + attachment["content_path"] + "x", sink=chunks.append)
+
+    assert resp.status == 200
+    assert resp.body == b""
+    assert b"".join(chunks) == content
+    assert max(len(c) for c in chunks) <= transport.CHUNK_SIZE
+    # Error responses are read whole
+    assert missing.status == 404
+    assert json.loads(missing.body.decode("utf-8"))["status"] == 404
+    assert server.connections == 1
+
+
+def test_pool_raises_sink_errors(server):
+    vault = server.add_vault("Infra")
+    item = server.add_item(vault["id"], {"title": "Keystore"})
+    attachment = server.add_file(vault["id"], item["id"], "keystore.p12", b"x" * 3 * transport.CHUNK_SIZE)
+    pool = transport.ConnectionPool()
+
+    def _full_disk(chunk):
+        raise OSError(28, "No space left on device")
+
+    with pytest.raises(OSError):
+        pool.request("GET", server.url + attachment["content_path"], sink=_full_disk)
+
+    # The half-read connection is not reused
+    assert pool.request("GET", server.url + "/v1/vaults").status == 200
+    assert server.connections == 2
+
+
+class DroppedResponse:
+    """Body of a response whose socket is reset after the first chunk"""
+    status = 200
+
+    def __init__(self):
+        self.chunks = [b"a" * transport.CHUNK_SIZE]
+
+    def read(self, amt=None):
+        if not self.chunks:
+            raise ConnectionResetError(104, "Connection reset by peer")
+        return self.chunks.pop(0)
+
+
+class DroppingConnection:
+    def request(self, method, target, body=None, headers=None):
+        pass
+
+    def getresponse(self):
+        return DroppedResponse()
+
+    def close(self):
+        pass
+
+
+def test_pool_does_not_resend_half_streamed_body(server):
+    pool = transport.ConnectionPool()
+    netloc = server.url.split("://", 1)[1]
+    pool._idle[("http", netloc)] = [DroppingConnection()]
+    chunks = []
+
+    resp = pool.request("GET", server.url + "/v1/vaults", sink=chunks.append)
+
+    # The caller sees the failure and resets its sink, nothing is appended behind its back
+    assert resp.status == -1
+    assert chunks == [b"a" * transport.CHUNK_SIZE]
+    assert server.count() == 0
+
+
+class ResetConnection:
+    """Reused socket the server reset while the request was sent"""
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, target, body=None, headers=None):
+        self.requests.append(method)
+        raise ConnectionResetError(104, "Connection reset by peer")
+
+    def close(self):
+        pass
+
+
+def test_pool_does_not_resend_post_on_stale_connection(server):
+    pool = transport.ConnectionPool()
+    netloc = server.url.split("://", 1)[1]
+    stale = ResetConnection()
+    pool._idle[("http", netloc)] = [stale]
+
+    resp = pool.request("POST", server.url + "/v1/vaults", body="{}")
+
+    # The server may have created the item before resetting, so it's not sent again
+    assert resp.status == -1
+    assert stale.requests == ["POST"]
+    assert server.count() == 0
+
+    pool._idle[("http", netloc)] = [stale]
+    assert pool.request("GET", server.url + "/v1/vaults").status == 200
+
+
+class FakeReplica:
+    """Answers every request with the given status and counts them"""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.urls = []
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        self.urls.append(url)
+        return transport.Response(status=self.status, headers={}, body=b"[]", msg="")
+
+    def close(self):
+        pass
+
+
+def test_replicas_fail_over_and_eject_unreachable():
+    now = [0.0]
+    down, up = FakeReplica(status=-1), FakeReplica()
+    replicas = transport.ReplicaSet([("http://down:8080", down), ("https://up", up)], clock=lambda: now[0])
+
+    statuses = [replicas.request("GET", "http://down:8080/v1/vaults?filter=x").status for _ in range(10)]
+
+    assert statuses == [200] * 10
+    assert len(down.urls) == 1
+    assert up.urls[0] == "https://up/v1/vaults?filter=x"
+
+    # Tried again once its cooldown is over
+    now[0] += transport.EJECT_COOLDOWN
+    down.status = 200
+    for _ in range(10):
+        replicas.request("GET", "http://down:8080/v1/vaults")
+    assert len(down.urls) > 1
+
+
+def test_replicas_do_not_resend_writes():
+    first, second = FakeReplica(status=-1), FakeReplica(status=-1)
+    replicas = transport.ReplicaSet([("http://a", first), ("http://b", second)])
+
+    resp = replicas.request("POST", "http://a/v1/vaults/abc/items", body="{}")
+
+    assert resp.status == -1
+    assert len(first.urls) + len(second.urls) == 1
+    # Both replicas are down, reads are tried on each of them once
+    assert replicas.request("GET", "http://a/v1/vaults").status == -1
+    assert len(first.urls) + len(second.urls) == 3
+
+
+def test_replicas_prefer_the_faster_one():
+    with MockConnect(latency=0.05) as slow, MockConnect() as fast:
+        replicas = transport.create([slow.url, fast.url])
+        assert isinstance(replicas, transport.ReplicaSet)
+
+        for _ in range(20):
+            assert replicas.request("GET", slow.url + "/v1/vaults").status == 200
+
+    assert slow.count() <= 2
+    assert fast.count() >= 18
+
+
+def test_client_spreads_concurrent_reads_over_replicas():
+    with MockConnect(latency=0.02) as first, MockConnect(latency=0.02) as second:
+        for server in (first, second):
+            server.add_vault("Infra", vault_id="v" * api.CLIENT_UUID_LENGTH)
+        client = api.OnePassword([first.url, second.url], "token", ansible_version="test")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _i: client.get_vaults(), range(40)))
+
+    assert all(vaults[0]["name"] == "Infra" for vaults in results)
+    assert first.count() >= 5
+    assert second.count() >= 5
+
+
+class SlowTransport(FakeReplica):
+    """Answers after the next of the given delays, or at once when they run out"""
+
+    def __init__(self, *delays):
+        super(SlowTransport, self).__init__()
+        self.delays = list(delays)
+        self.methods = []
+
+    def request(self, method, url, headers=None, body=None, sink=None):
+        self.methods.append(method)
+        delay = self.delays.pop(0) if self.delays else 0
+        time.sleep(delay)
+        return transport.Response(status=self.status, headers={}, body=str(delay).encode(), msg="")
+
+
+def test_hedged_read_returns_first_answer(monkeypatch):
+    monkeypatch.setattr(transport, "HEDGE_INITIAL_DELAY", 0.05)
+    slow = SlowTransport(2)
+    hedged = transport.hedged(slow, 95)
+
+    start = time.perf_counter()
+    resp = hedged.request("GET", "http://localhost/v1/vaults")
+
+    assert time.perf_counter() - start < 1
+    assert resp.body == b"0" and resp.hedged
+    assert slow.methods == ["GET", "GET"]
+
+
+def test_hedges_are_capped(monkeypatch):
+    # Every read is slower than the delay
+    monkeypatch.setattr(transport, "HEDGE_INITIAL_DELAY", 0)
+    monkeypatch.setattr(transport, "HEDGE_MIN_SAMPLES", 1000)
+    slow = SlowTransport(*[0.01] * 100)
+    hedged = transport.HedgedTransport(slow, 50, max_ratio=0.1)
+
+    hedges = []
+    for _ in range(21):
+        hedges.append(hedged.request("GET", "http://localhost/v1/vaults").hedged)
+
+    assert [i for i, h in enumerate(hedges) if h] == [0, 10, 20]
+    assert len(slow.methods) == 24
+
+
+def test_hedging_leaves_writes_and_downloads_alone(monkeypatch):
+    monkeypatch.setattr(transport, "HEDGE_INITIAL_DELAY", 0)
+    slow = SlowTransport(0.05, 0.05)
+    hedged = transport.HedgedTransport(slow, 95)
+
+    assert not hedged.request("PUT", "http://localhost/v1/vaults/v/items/i", body="{}").hedged
+    assert not hedged.request("GET", "http://localhost/v1/vaults/v/items/i/files/f/content", sink=len).hedged
+    assert slow.methods == ["PUT", "GET"]
+
+
+def test_hedging_delay_follows_read_latency():
+    with MockConnect(latency=0.01) as server:
+        hedged = transport.hedged(transport.create(server.url), 90)
+        assert hedged.delay() == transport.HEDGE_INITIAL_DELAY
+
+        for _ in range(transport.HEDGE_MIN_SAMPLES):
+            assert hedged.request("GET", server.url + "/v1/vaults").status == 200
+
+    assert 0.01 <= hedged.delay() < transport.HEDGE_INITIAL_DELAY
+    assert hedged.hedges == 0
+    assert transport.hedged(transport.PersistentTransport("/tmp/socket"), 90).__class__ is transport.PersistentTransport
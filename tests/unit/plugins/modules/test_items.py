@@ -0,0 +1,112 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes
+
+from ansible_collections.onepassword.connect.plugins.modules import items
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+class AnsibleExitJson(Exception):
+    pass
+
+
+class AnsibleFailJson(Exception):
+    pass
+
+
+def _exit_json(module, **kwargs):
+    raise AnsibleExitJson(kwargs)
+
+
+def _fail_json(module, **kwargs):
+    raise AnsibleFailJson(kwargs)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(basic.AnsibleModule, "exit_json", _exit_json)
+    monkeypatch.setattr(basic.AnsibleModule, "fail_json", _fail_json)
+
+    with MockConnect(token="secret-token") as mock_server:
+        yield mock_server
+
+
+def _run(monkeypatch, server, **args):
+    args.setdefault("hostname", server.url)
+    args.setdefault("token", "secret-token")
+    monkeypatch.setattr(basic, "_ANSIBLE_ARGS", to_bytes(json.dumps({"ANSIBLE_MODULE_ARGS": args})))
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        # ansible-core 2.19 and later also need the serialization profile
+        monkeypatch.setattr(basic, "_ANSIBLE_PROFILE", "legacy")
+
+    with pytest.raises((AnsibleExitJson, AnsibleFailJson)) as outcome:
+        items.main()
+    return outcome.type is AnsibleFailJson, outcome.value.args[0]
+
+
+def _titles(server, vault_id):
+    return sorted(i["title"] for i in server.items[vault_id].values())
+
+
+def test_reconciles_every_item(monkeypatch, server):
+    vault_id = server.add_vault("Infra")["id"]
+    stale = server.add_item(vault_id, {"title": "Stale"})
+
+    failed, result = _run(monkeypatch, server, vault_id=vault_id, concurrency=2, items=[
+        {"title": "Orders DB", "category": "database", "fields": [{"label": "password", "value": "hunter2"}]},
+        {"title": "Billing DB"},
+        {"uuid": stale["id"], "state": "absent"},
+    ])
+
+    assert not failed
+    assert result["changed"]
+    assert [(r["changed"], r["failed"]) for r in result["results"]] == [(True, False)] * 3
+    assert result["results"][0]["op_item"]["title"] == "Orders DB"
+    assert result["results"][2]["op_item"] == {}
+    assert _titles(server, vault_id) == ["Billing DB", "Orders DB"]
+
+
+def test_failed_items_do_not_stop_the_others(monkeypatch, server):
+    vault_id = server.add_vault("Infra")["id"]
+    other_vault_id = "v" * 26
+
+    failed, result = _run(monkeypatch, server, vault_id=vault_id, items=[
+        {"title": "Orders DB"},
+        {"title": "Lost", "vault_id": other_vault_id},
+        {"title": "Billing DB"},
+    ])
+
+    assert failed
+    assert result["msg"] == "1 of 3 items failed"
+    assert [r["failed"] for r in result["results"]] == [False, True, False]
+    assert result["results"][1]["msg"]
+    assert result["changed"]
+    assert _titles(server, vault_id) == ["Billing DB", "Orders DB"]
+
+
+def test_check_mode_changes_nothing(monkeypatch, server):
+    vault_id = server.add_vault("Infra")["id"]
+
+    failed, result = _run(monkeypatch, server, vault_id=vault_id, _ansible_check_mode=True, items=[
+        {"title": "Orders DB"},
+    ])
+
+    assert not failed
+    assert result["changed"]
+    assert _titles(server, vault_id) == []
+
+
+def test_rejects_invalid_arguments(monkeypatch, server):
+    failed, result = _run(monkeypatch, server, concurrency=0, items=[{"title": "Orders DB"}])
+
+    assert failed
+    assert result["msg"] == "concurrency must be at least 1"
+    assert result["results"] == []
+    assert server.count() == 0
@@ -0,0 +1,80 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import asyncio
+import time
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.module_utils import errors
+from ansible_collections.onepassword.connect.plugins.plugin_utils import async_client
+from ansible_collections.onepassword.connect.tests.mock_connect.server import MockConnect
+
+
+@pytest.fixture
+def server():
+    with MockConnect(latency=0.05) as mock_server:
+        yield mock_server
+
+
+def test_reads_items_concurrently(server):
+    vault_id = server.add_vault("Infra")["id"]
+    item_ids = [server.add_item(vault_id, {"title": "Item {0}".format(i)})["id"] for i in range(16)]
+
+    async def _read():
+        async with async_client.AsyncOnePassword(server.url, "token", concurrency=16, ansible_version="test") as client:
+            return await asyncio.gather(*(client.get_item_by_id(vault_id, item_id) for item_id in item_ids))
+
+    start = time.monotonic()
+    items = async_client.run(_read())
+    elapsed = time.monotonic() - start
+
+    assert [item["id"] for item in items] == item_ids
+    # 16 reads one after the other take at least 0.8s
+    assert elapsed < 0.6
+
+
+def test_concurrency_is_bounded(server):
+    vault_id = server.add_vault("Infra")["id"]
+    item_ids = [server.add_item(vault_id, {"title": "Item {0}".format(i)})["id"] for i in range(8)]
+
+    async def _read():
+        async with async_client.AsyncOnePassword(server.url, "token", concurrency=2, ansible_version="test") as client:
+            return await asyncio.gather(*(client.get_item_by_id(vault_id, item_id) for item_id in item_ids))
+
+    async_client.run(_read())
+
+    assert server.connections <= 2
+
+
+def test_get_items_reports_errors_per_item(server):
+    vault_id = server.add_vault("Infra")["id"]
+    item = server.add_item(vault_id, {"title": "Database"})
+
+    async def _read():
+        async with async_client.AsyncOnePassword(server.url, "token", ansible_version="test") as client:
+            return await client.get_items(vault_id, [item["id"], "Database", "Missing"])
+
+    by_id, by_name, missing = async_client.run(_read())
+
+    assert by_id["id"] == by_name["id"] == item["id"]
+    assert isinstance(missing, errors.NotFoundError)
+
+
+def test_write_methods_and_errors_match_the_sync_client(server):
+    vault_id = server.add_vault("Infra")["id"]
+
+    async def _write():
+        async with async_client.AsyncOnePassword(server.url, "token", ansible_version="test") as client:
+            created = await client.create_item(vault_id, {"title": "Database", "vault": {"id": vault_id}})
+            updated = await client.update_item(vault_id, dict(created, title="Database v2"))
+            await client.delete_item(vault_id, created["id"])
+            with pytest.raises(errors.NotFoundError):
+                await client.get_item_by_id(vault_id, created["id"])
+            return updated, client.sync
+
+    updated, sync_client = async_client.run(_write())
+
+    assert updated["title"] == "Database v2"
+    assert sync_client.get_vault_id_by_name("Infra") == vault_id
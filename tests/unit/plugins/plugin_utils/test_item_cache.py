@@ -0,0 +1,89 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from ansible_collections.onepassword.connect.plugins.plugin_utils.item_cache import SharedItemCache
+
+
+def _shared(tmp_path, namespace="ns", ttl=60, run_id=1):
+    return SharedItemCache(namespace, ttl=ttl, base_dir=str(tmp_path), run_id=run_id)
+
+
+def _read_in_worker(tmp_path, fetches_dir, results):
+    def _fetch():
+        # Leaves a trace of every fetch, and gives the other workers time to pile up
+        open(os.path.join(fetches_dir, str(os.getpid())), "w").close()
+        time.sleep(0.2)
+        return {"title": "Database"}
+
+    results.put(_shared(tmp_path).get_or_fetch(("Infra", "Database"), _fetch))
+
+
+def test_workers_share_one_fetch(tmp_path):
+    fetches_dir = tmp_path / "fetches"
+    fetches_dir.mkdir()
+    (tmp_path / "cache").mkdir()
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+
+    workers = [
+        context.Process(target=_read_in_worker, args=(tmp_path / "cache", str(fetches_dir), results))
+        for _worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=10) for _worker in workers]
+    for worker in workers:
+        worker.join()
+
+    assert len(os.listdir(str(fetches_dir))) == 1
+    assert sorted(cached for _item, cached in outcomes) == [False, True, True, True]
+    assert all(item == {"title": "Database"} for item, _cached in outcomes)
+
+
+def test_errors_are_not_cached(tmp_path):
+    shared = _shared(tmp_path)
+
+    def _fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        shared.get_or_fetch(("Infra", "Database"), _fail)
+
+    assert shared.get_or_fetch(("Infra", "Database"), lambda: {"id": 1}) == ({"id": 1}, False)
+
+
+def test_entries_are_scoped_by_namespace_and_run(tmp_path):
+    _shared(tmp_path, namespace="ns", run_id=os.getpid()).get_or_fetch(("v", "i"), lambda: "first")
+
+    assert _shared(tmp_path, namespace="ns", run_id=os.getpid()).get_or_fetch(("v", "i"), lambda: "x") == ("first", True)
+    assert _shared(tmp_path, namespace="other", run_id=os.getpid()).get_or_fetch(("v", "i"), lambda: "x") == ("x", False)
+
+    SharedItemCache.clear("ns", base_dir=str(tmp_path), run_id=os.getpid())
+    assert _shared(tmp_path, namespace="ns", run_id=os.getpid()).get_or_fetch(("v", "i"), lambda: "y") == ("y", False)
+
+
+def test_finished_runs_are_removed(tmp_path):
+    finished = multiprocessing.get_context("fork").Process(target=lambda: None)
+    finished.start()
+    finished.join()
+    _shared(tmp_path, run_id=finished.pid).get_or_fetch(("v", "i"), lambda: "old")
+
+    shared = _shared(tmp_path, run_id=os.getpid())
+
+    assert os.listdir(shared.root) == []
+
+
+def test_refuses_a_directory_others_can_read(tmp_path):
+    root = tmp_path / "onepassword_connect-{0}".format(os.getuid())
+    root.mkdir(mode=0o755)
+    root.chmod(0o755)
+
+    with pytest.raises(OSError):
+        _shared(tmp_path)